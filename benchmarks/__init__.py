@@ -0,0 +1,7 @@
+"""
+Benchmarks for the REST API hot paths.
+
+Run with `python -m benchmarks --help`. A synthetic topology is generated into a throwaway test database, every
+scenario is driven through the test client and the latency percentiles, query counts and peak memory are written
+out as JSON, so two runs can be compared with `--compare`.
+"""
@@ -0,0 +1,82 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+
+
+def parse_args(argv):
+    from benchmarks.topology import DEFAULT_SCALE
+    from benchmarks.runner import Runner
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmark the REST API hot paths.')
+    for name, value in DEFAULT_SCALE.items():
+        parser.add_argument('--' + name, type=int, default=value, help='rows per parent (default %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the synthetic topology')
+    parser.add_argument('--repeat', type=int, default=20, help='timed iterations per scenario')
+    parser.add_argument('--page-size', type=int, default=100, help='page size for list scenarios')
+    parser.add_argument('--warm-cache', action='store_true', help='keep the response cache between iterations')
+    parser.add_argument('--scenario', action='append', choices=Runner.scenarios, help='run only these scenarios')
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--compare', help='a previous JSON report to compare against')
+    arguments = parser.parse_args(argv)
+    arguments.scale = {name: getattr(arguments, name) for name in DEFAULT_SCALE}
+    return arguments
+
+
+def main(argv=None):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'entity_api.settings')
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    from benchmarks import topology
+    from benchmarks.runner import Runner, compare
+
+    arguments = parse_args(argv)
+
+    setup_test_environment(debug=False)
+    database = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        rows = topology.build(arguments.scale, seed=arguments.seed)
+        runner = Runner(repeat=arguments.repeat, page_size=arguments.page_size, warm_cache=arguments.warm_cache)
+        report = {
+            'meta': {
+                'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'seed': arguments.seed,
+                'scale': arguments.scale,
+                'rows': rows,
+                'repeat': arguments.repeat,
+                'page_size': arguments.page_size,
+                'warm_cache': arguments.warm_cache,
+            },
+            'results': runner.run(arguments.scenario),
+        }
+    finally:
+        connection.creation.destroy_test_db(database, verbosity=0)
+        teardown_test_environment()
+
+    content = json.dumps(report, indent=2)
+    if arguments.output:
+        with open(arguments.output, 'w') as output:
+            output.write(content + '\n')
+    else:
+        print(content)
+
+    if arguments.compare:
+        with open(arguments.compare) as baseline:
+            lines = compare(json.load(baseline), report)
+        print('\n'.join(lines), file=sys.stderr)
+        return 1 if any(line.startswith('!') for line in lines) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
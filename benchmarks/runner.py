@@ -0,0 +1,257 @@
+import gc
+import json
+import math
+import statistics
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+import entity.models as entities
+import network.models as networks
+from entity_api.cache import api_cache
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(samples, fraction):
+    """
+    Return the `fraction` (0-100) percentile of `samples` using the nearest-rank method.
+    """
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction / 100 * len(ordered)) - 1)]
+
+
+def summarize(latencies, queries, peak):
+    latency = {'p{fraction}'.format(fraction=fraction): round(percentile(latencies, fraction) * 1000, 3)
+               for fraction in PERCENTILES}
+    latency['mean'] = round(statistics.mean(latencies) * 1000, 3)
+    latency['max'] = round(max(latencies) * 1000, 3)
+    return {
+        'runs': len(latencies),
+        'latency_ms': latency,
+        'queries': {'min': min(queries), 'max': max(queries)},
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+class Runner:
+    """
+    Drives the API through the test client and measures each scenario.
+
+    Every scenario is a method taking no arguments and returning `(setup, call)`: `setup()` runs untimed before each
+    iteration and its result is passed to `call()`, which must return the response. Latency and query counts are
+    sampled over `repeat` iterations; peak memory comes from one extra iteration under tracemalloc, so tracing does
+    not inflate the latencies.
+    """
+    scenarios = (
+        'v1_entity_list',
+        'v1_entity_retrieve',
+        'v1_entity_filter_cidr',
+        'v1_entity_create',
+        'v1_entity_update_replace',
+        'v1_entity_update_merge',
+        'v1_entity_delete',
+        'v1_ssid_list',
+        'v1_ssid_update_replace',
+        'v1_ssid_update_merge',
+        'v2_machine_list',
+        'v2_interface_list',
+        'v2_interface_list_keyset',
+        'v2_interface_retrieve',
+        'v2_interface_filter_cidr',
+        'v2_switch_filter_ip',
+        'v2_resource_list',
+        'v2_machine_delete',
+    )
+
+    def __init__(self, repeat=20, page_size=100, warm_cache=False):
+        self.repeat = repeat
+        self.page_size = page_size
+        self.warm_cache = warm_cache
+        self.client = Client()
+        user, _ = get_user_model().objects.get_or_create(username='benchmark')
+        self.client.force_login(user)
+
+    def run(self, names=None):
+        return {name: self.measure(getattr(self, name)) for name in names or self.scenarios}
+
+    def measure(self, scenario):
+        setup, call = scenario()
+        latencies, queries = [], []
+        for _ in range(self.repeat):
+            latency, count = self.iteration(setup, call)
+            latencies.append(latency)
+            queries.append(count)
+
+        tracemalloc.start()
+        try:
+            self.iteration(setup, call)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return summarize(latencies, queries, peak)
+
+    def iteration(self, setup, call):
+        argument = setup()
+        if not self.warm_cache:
+            api_cache().clear()
+        gc.collect()
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            response = call(argument)
+            elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            raise RuntimeError('{method} {path} returned {status}: {content}'.format(
+                method=response.request['REQUEST_METHOD'], path=response.request['PATH_INFO'],
+                status=response.status_code, content=response.content[:500]))
+        return elapsed, len(context.captured_queries)
+
+    # helpers
+
+    @staticmethod
+    def no_setup():
+        return None
+
+    def get(self, url, **params):
+        params.setdefault('page_size', self.page_size)
+        return lambda _: self.client.get(url, params)
+
+    def write(self, method, url, body):
+        return getattr(self.client, method)(url, json.dumps(body), content_type='application/json')
+
+    def detail(self, url):
+        return self.client.get(url).json()
+
+    @staticmethod
+    def replacement(document, relation):
+        """
+        Strip ids from `document` so a PUT replaces the nested rows instead of merging into them.
+        """
+        document = {key: value for key, value in document.items() if key != 'id'}
+        document[relation] = [
+            dict({key: value for key, value in interface.items() if key != 'id'},
+                 resource=[{key: value for key, value in resource.items() if key != 'id'}
+                           for resource in interface['resource']])
+            for interface in document[relation]]
+        return document
+
+    @staticmethod
+    def merged(document, relation):
+        """
+        Touch every nested row of `document`, keeping ids, so a PUT updates the nested rows in place.
+        """
+        document = dict(document)
+        document[relation] = [
+            dict(interface, notes='merged', resource=[dict(resource, notes='merged')
+                                                      for resource in interface['resource']])
+            for interface in document[relation]]
+        return document
+
+    # v1 scenarios
+
+    def v1_entity_list(self):
+        return self.no_setup, self.get('/api/v1/entities/')
+
+    def v1_entity_retrieve(self):
+        pk = entities.Entity.objects.values_list('pk', flat=True).first()
+        return self.no_setup, self.get('/api/v1/entities/{pk}/'.format(pk=pk))
+
+    def v1_entity_filter_cidr(self):
+        return self.no_setup, self.get('/api/v1/entities/', cidr='10.0.0.0/20')
+
+    def v1_entity_create(self):
+        pk = entities.Entity.objects.values_list('pk', flat=True).first()
+        body = self.replacement(self.detail('/api/v1/entities/{pk}/'.format(pk=pk)), 'interface')
+        return self.no_setup, lambda _: self.write('post', '/api/v1/entities/', body)
+
+    def v1_entity_update_replace(self):
+        pk = entities.Entity.objects.values_list('pk', flat=True).last()
+        url = '/api/v1/entities/{pk}/'.format(pk=pk)
+        return (lambda: self.replacement(self.detail(url), 'interface'),
+                lambda body: self.write('put', url, body))
+
+    def v1_entity_update_merge(self):
+        pk = entities.Entity.objects.values_list('pk', flat=True).first()
+        url = '/api/v1/entities/{pk}/'.format(pk=pk)
+        return (lambda: self.merged(self.detail(url), 'interface'),
+                lambda body: self.write('put', url, body))
+
+    def v1_entity_delete(self):
+        def setup():
+            source = entities.Entity.objects.values_list('pk', flat=True).first()
+            body = self.replacement(self.detail('/api/v1/entities/{pk}/'.format(pk=source)), 'interface')
+            return self.write('post', '/api/v1/entities/', body).json()['id']
+
+        return setup, lambda pk: self.client.delete('/api/v1/entities/{pk}/'.format(pk=pk))
+
+    def v1_ssid_list(self):
+        return self.no_setup, self.get('/api/v1/ssids/')
+
+    def v1_ssid_update_replace(self):
+        pk = entities.SSID.objects.values_list('pk', flat=True).last()
+        url = '/api/v1/ssids/{pk}/'.format(pk=pk)
+        return (lambda: self.replacement(self.detail(url), 'client'),
+                lambda body: self.write('put', url, body))
+
+    def v1_ssid_update_merge(self):
+        pk = entities.SSID.objects.values_list('pk', flat=True).first()
+        url = '/api/v1/ssids/{pk}/'.format(pk=pk)
+        return (lambda: self.merged(self.detail(url), 'client'),
+                lambda body: self.write('put', url, body))
+
+    # v2 scenarios
+
+    def v2_machine_list(self):
+        return self.no_setup, self.get('/api/v2/machines/')
+
+    def v2_interface_list(self):
+        return self.no_setup, self.get('/api/v2/interfaces/')
+
+    def v2_interface_list_keyset(self):
+        return self.no_setup, self.get('/api/v2/interfaces/', pagination='keyset')
+
+    def v2_interface_retrieve(self):
+        pk = networks.Interface.objects.values_list('pk', flat=True).first()
+        return self.no_setup, self.get('/api/v2/interfaces/{pk}/'.format(pk=pk))
+
+    def v2_interface_filter_cidr(self):
+        return self.no_setup, self.get('/api/v2/interfaces/', cidr='10.0.0.0/22')
+
+    def v2_switch_filter_ip(self):
+        address = networks.Switch.objects.values_list('address', flat=True).first()
+        return self.no_setup, self.get('/api/v2/switches/', ip=address)
+
+    def v2_resource_list(self):
+        return self.no_setup, self.get('/api/v2/resources/')
+
+    def v2_machine_delete(self):
+        def setup():
+            machine = networks.Machine.objects.create(name='disposable')
+            interface = networks.Interface.objects.create(name='eth0', machine_id=machine)
+            networks.Resource.objects.bulk_create([networks.Resource(port=port, interface_id=interface)
+                                                   for port in (22, 80, 443)])
+            return machine.pk
+
+        return setup, lambda pk: self.client.delete('/api/v2/machines/{pk}/'.format(pk=pk))
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Return one line per scenario present in both reports, flagging p50 latency or query counts that grew by more
+    than `threshold`.
+    """
+    lines = []
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        p50, was = result['latency_ms']['p50'], before['latency_ms']['p50']
+        queries, queried = result['queries']['max'], before['queries']['max']
+        regressed = p50 > was * (1 + threshold) or queries > queried
+        lines.append('{flag} {name:<28} p50 {was:>9.3f} -> {p50:>9.3f} ms   queries {queried:>5} -> {queries:>5}'.format(
+            flag='!' if regressed else ' ', name=name, was=was, p50=p50, queried=queried, queries=queries))
+    return lines
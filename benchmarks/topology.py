@@ -0,0 +1,188 @@
+import datetime
+import ipaddress
+import random
+
+from django.db import transaction
+from django.utils import timezone
+
+import entity.models as entities
+import network.models as networks
+
+# Counts are per parent: `networks` per site, `switches` and `wifis` per network, `machines` per site,
+# `interfaces` per machine (or entity / SSID) and `resources` per interface.
+DEFAULT_SCALE = {
+    'sites': 2,
+    'networks': 2,
+    'switches': 4,
+    'wifis': 2,
+    'machines': 50,
+    'interfaces': 2,
+    'resources': 5,
+    'entities': 100,
+    'ssids': 20,
+}
+
+SUBNET = ipaddress.ip_network('10.0.0.0/8')
+PORTS = (22, 53, 80, 123, 161, 443, 445, 3306, 5432, 6379, 8080, 8443)
+
+
+class Generator:
+    """
+    Deterministic source of names, addresses and timestamps, so two runs with the same seed build the same tables.
+    """
+
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        self.counter = 0
+        self.now = timezone.now()
+
+    def next(self):
+        self.counter += 1
+        return self.counter
+
+    def mac(self):
+        index = self.next()
+        return '02:00:' + ':'.join('{:02x}'.format(index >> shift & 0xff) for shift in (24, 16, 8, 0))
+
+    def ip_v4(self):
+        return str(SUBNET[self.next()])
+
+    def ip_v6(self):
+        return str(ipaddress.ip_address('fd00::') + self.next())
+
+    def seen(self):
+        first_seen = self.now - datetime.timedelta(seconds=self.random.randrange(30 * 24 * 3600))
+        return {'first_seen': first_seen, 'last_seen': first_seen + datetime.timedelta(
+            seconds=self.random.randrange(int((self.now - first_seen).total_seconds()) + 1))}
+
+    def status(self):
+        return self.random.choice(('UP', 'DOWN'))
+
+    def ports(self, count):
+        return self.random.sample(PORTS, min(count, len(PORTS)))
+
+
+def build(scale=None, seed=0):
+    """
+    Fill the database with a synthetic topology and return the number of rows created per table.
+
+    The v2 tables get sites → networks → switches/wifis and sites → machines → interfaces → resources, the v1
+    tables get entities and SSIDs with nested interfaces and resources. Rows are written with bulk_create, so
+    building a large topology takes seconds rather than minutes.
+    """
+    scale = dict(DEFAULT_SCALE, **(scale or {}))
+    generator = Generator(seed)
+    with transaction.atomic():
+        counts = build_network(scale, generator)
+        counts.update(build_entity(scale, generator))
+    return counts
+
+
+def bulk_create(model, instances):
+    for instance in instances:
+        if hasattr(instance, 'update_address_keys'):
+            instance.update_address_keys()  # bulk_create skips save(), which normally keeps the keys in step
+    return model.objects.bulk_create(instances)
+
+
+def build_network(scale, generator):
+    sites = bulk_create(networks.Site, [
+        networks.Site(name='site-{index}'.format(index=index), type='Local Network')
+        for index in range(scale['sites'])])
+
+    network_rows = bulk_create(networks.Network, [
+        networks.Network(name='network-{index}'.format(index=index), type='Switch', status=generator.status(),
+                         site_id=site, **generator.seen())
+        for site in sites for index in range(scale['networks'])])
+
+    switches = bulk_create(networks.Switch, [
+        networks.Switch(name='switch-{index}'.format(index=index), address=generator.ip_v4(), mask='255.255.255.0',
+                        physical_address=generator.mac(), status=generator.status(), site_id=network.site_id,
+                        network_id=network, **generator.seen())
+        for network in network_rows for index in range(scale['switches'])])
+
+    wifis = bulk_create(networks.WiFi, [
+        networks.WiFi(name='wifi-{index}'.format(index=index), type='WIFI_AP', address=generator.ip_v4(),
+                      channels='1,6,11', frequency=2412, BSSID=generator.mac(), SSID=generator.mac(),
+                      status=generator.status(), site_id=network.site_id, network_id=network, **generator.seen())
+        for network in network_rows for index in range(scale['wifis'])])
+
+    machines = bulk_create(networks.Machine, [
+        networks.Machine(name='machine-{index}'.format(index=index), type='Server', os='Linux',
+                         status=generator.status(), site_id=site, **generator.seen())
+        for site in sites for index in range(scale['machines'])])
+
+    interfaces = bulk_create(networks.Interface, [
+        networks.Interface(name='eth{index}'.format(index=index), type='Ethernet', ip_v4=generator.ip_v4(),
+                           ip_v6=generator.ip_v6(), physical_address=generator.mac(), status=generator.status(),
+                           site_id=machine.site_id, machine_id=machine, **generator.seen())
+        for machine in machines for index in range(scale['interfaces'])])
+
+    resources = bulk_create(networks.Resource, [
+        networks.Resource(name='service-{port}'.format(port=port), protocol='TCP', port=port,
+                          site_id=interface.site_id, interface_id=interface, **generator.seen())
+        for interface in interfaces for port in generator.ports(scale['resources'])])
+
+    return {
+        'network.site': len(sites),
+        'network.network': len(network_rows),
+        'network.switch': len(switches),
+        'network.wifi': len(wifis),
+        'network.machine': len(machines),
+        'network.interface': len(interfaces),
+        'network.resource': len(resources),
+    }
+
+
+def build_interfaces(scale, generator, parents, relation):
+    """
+    Create `scale['interfaces']` interfaces with their resources for each of `parents`, linked through the
+    many-to-many `relation` of the parent model.
+    """
+    interfaces = bulk_create(entities.Interface, [
+        entities.Interface(name='eth{index}'.format(index=index), type='Ethernet', ip_v4=generator.ip_v4(),
+                           ip_v6=generator.ip_v6(), physical_address=generator.mac(), vendor='Intel')
+        for _ in parents for index in range(scale['interfaces'])])
+
+    resources = bulk_create(entities.Resource, [
+        entities.Resource(port=port, type='TCP', notes='service-{port}'.format(port=port))
+        for _ in interfaces for port in generator.ports(scale['resources'])])
+
+    through = entities.Interface.resource.through
+    per_interface = len(resources) // len(interfaces) if interfaces else 0
+    through.objects.bulk_create([
+        through(interface_id=interface.id, resource_id=resource.id)
+        for position, interface in enumerate(interfaces)
+        for resource in resources[position * per_interface:(position + 1) * per_interface]])
+
+    field = getattr(type(parents[0]), relation).field if parents else None
+    if field is not None:
+        through = field.remote_field.through
+        source, target = field.m2m_field_name() + '_id', field.m2m_reverse_field_name() + '_id'
+        through.objects.bulk_create([
+            through(**{source: parent.id, target: interface.id})
+            for position, parent in enumerate(parents)
+            for interface in interfaces[position * scale['interfaces']:(position + 1) * scale['interfaces']]])
+
+    return interfaces, resources
+
+
+def build_entity(scale, generator):
+    entity_rows = bulk_create(entities.Entity, [
+        entities.Entity(name='host-{index}'.format(index=index), type='Server', os='Linux',
+                        status=generator.status(), **generator.seen())
+        for index in range(scale['entities'])])
+    entity_interfaces, entity_resources = build_interfaces(scale, generator, entity_rows, 'interface')
+
+    ssids = bulk_create(entities.SSID, [
+        entities.SSID(name='ssid-{index}'.format(index=index), type='WIFI_AP', channel=6, frequency=2437,
+                      crypto='WPA2', BSSID=generator.mac(), **generator.seen())
+        for index in range(scale['ssids'])])
+    ssid_interfaces, ssid_resources = build_interfaces(scale, generator, ssids, 'client')
+
+    return {
+        'entity.entity': len(entity_rows),
+        'entity.ssid': len(ssids),
+        'entity.interface': len(entity_interfaces) + len(ssid_interfaces),
+        'entity.resource': len(entity_resources) + len(ssid_resources),
+    }
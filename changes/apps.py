@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ChangesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'changes'
+
+    def ready(self):
+        from changes import revisions
+        revisions.watch()
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from changes.models import Counter, Tombstone
+
+
+class Command(BaseCommand):
+    help = 'Delete tombstones older than --days. Mirrors whose cursor is older than the pruned ones must start over.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30)
+
+    def handle(self, *args, **options):
+        old = Tombstone.objects.filter(deleted_at__lt=timezone.now() - timedelta(days=options['days']))
+        count = 0
+        with transaction.atomic():
+            # revisions are per table, so is the horizon
+            for kind, horizon in old.order_by().values_list('kind').annotate(horizon=Max('revision')):
+                deleted, _ = Tombstone.objects.filter(kind=kind, revision__lte=horizon).delete()
+                Counter.objects.filter(kind=kind, pruned__lt=horizon).update(pruned=horizon)
+                count += deleted
+        self.stdout.write('{count} tombstones pruned'.format(count=count))
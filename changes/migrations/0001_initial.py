@@ -0,0 +1,42 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:54
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def create_counter(apps, schema_editor):
+    apps.get_model('changes', 'Counter').objects.using(schema_editor.connection.alias).create(id=1)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Counter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.BigIntegerField(default=0)),
+                ('pruned', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=64)),
+                ('object_id', models.BigIntegerField()),
+                ('revision', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['kind', 'revision'], name='tombstone_kind_revision_idx'),
+        ),
+        migrations.RunPython(create_counter, migrations.RunPython.noop),
+    ]
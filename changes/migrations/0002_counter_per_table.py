@@ -0,0 +1,46 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:54
+
+from django.db import migrations, models
+import django.utils.timezone
+
+TRACKED = (
+    'entity.entity', 'entity.ssid', 'network.site', 'network.network', 'network.switch', 'network.wifi',
+    'network.machine', 'network.interface', 'network.resource', 'network.bluetooth', 'network.radio',
+)
+
+
+def split_counter(apps, schema_editor):
+    # every table carries on from the shared value, so cursors handed out before the split stay valid
+    counters = apps.get_model('changes', 'Counter').objects.using(schema_editor.connection.alias)
+    shared = counters.get(pk=1)
+    counters.bulk_create([counters.model(kind=kind, value=shared.value, pruned=shared.pruned) for kind in TRACKED])
+    shared.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('changes', '0001_initial'),
+        ('entity', '0004_revisions'),
+        ('network', '0004_revisions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='counter',
+            name='kind',
+            field=models.CharField(default='', max_length=64),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='counter',
+            name='changed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(split_counter, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='counter',
+            name='kind',
+            field=models.CharField(max_length=64, unique=True),
+        ),
+    ]
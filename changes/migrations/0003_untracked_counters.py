@@ -0,0 +1,21 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:54
+
+from django.db import migrations
+
+
+def create_counters(apps, schema_editor):
+    # tables without a change feed still count their writes for the API's response cache and validators
+    counters = apps.get_model('changes', 'Counter').objects.using(schema_editor.connection.alias)
+    counters.bulk_create([counters.model(kind=kind) for kind in ('entity.interface', 'entity.resource')],
+                         ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('changes', '0002_counter_per_table'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_counters, migrations.RunPython.noop),
+    ]
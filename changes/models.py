@@ -0,0 +1,26 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Counter(models.Model):
+    """
+    One row per table, keyed by its model label, that its revisions are allocated from (see changes.revisions);
+    `changed_at` is when it was last written. `pruned` is the highest revision whose tombstone has been pruned:
+    mirrors behind it must start over.
+    """
+    kind = models.CharField(max_length=64, unique=True)
+    value = models.BigIntegerField(default=0)
+    pruned = models.BigIntegerField(default=0)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+
+class Tombstone(models.Model):
+    kind = models.CharField(max_length=64)
+    object_id = models.BigIntegerField()
+    revision = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'revision'], name='tombstone_kind_revision_idx'),
+        ]
@@ -0,0 +1,236 @@
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connections, models, router, transaction
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.utils import timezone
+
+from changes.models import Counter, Tombstone
+from entity_api.signals import bulk_saved
+
+# Models with a change feed: every write stamps a revision, every delete leaves a tombstone.
+TRACKED = (
+    'entity.entity',
+    'entity.ssid',
+    'network.site',
+    'network.network',
+    'network.switch',
+    'network.wifi',
+    'network.machine',
+    'network.interface',
+    'network.resource',
+    'network.bluetooth',
+    'network.radio',
+)
+
+# Rows rendered inside the feeds of other tables, with the lookup from each owning table to them: writing one moves
+# the revision of the rows that render it.
+NESTED = {
+    'entity.interface': (('entity.entity', 'interface'), ('entity.ssid', 'client')),
+    'entity.resource': (('entity.entity', 'interface__resource'), ('entity.ssid', 'client__resource')),
+}
+# The many-to-many fields those rows hang from.
+RELATIONS = (
+    ('entity.entity', 'interface'),
+    ('entity.ssid', 'client'),
+    ('entity.interface', 'resource'),
+)
+
+
+def allocate(model, count, using=DEFAULT_DB_ALIAS):
+    """
+    Reserve `count` consecutive revisions of `model`'s table and return the first. Call it inside the transaction
+    that writes them: the table's counter row stays locked until that transaction ends, so its revisions become
+    visible in the order they were handed out and a mirror never skips past one that has yet to commit. Every table
+    has a row of its own, so writers to different tables never wait on each other.
+    """
+    connection = connections[using]
+    kind, now = model._meta.label_lower, connection.ops.adapt_datetimefield_value(timezone.now())
+    update = 'UPDATE {table} SET value = value + %s, changed_at = %s WHERE kind = %s RETURNING value'.format(
+        table=Counter._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(update, [count, now, kind])
+        row = cursor.fetchone()
+        if row is None:
+            # the table's first write
+            cursor.execute('INSERT INTO {table} (kind, value, pruned, changed_at) VALUES (%s, 0, 0, %s) '
+                           'ON CONFLICT (kind) DO NOTHING'.format(table=Counter._meta.db_table), [kind, now])
+            cursor.execute(update, [count, now, kind])
+            row = cursor.fetchone()
+    return row[0] - count + 1
+
+
+def lock(model, using=DEFAULT_DB_ALIAS):
+    """
+    Take `model`'s counter row until the transaction ends, as the table's writers do when they allocate. Callers
+    that read before they write take it first, so they run one after the other and each sees what the previous one
+    committed. On SQLite it also claims the write lock up front instead of failing to upgrade a read later.
+    """
+    allocate(model, 0, using)
+
+
+class RevisionMixin(models.Model):
+    """
+    Stamps `revision` with the next value of the table's counter on every save, in the same transaction. Bulk writes
+    bypass save() and are stamped when they send `bulk_saved`; `QuerySet.update()` is not tracked.
+    """
+    revision = models.BigIntegerField(default=0, editable=False, db_index=True)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'revision'}
+        with transaction.atomic(using, savepoint=False):
+            self.revision = allocate(type(self), 1, using)
+            super().save(*args, **kwargs)
+
+
+def stamp(model, instances, using=DEFAULT_DB_ALIAS):
+    """
+    Give `instances`, already written, consecutive revisions with a single bulk_update.
+    """
+    if not instances:
+        return
+    with transaction.atomic(using, savepoint=False):
+        first = allocate(model, len(instances), using)
+        for offset, instance in enumerate(instances):
+            instance.revision = first + offset
+        model._default_manager.using(using).bulk_update(instances, ['revision'])
+
+
+def restamp(model, pks, using=DEFAULT_DB_ALIAS):
+    """
+    Move the revision of the rows that render rows `pks` of `model`: those rows themselves when `model` has a feed,
+    and their owners in the feeds that nest it, with one stamp() per table.
+    """
+    pks = list(pks)
+    if not pks:
+        return
+    label = model._meta.label_lower
+    targets = [(model, 'pk')] if label in TRACKED else []
+    targets += [(apps.get_model(owner), path) for owner, path in NESTED.get(label, ())]
+    for owner, path in targets:
+        rows = owner._default_manager.using(using).filter(**{path + '__in': pks}).distinct().only('pk')
+        stamp(owner, list(rows), using)
+
+
+def feed(model, since, limit):
+    """
+    Return up to `limit` `(revision, pk, deleted)` events after revision `since`, oldest first, and whether more
+    are waiting. Only the current revision of a row is kept, so a row written many times is listed once.
+    """
+    label = model._meta.label_lower
+    rows = model._default_manager.filter(revision__gt=since).order_by('revision').values_list('revision', 'pk')
+    tombstones = Tombstone.objects.filter(kind=label, revision__gt=since).order_by('revision') \
+        .values_list('revision', 'object_id')
+    events = sorted([(revision, pk, False) for revision, pk in rows[:limit + 1]]
+                    + [(revision, pk, True) for revision, pk in tombstones[:limit + 1]])
+    return events[:limit], len(events) > limit
+
+
+def model_saved(sender, instances, using=DEFAULT_DB_ALIAS, **kwargs):
+    stamp(sender, instances, using)
+
+
+def model_deleted(sender, instance, using, origin=None, **kwargs):
+    # cascades send this for every row they remove, inside the delete's transaction; rows already tombstoned by
+    # model_deleting are skipped
+    kind = sender._meta.label_lower
+    if instance.pk in getattr(origin, '_tombstoned', {}).get(kind, ()):
+        return
+    with transaction.atomic(using, savepoint=False):
+        Tombstone.objects.using(using).create(kind=kind, object_id=instance.pk,
+                                              revision=allocate(sender, 1, using))
+
+
+def model_deleting(sender, instance, using, origin=None, **kwargs):
+    """
+    Tombstone the rows a delete removes before they go: the rows it was called on and every tracked row that
+    cascades from them, with one revision allocation per table and a single bulk_create, rather than both for every
+    row from post_delete. The tombstoned ids are kept on the delete's `origin`, which every signal of that delete
+    carries, so the first signal covers the whole delete and the rest find their rows done.
+    """
+    if origin is None:
+        return
+    tombstoned = origin.__dict__.setdefault('_tombstoned', {})
+    if instance.pk in tombstoned.get(sender._meta.label_lower, ()):
+        return
+    if isinstance(origin, QuerySet) and origin.model._meta.label_lower in TRACKED:
+        pending = [(origin.model, set(origin.using(using).values_list('pk', flat=True)))]
+    elif isinstance(origin, models.Model) and type(origin)._meta.label_lower in TRACKED:
+        pending = [(type(origin), {origin.pk})]
+    else:
+        pending = [(sender, {instance.pk})]  # reached through a table without a feed
+
+    found = {}
+    while pending:
+        model, pks = pending.pop()
+        pks -= tombstoned.get(model._meta.label_lower, set()) | found.get(model, set())
+        if pks:
+            found.setdefault(model, set()).update(pks)
+            pending += [(related, set(related._default_manager.using(using).filter(**{field + '__in': pks})
+                                      .values_list('pk', flat=True))) for related, field in cascades(model)]
+
+    tombstones = []
+    with transaction.atomic(using, savepoint=False):
+        for model, pks in found.items():
+            kind, first = model._meta.label_lower, allocate(model, len(pks), using)
+            tombstones += [Tombstone(kind=kind, object_id=pk, revision=first + offset)
+                           for offset, pk in enumerate(sorted(pks))]
+            tombstoned.setdefault(kind, set()).update(pks)
+        Tombstone.objects.using(using).bulk_create(tombstones)
+
+
+def nested_saved(sender, instance=None, instances=(), using=DEFAULT_DB_ALIAS, **kwargs):
+    # post_save sends one instance, bulk_saved a list
+    restamp(sender, [instance.pk] if instance is not None else [row.pk for row in instances], using)
+
+
+def nested_deleting(sender, instance, using, origin=None, **kwargs):
+    # the owners are looked up while the rows still exist; a queryset delete looks them up once for all its rows
+    if not isinstance(origin, QuerySet) or origin.model is not sender:
+        restamp(sender, [instance.pk], using)
+    elif not origin.__dict__.get('_restamped'):
+        origin._restamped = True
+        restamp(sender, origin.using(using).values_list('pk', flat=True), using)
+
+
+def relation_changed(sender, instance, action, reverse, model, pk_set, using, **kwargs):
+    # forward, `instance` owns the relation; reverse, the owners are `pk_set` of `model`, or every owner of
+    # `instance` before a clear
+    if not reverse and action.startswith('post_'):
+        restamp(type(instance), [instance.pk], using)
+    elif reverse and action in ('post_add', 'post_remove'):
+        restamp(model, pk_set, using)
+    elif reverse and action == 'pre_clear':
+        name = next(field.name for field in model._meta.local_many_to_many if field.remote_field.through is sender)
+        restamp(model, model._default_manager.using(using).filter(**{name: instance.pk}).values_list('pk', flat=True),
+                using)
+
+
+def cascades(model):
+    # (tracked model, foreign key) pairs whose rows are deleted along with a row of `model`
+    return [(related, field.name) for related in map(apps.get_model, TRACKED)
+            for field in related._meta.concrete_fields
+            if field.related_model is model and field.remote_field.on_delete is models.CASCADE]
+
+
+def watch():
+    for label in TRACKED:
+        model = apps.get_model(label)
+        uid = 'changes-' + label
+        bulk_saved.connect(model_saved, sender=model, dispatch_uid=uid)
+        pre_delete.connect(model_deleting, sender=model, dispatch_uid=uid)
+        post_delete.connect(model_deleted, sender=model, dispatch_uid=uid)
+    for label in NESTED:
+        model = apps.get_model(label)
+        uid = 'changes-nested-' + label
+        post_save.connect(nested_saved, sender=model, dispatch_uid=uid)
+        bulk_saved.connect(nested_saved, sender=model, dispatch_uid=uid)
+        pre_delete.connect(nested_deleting, sender=model, dispatch_uid=uid)
+    for label, name in RELATIONS:
+        field = apps.get_model(label)._meta.get_field(name)
+        m2m_changed.connect(relation_changed, sender=field.remote_field.through,
+                            dispatch_uid='changes-{label}-{name}'.format(label=label, name=name))
@@ -0,0 +1,169 @@
+import io
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from changes.models import Tombstone
+from entity.models import SSID, Entity, Interface as EntityInterface
+from network.models import Interface, Machine, Network, Resource, Site, Switch
+
+
+class ChangesTests(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        self.client.login(username='temporary', password='temporary')
+        self.site = Site.objects.create(name='Home')
+
+    def changes(self, path, status_code=200, **params):
+        response = self.client.get('/api/{path}/changes/'.format(path=path), params)
+        self.assertEqual(response.status_code, status_code, response.content)
+        return response.json()
+
+    def test_writes_after_cursor(self):
+        laptop = Machine.objects.create(name='Laptop', site_id=self.site)
+        desktop = Machine.objects.create(name='Desktop', site_id=self.site)
+        feed = self.changes('v2/machines')
+        self.assertEqual([row['name'] for row in feed['changed']], ['Laptop', 'Desktop'])
+        self.assertFalse(feed['more'])
+
+        laptop.os = 'Linux'
+        laptop.save()
+        feed = self.changes('v2/machines', since=feed['cursor'])
+        self.assertEqual([(row['id'], row['os']) for row in feed['changed']], [(laptop.pk, 'Linux')])
+        self.assertEqual(self.changes('v2/machines', since=feed['cursor'])['changed'], [])
+        self.assertNotEqual(laptop.revision, desktop.revision)
+
+    def test_pages(self):
+        for index in range(5):
+            Machine.objects.create(name='m{index}'.format(index=index), site_id=self.site)
+        names, since, more = [], 0, True
+        while more:
+            feed = self.changes('v2/machines', since=since, limit=2)
+            names += [row['name'] for row in feed['changed']]
+            since, more = feed['cursor'], feed['more']
+        self.assertEqual(names, ['m0', 'm1', 'm2', 'm3', 'm4'])
+
+    def test_deletes_and_cascades(self):
+        machine = Machine.objects.create(name='Laptop', site_id=self.site)
+        cursor = self.changes('v2/machines')['cursor']
+        other = Machine.objects.create(name='Desktop', site_id=Site.objects.create(name='Office'))
+        deleted = [other.pk, machine.pk]
+        site = self.site.pk
+        other.delete()
+        self.site.delete()  # cascades to the laptop
+
+        feed = self.changes('v2/machines', since=cursor)
+        self.assertEqual(feed['changed'], [])
+        self.assertEqual(feed['deleted'], deleted)
+        self.assertEqual(self.changes('v2/sites')['deleted'], [site])
+
+    def test_cascade_tombstones_in_bulk(self):
+        machines = [Machine.objects.create(name=name, site_id=self.site) for name in ('Laptop', 'Desktop', 'Phone')]
+        interfaces = [Interface.objects.create(name='eth0', site_id=self.site, machine_id=machine).pk
+                      for machine in machines]
+        with CaptureQueriesContext(connection) as queries:
+            self.site.delete()
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "changes_tombstone"')]
+        self.assertEqual(len(inserts), 1)  # the site and its whole cascade
+        self.assertEqual(self.changes('v2/machines')['deleted'], [machine.pk for machine in machines])
+        self.assertEqual(self.changes('v2/interfaces')['deleted'], interfaces)
+
+    def tombstone_queries(self, interfaces, resources):
+        machine = Machine.objects.create(name='Laptop', site_id=self.site)
+        for index in range(interfaces):
+            interface = Interface.objects.create(name='eth{index}'.format(index=index), site_id=self.site,
+                                                 machine_id=machine)
+            Resource.objects.bulk_create([Resource(port=port, site_id=self.site, interface_id=interface)
+                                          for port in range(resources)])
+        tombstones = Tombstone.objects.count()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete('/api/v2/machines/{pk}/'.format(pk=machine.pk))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(Tombstone.objects.count() - tombstones, 1 + interfaces * (1 + resources))
+        return len([query for query in queries if 'changes_' in query['sql']])
+
+    def test_cascade_tombstones_do_not_grow_with_rows(self):
+        self.assertEqual(self.tombstone_queries(10, 5), self.tombstone_queries(2, 2))
+
+    def test_queryset_deletes(self):
+        machines = [Machine.objects.create(name=name, site_id=self.site).pk for name in ('Laptop', 'Desktop')]
+        interface = Interface.objects.create(name='eth0', site_id=self.site, machine_id_id=machines[0])
+        Machine.objects.filter(pk__in=machines).delete()
+        self.assertEqual(self.changes('v2/machines')['deleted'], machines)
+        self.assertEqual(self.changes('v2/interfaces')['deleted'], [interface.pk])
+        self.assertEqual(Tombstone.objects.count(), 3)
+
+    def test_tables_count_separately(self):
+        laptop = Machine.objects.create(name='Laptop', site_id=self.site)
+        Network.objects.create(name='LAN', site_id=self.site)
+        desktop = Machine.objects.create(name='Desktop', site_id=self.site)
+        self.assertEqual(desktop.revision, laptop.revision + 1)
+
+    def test_bulk_writes(self):
+        network = Network.objects.create(name='LAN', site_id=self.site)
+        response = self.client.post('/api/v2/switches/upsert/', [
+            {'name': 'core', 'physical_address': 'aa:bb:cc:dd:ee:01', 'site_id': self.site.pk,
+             'network_id': network.pk},
+        ], content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+        switch = Switch.objects.get()
+        self.assertGreater(switch.revision, 0)
+        self.assertEqual([row['name'] for row in self.changes('v2/switches')['changed']], ['core'])
+
+    def test_entities(self):
+        response = self.client.post('/api/v1/entities/', {'name': 'host', 'interface': [{'name': 'eth0'}]},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201, response.content)
+        feed = self.changes('v1/entities')
+        self.assertEqual(feed['changed'][0]['interface'][0]['name'], 'eth0')
+        Entity.objects.get().delete()
+        self.assertEqual(self.changes('v1/entities', since=feed['cursor'])['deleted'], [response.json()['id']])
+
+    def test_nested_writes_move_owners(self):
+        response = self.client.post('/api/v1/entities/', {'name': 'host', 'interface': [{'name': 'eth0'}]},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201, response.content)
+        interface = response.json()['interface'][0]['id']
+        cursor = self.changes('v1/entities')['cursor']
+
+        response = self.client.patch('/api/v1/interfaces/{pk}/'.format(pk=interface), {'name': 'eth1'},
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+        feed = self.changes('v1/entities', since=cursor)
+        self.assertEqual(feed['changed'][0]['interface'][0]['name'], 'eth1')
+
+        entity = Entity.objects.get()
+        entity.interface.create(name='wlan0')
+        feed = self.changes('v1/entities', since=feed['cursor'])
+        self.assertEqual([row['name'] for row in feed['changed'][0]['interface']], ['eth1', 'wlan0'])
+
+        entity.interface.get(name='wlan0').resource.create(port=22)
+        feed = self.changes('v1/entities', since=feed['cursor'])
+        self.assertEqual(len(feed['changed']), 1)
+
+        EntityInterface.objects.filter(name='wlan0').delete()
+        self.assertEqual(len(self.changes('v1/entities', since=feed['cursor'])['changed']), 1)
+
+        ssid = SSID.objects.create(name='Guest')
+        cursor = self.changes('v1/ssids')['cursor']
+        EntityInterface.objects.get().ssid_set.add(ssid)  # reverse side of SSID.client
+        self.assertEqual(self.changes('v1/ssids', since=cursor)['changed'][0]['client'][0]['name'], 'eth1')
+
+    def test_pruned_cursor(self):
+        Machine.objects.create(name='Laptop', site_id=self.site).delete()
+        cursor = self.changes('v2/machines')['cursor']
+        Machine.objects.create(name='Desktop', site_id=self.site).delete()
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=60))
+        call_command('prune_tombstones', days=30, stdout=io.StringIO())
+
+        self.changes('v2/machines', status_code=410, since=cursor)
+        self.assertEqual(self.changes('v2/machines')['deleted'], [])
+
+    def test_invalid_cursor(self):
+        self.changes('v2/machines', status_code=400, since='yesterday')
+        self.changes('v2/machines', status_code=400, since=-1)
@@ -0,0 +1,53 @@
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from changes.models import Counter
+from changes.revisions import feed
+
+CHANGES_PAGE_SIZE = 500
+MAX_CHANGES_PAGE_SIZE = 5000
+
+
+def non_negative(request, name, default):
+    value = request.query_params.get(name, default)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        value = -1
+    if value < 0:
+        raise ValidationError({name: ['Expected a non-negative integer.']})
+    return value
+
+
+class ChangesMixin:
+    """
+    Adds a `changes/` action: the rows written and the ids deleted after revision `?since=` (0, the default, starts
+    a full sync), oldest first, at most `?limit=` of them. Clients store the returned `cursor` and pass it as
+    `since` next time; `more` tells them to ask again straight away.
+
+    Revisions come from a counter per table, independent of the scanner-controlled `last_seen`. Mirrors whose
+    cursor is older than pruned tombstones get 410 Gone and must start over.
+    """
+
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        since = non_negative(request, 'since', 0)
+        limit = min(non_negative(request, 'limit', CHANGES_PAGE_SIZE), MAX_CHANGES_PAGE_SIZE) or CHANGES_PAGE_SIZE
+        model = self.get_queryset().model
+        pruned = Counter.objects.filter(kind=model._meta.label_lower).values_list('pruned', flat=True).first()
+        if since and since < (pruned or 0):
+            return Response({'detail': 'Deletes after this cursor were pruned; sync again from since=0.'},
+                            status=status.HTTP_410_GONE)
+
+        events, more = feed(model, since, limit)
+        live = self.get_queryset().in_bulk([pk for _, pk, deleted in events if not deleted])
+        changed = [live[pk] for _, pk, deleted in events if not deleted and pk in live]
+        return Response({
+            'since': since,
+            'cursor': events[-1][0] if events else since,
+            'more': more,
+            'changed': self.get_serializer(changed, many=True).data,
+            'deleted': [pk for _, pk, deleted in events if deleted],
+        })
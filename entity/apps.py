@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class EntityConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'entity'
+
+    def ready(self):
+        from entity_api import cache, events
+        cache.watch(self.get_models())
+        events.watch(self.get_models())
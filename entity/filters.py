@@ -1,15 +1,21 @@
 import django_filters
 from django.db import models
 from entity.models import Interface, Entity
+from entity_api.filters import AddressFilter, NetworkFilter
 
 
 class InterfaceFilter(django_filters.FilterSet):
-    port = django_filters.NumberFilter(field_name="resources__port", lookup_expr="iexact")
-    type = django_filters.CharFilter(field_name="resources__type", lookup_expr="iexact")
+    port = django_filters.NumberFilter(field_name="resource__port", lookup_expr="iexact")
+    type = django_filters.CharFilter(field_name="resource__type", lookup_expr="iexact")
+    ip = AddressFilter(field_name="ip_v4_key", v6_field_name="ip_v6_key")
+    ip_from = AddressFilter(field_name="ip_v4_key", v6_field_name="ip_v6_key", lookup_expr="gte")
+    ip_to = AddressFilter(field_name="ip_v4_key", v6_field_name="ip_v6_key", lookup_expr="lte")
+    cidr = NetworkFilter(field_name="ip_v4_key", v6_field_name="ip_v6_key")
 
     class Meta:
         model = Interface
-        fields = ['name', 'ip_v4', 'ip_v6', 'physical_address', 'vendor', 'port', 'type']
+        fields = ['name', 'ip_v4', 'ip_v6', 'physical_address', 'vendor', 'port', 'type', 'ip', 'ip_from', 'ip_to',
+                  'cidr']
         filter_overrides = {
             models.GenericIPAddressField: {
                 'filter_class': django_filters.CharFilter,
@@ -26,12 +32,18 @@ class EntitiesFilter(django_filters.FilterSet):
     hostname = django_filters.CharFilter(field_name="interface__hostname", lookup_expr='icontains')
     physical_address = django_filters.CharFilter(field_name="interface__physical_address", lookup_expr='icontains')
     vendor = django_filters.CharFilter(field_name="interface__vendor", lookup_expr='icontains')
-    port = django_filters.CharFilter(field_name="interface__resources__port", lookup_expr='iexact')
-    type = django_filters.CharFilter(field_name="interface__resources__type", lookup_expr='iexact')
+    port = django_filters.CharFilter(field_name="interface__resource__port", lookup_expr='iexact')
+    type = django_filters.CharFilter(field_name="interface__resource__type", lookup_expr='iexact')
+    ip = AddressFilter(field_name="interface__ip_v4_key", v6_field_name="interface__ip_v6_key", distinct=True)
+    ip_from = AddressFilter(field_name="interface__ip_v4_key", v6_field_name="interface__ip_v6_key",
+                            lookup_expr='gte', distinct=True)
+    ip_to = AddressFilter(field_name="interface__ip_v4_key", v6_field_name="interface__ip_v6_key",
+                          lookup_expr='lte', distinct=True)
+    cidr = NetworkFilter(field_name="interface__ip_v4_key", v6_field_name="interface__ip_v6_key", distinct=True)
 
     class Meta:
         model = Entity
         fields = ['name', 'notes', 'ipv4', 'ipv6', 'name', 'physical_address', 'vendor',
                   'os', 'type', 'hardware', 'status',
-                  'port', 'type',
+                  'port', 'type', 'ip', 'ip_from', 'ip_to', 'cidr',
                   ]
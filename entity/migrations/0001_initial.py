@@ -0,0 +1,76 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:03
+
+import django.core.validators
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Interface',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('hardware', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('name', models.CharField(blank=True, default=None, max_length=253, null=True)),
+                ('ip_v4', models.GenericIPAddressField(blank=True, default=None, null=True)),
+                ('ip_v6', models.GenericIPAddressField(blank=True, default=None, null=True)),
+                ('physical_address', models.CharField(blank=True, default=None, max_length=17, null=True, validators=[django.core.validators.RegexValidator(code='invalid_mac_address', message='MAC Address must be valid', regex='^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$')])),
+                ('vendor', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('notes', models.TextField(blank=True, default=None, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Resource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('port', models.IntegerField(validators=[django.core.validators.MaxValueValidator(65535), django.core.validators.MinValueValidator(1)])),
+                ('type', models.CharField(choices=[('TCP', 'TCP'), ('UDP', 'UDP')], default='TCP', max_length=3)),
+                ('notes', models.CharField(blank=True, default=None, max_length=255, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SSID',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(blank=True, choices=[('DEVICE', 'Device'), ('WIFI_BRIDGED', 'Wi-Fi Bridged'), ('WIFI_AP', 'Wi-Fi AP'), ('WIFI_AD_HOC', 'Wi-Fi AD Hoc')], default=None, max_length=40, null=True)),
+                ('hardware', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('name', models.CharField(blank=True, default=None, max_length=253, null=True)),
+                ('channel', models.IntegerField(default=None, null=True, validators=[django.core.validators.MaxValueValidator(20), django.core.validators.MinValueValidator(1)])),
+                ('frequency', models.IntegerField(default=None, null=True, validators=[django.core.validators.MaxValueValidator(65535), django.core.validators.MinValueValidator(1)])),
+                ('crypto', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('BSSID', models.CharField(blank=True, default=None, max_length=17, null=True, validators=[django.core.validators.RegexValidator(code='invalid_mac_address', message='MAC Address must be valid', regex='^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$')])),
+                ('notes', models.TextField(blank=True, default=None, null=True)),
+                ('first_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='first_seen')),
+                ('last_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='last_seen')),
+                ('client', models.ManyToManyField(blank=True, to='entity.interface')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='interface',
+            name='resource',
+            field=models.ManyToManyField(blank=True, to='entity.resource'),
+        ),
+        migrations.CreateModel(
+            name='Entity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=253)),
+                ('type', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('os', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('hardware', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('status', models.CharField(choices=[('UP', 'Up'), ('DOWN', 'Down')], default='DOWN', max_length=4)),
+                ('notes', models.TextField(blank=True, default=None, null=True)),
+                ('first_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='first_seen')),
+                ('last_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='last_seen')),
+                ('interface', models.ManyToManyField(blank=True, to='entity.interface')),
+            ],
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entity', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='entity',
+            index=models.Index(fields=['name'], name='entity_entity_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entity',
+            index=models.Index(fields=['status'], name='entity_entity_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entity',
+            index=models.Index(fields=['last_seen', 'id'], name='entity_entity_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interface',
+            index=models.Index(condition=models.Q(('physical_address__isnull', False)), fields=['physical_address'], name='entity_interface_mac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resource',
+            index=models.Index(fields=['port', 'type'], name='entity_resource_port_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ssid',
+            index=models.Index(condition=models.Q(('BSSID__isnull', False)), fields=['BSSID'], name='entity_ssid_bssid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ssid',
+            index=models.Index(fields=['last_seen', 'id'], name='entity_ssid_seen_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:11
+
+from django.db import migrations, models
+
+from entity_api.addresses import backfill_address_keys
+
+
+def backfill(apps, schema_editor):
+    backfill_address_keys(apps.get_model('entity', 'Interface'), {'ip_v4_key': 'ip_v4', 'ip_v6_key': 'ip_v6'})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entity', '0002_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interface',
+            name='ip_v4_key',
+            field=models.CharField(blank=True, default=None, editable=False, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='interface',
+            name='ip_v6_key',
+            field=models.CharField(blank=True, default=None, editable=False, max_length=32, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='interface',
+            index=models.Index(condition=models.Q(('ip_v4_key__isnull', False)), fields=['ip_v4_key'], name='entity_interface_v4_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interface',
+            index=models.Index(condition=models.Q(('ip_v6_key__isnull', False)), fields=['ip_v6_key'], name='entity_interface_v6_key_idx'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
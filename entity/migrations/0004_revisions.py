@@ -0,0 +1,39 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:54
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    # stamps existing rows in primary key order from the single counter row of changes 0001
+    using = schema_editor.connection.alias
+    counter = apps.get_model('changes', 'Counter').objects.using(using)
+    for model_name in ('Entity', 'SSID'):
+        model = apps.get_model('entity', model_name)
+        rows = list(model.objects.using(using).only('pk').order_by('pk'))
+        value = counter.get(pk=1).value
+        for offset, row in enumerate(rows, 1):
+            row.revision = value + offset
+        model.objects.using(using).bulk_update(rows, ['revision'], batch_size=1000)
+        counter.filter(pk=1).update(value=value + len(rows))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entity', '0003_address_keys'),
+        ('changes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entity',
+            name='revision',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ssid',
+            name='revision',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
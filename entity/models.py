@@ -3,6 +3,9 @@ from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from changes.revisions import RevisionMixin
+from entity_api.addresses import AddressKeyMixin, address_key_field
+
 
 class Resource(models.Model):
     class Type(models.TextChoices):
@@ -16,11 +19,16 @@ class Resource(models.Model):
     type = models.CharField(max_length=3, choices=Type.choices, default=Type.TCP)
     notes = models.CharField(max_length=255, default=None, blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['port', 'type'], name='entity_resource_port_idx'),
+        ]
+
     def __str__(self):
         return "{type}({port})".format(type=self.type, port=str(self.port))
 
 
-class Interface(models.Model):
+class Interface(AddressKeyMixin, models.Model):
     type = models.CharField(max_length=40, default=None, blank=True, null=True)
     hardware = models.CharField(max_length=40, default=None, blank=True, null=True)
     name = models.CharField(max_length=253, default=None, blank=True, null=True)
@@ -34,12 +42,26 @@ class Interface(models.Model):
     vendor = models.CharField(max_length=40, default=None, blank=True, null=True)
     notes = models.TextField(default=None, blank=True, null=True)
     resource = models.ManyToManyField(Resource, blank=True)
+    ip_v4_key = address_key_field()
+    ip_v6_key = address_key_field()
+
+    address_keys = {'ip_v4_key': 'ip_v4', 'ip_v6_key': 'ip_v6'}
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['physical_address'], name='entity_interface_mac_idx',
+                         condition=models.Q(physical_address__isnull=False)),
+            models.Index(fields=['ip_v4_key'], name='entity_interface_v4_key_idx',
+                         condition=models.Q(ip_v4_key__isnull=False)),
+            models.Index(fields=['ip_v6_key'], name='entity_interface_v6_key_idx',
+                         condition=models.Q(ip_v6_key__isnull=False)),
+        ]
 
     def __str__(self):
         return self.name
 
 
-class SSID(models.Model):
+class SSID(RevisionMixin, models.Model):
     class Type(models.TextChoices):
         WIFI_DEVICE = 'DEVICE', _('Device'),
         WIFI_BRIDGED = 'WIFI_BRIDGED', _('Wi-Fi Bridged'),
@@ -70,11 +92,18 @@ class SSID(models.Model):
     first_seen = models.DateTimeField(default=timezone.now, blank=True, verbose_name='first_seen')
     last_seen = models.DateTimeField(default=timezone.now, blank=True, verbose_name='last_seen')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['BSSID'], name='entity_ssid_bssid_idx',
+                         condition=models.Q(BSSID__isnull=False)),
+            models.Index(fields=['last_seen', 'id'], name='entity_ssid_seen_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
 
-class Entity(models.Model):
+class Entity(RevisionMixin, models.Model):
     class Status(models.TextChoices):
         UP = 'UP', _('Up')
         DOWN = 'DOWN', _('Down')
@@ -89,5 +118,12 @@ class Entity(models.Model):
     first_seen = models.DateTimeField(default=timezone.now, blank=True, verbose_name='first_seen')
     last_seen = models.DateTimeField(default=timezone.now, blank=True, verbose_name='last_seen')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['name'], name='entity_entity_name_idx'),
+            models.Index(fields=['status'], name='entity_entity_status_idx'),
+            models.Index(fields=['last_seen', 'id'], name='entity_entity_seen_idx'),
+        ]
+
     def __str__(self):
         return self.name
@@ -1,5 +1,9 @@
+from django.db import transaction
+from django.db.models import Prefetch
 from rest_framework import serializers
 
+from entity_api.signals import bulk_saved
+from entity_api.sparse import columns
 from .models import Interface, Entity, Resource, SSID
 
 
@@ -7,6 +11,24 @@ def find_id(validated_address):
     return len(list(filter(lambda found: 'id' in found, validated_address)))
 
 
+def prefetch_fields(serializer, prefix=''):
+    """
+    Walk the nested serializers of `serializer` and return the prefetch_related lookups needed to render them,
+    so rendering a page costs one query per nesting level rather than one per related object. Each lookup selects
+    only the columns its serializer renders.
+    """
+    lookups = []
+    for field in serializer.fields.values():
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if isinstance(nested, serializers.BaseSerializer):
+            lookup = prefix + field.source
+            queryset = nested.Meta.model._default_manager.all()
+            only = columns(nested)
+            lookups.append(Prefetch(lookup, queryset=queryset.only(*only) if only is not None else queryset))
+            lookups.extend(prefetch_fields(nested, lookup + '__'))
+    return lookups
+
+
 # noinspection PyUnresolvedReferences
 class ResourceSerializer(serializers.ModelSerializer):
     id = serializers.IntegerField(required=False)
@@ -20,10 +42,6 @@ class ResourceSerializer(serializers.ModelSerializer):
             'notes',
         )
 
-    def to_representation(self, instance):
-        rep = super().to_representation(instance)
-        return rep
-
     def create(self, validated_data):
         instance = Resource.objects.create(**validated_data)
         return instance
@@ -59,47 +77,28 @@ class InterfaceSerializer(serializers.ModelSerializer):
             'resource',
         )
 
-    def to_representation(self, instance):
-        rep = super().to_representation(instance)
-        return rep
-
     def create(self, validated_data):
         validated_resource = object_or_empty(validated_data, 'resource')
-        instance = Interface.objects.create(**validated_data)
-
-        for resource in validated_resource:
-            instance.resource.create(**resource)
+        with transaction.atomic():
+            instance = Interface.objects.create(**validated_data)
+            add_resources([(instance, validated_resource)])
 
         return instance
 
     def update(self, instance, validated_data):
-        if 'resource' in validated_data:
-            validated_resource = validated_data.pop('resource')
-            if len(list(filter(lambda resource: 'id' in resource, validated_resource))):
-                self.merge(validated_resource)
-            else:
-                self.replace(instance, validated_resource)
+        with transaction.atomic():
+            if 'resource' in validated_data:
+                validated_resource = validated_data.pop('resource')
+                if find_id(validated_resource):
+                    merge_resources({instance.pk: instance}, [(instance, validated_resource)])
+                else:
+                    replace_resources([instance.pk], [(instance, validated_resource)])
 
-        update_instance(instance, validated_data)
+            update_instance(instance, validated_data)
 
-        instance.save()
+            instance.save()
         return instance
 
-    @staticmethod
-    def merge(validated_resource):
-        for item in validated_resource:
-            pk = item.pop('id')
-            resource_instance = Resource.objects.get(pk=pk)
-            update_instance(resource_instance, item)
-            resource_instance.save()
-
-    @staticmethod
-    def replace(instance, validated_resource):
-        resources = instance.resource.all()
-        resources.all().delete()
-        for resource in validated_resource:
-            instance.resource.create(**resource)
-
 
 def update_instance(instance, validated_data):
     for key, value in validated_data.items():
@@ -109,6 +108,146 @@ def update_instance(instance, validated_data):
             pass
 
 
+def without_id(validated_data):
+    return {key: value for key, value in validated_data.items() if key != 'id'}
+
+
+def unknown_ids(field, ids):
+    return serializers.ValidationError({field: ['Unknown id: {ids}.'.format(ids=', '.join(map(str, sorted(ids))))]})
+
+
+def add_resources(pairs):
+    """
+    Insert the resources of each `(interface, [validated resource])` pair and link them to their interface, with one
+    bulk_create for the resources and one for the through rows however many interfaces there are.
+    """
+    pairs = [(interface, [Resource(**without_id(item)) for item in validated_resource])
+             for interface, validated_resource in pairs]
+    created = Resource.objects.bulk_create([resource for _, resources in pairs for resource in resources])
+    through = Interface.resource.through
+    through.objects.bulk_create([through(interface_id=interface.pk, resource_id=resource.pk)
+                                 for interface, resources in pairs for resource in resources])
+    if created:
+        bulk_saved.send(sender=Resource, instances=created, created=True)
+    return created
+
+
+def replace_resources(interface_ids, pairs):
+    """
+    Delete every resource linked to `interface_ids` with a single DELETE, then insert the resources in `pairs`.
+    """
+    Resource.objects.filter(interface__in=interface_ids).delete()
+    add_resources(pairs)
+
+
+def merge_resources(interfaces, pairs):
+    """
+    Apply each `(interface, [validated resource])` pair to `interfaces` (a pk → Interface dict): resources with an id
+    are loaded in one query and written back with one bulk_update, resources without one are inserted.
+    """
+    ids = {item['id'] for _, validated_resource in pairs for item in validated_resource if 'id' in item}
+    resources = Resource.objects.filter(pk__in=ids, interface__in=list(interfaces)).in_bulk()
+    if ids - set(resources):
+        raise unknown_ids('resource', ids - set(resources))
+
+    updated, fields, added = [], set(), []
+    for interface, validated_resource in pairs:
+        for item in validated_resource:
+            if 'id' not in item:
+                added.append((interface, [item]))
+                continue
+            resource = resources[item['id']]
+            update_instance(resource, without_id(item))
+            fields.update(without_id(item))
+            updated.append(resource)
+
+    if updated and fields:
+        Resource.objects.bulk_update(updated, fields)
+        bulk_saved.send(sender=Resource, instances=updated, created=False)
+    add_resources(added)
+
+
+def create_interfaces(validated_interface):
+    """
+    Insert `validated_interface` and their nested resources with one bulk_create per table, and return the new
+    interfaces.
+    """
+    interfaces, pairs = [], []
+    for item in validated_interface:
+        item = without_id(item)
+        validated_resource = object_or_empty(item, 'resource')
+        interface = Interface(**item)
+        interface.update_address_keys()  # bulk_create skips save(), which normally keeps the keys in step
+        interfaces.append(interface)
+        pairs.append((interface, validated_resource))
+
+    Interface.objects.bulk_create(interfaces)
+    add_resources(pairs)
+    if interfaces:
+        bulk_saved.send(sender=Interface, instances=interfaces, created=True)
+    return interfaces
+
+
+def replace_interfaces(relation, validated_interface):
+    """
+    Replace the interfaces of `relation` (e.g. `entity.interface`): the old interfaces and their resources go in one
+    DELETE each, the new ones are inserted in bulk.
+    """
+    existing = list(relation.values_list('pk', flat=True))
+    if existing:
+        Resource.objects.filter(interface__in=existing).delete()
+        Interface.objects.filter(pk__in=existing).delete()
+    created = create_interfaces(validated_interface)
+    if created:
+        relation.add(*created)
+
+
+def merge_interfaces(relation, field, validated_interface):
+    """
+    Merge `validated_interface` into the interfaces of `relation`. Interfaces and resources with an id must already
+    belong to the parent; they are loaded in one query per table and written back with bulk_update. Items without
+    an id are inserted and linked.
+    """
+    ids = {item['id'] for item in validated_interface if 'id' in item}
+    interfaces = relation.in_bulk(ids)
+    if ids - set(interfaces):
+        raise unknown_ids(field, ids - set(interfaces))
+
+    updated, fields, pairs, added = [], set(), [], []
+    for item in validated_interface:
+        if 'id' not in item:
+            added.append(item)
+            continue
+        interface = interfaces[item['id']]
+        item = without_id(item)
+        if 'resource' in item:
+            pairs.append((interface, item.pop('resource')))
+        if item:
+            update_instance(interface, item)
+            fields.update(item)
+            fields.update(interface.update_address_keys())
+            updated.append(interface)
+
+    merge_resources(interfaces, pairs)
+    if updated:
+        Interface.objects.bulk_update(updated, fields)
+        bulk_saved.send(sender=Interface, instances=updated, created=False)
+    created = create_interfaces(added)
+    if created:
+        relation.add(*created)
+
+
+def write_interfaces(relation, field, validated_interface):
+    """
+    Write nested interfaces the way the API always has: a list without ids replaces the existing interfaces, a list
+    with ids is merged into them.
+    """
+    if find_id(validated_interface):
+        merge_interfaces(relation, field, validated_interface)
+    else:
+        replace_interfaces(relation, validated_interface)
+
+
 class SSIDSerializer(serializers.ModelSerializer):
     client = InterfaceSerializer(many=True, required=False)
     id = serializers.IntegerField(required=False)
@@ -130,57 +269,23 @@ class SSIDSerializer(serializers.ModelSerializer):
             'last_seen',
         )
 
-    def to_representation(self, instance):
-        rep = super().to_representation(instance)
-        return rep
-
     def create(self, validated_data):
         validated_interface = object_or_empty(validated_data, 'client')
-        instance = SSID.objects.create(**validated_data)
-
-        for interface in validated_interface:
-            validated_resource = object_or_empty(interface, 'resource')
-            created_address = instance.client.create(**interface)
-
-            for resource in validated_resource:
-                created_address.resource.create(**resource)
+        with transaction.atomic():
+            instance = SSID.objects.create(**validated_data)
+            created = create_interfaces(validated_interface)
+            if created:
+                instance.client.add(*created)
 
         return instance
 
     def update(self, instance, validated_data):
-        if 'client' in validated_data:
-            validated_interface = validated_data.pop('client')
-            if not find_id(validated_interface):
-                interfaces = instance.client.all()
-                for interface in interfaces:
-                    interface.resource.all().delete()
-                interfaces.all().delete()
-
-                for found in validated_interface:
-                    # extract resources from address
-                    if 'resource' in found:
-                        validated_resource = found.pop('resource')
-                        created_interface = instance.client.create(**found)
-
-                        for resource in validated_resource:
-                            created_interface.resource.create(**resource)
-            else:
-                for interface in validated_interface:
-                    if 'resource' in interface:
-                        validated_resources = interface.pop('resource')
-                        for resource in validated_resources:
-                            pk = resource.pop('id')
-                            resource_instance = Resource.objects.get(pk=pk)
-                            update_instance(resource_instance, resource)
-                            resource_instance.save()
-
-                    pk = interface.pop('id')
-                    address_instance = Interface.objects.get(pk=pk)
-                    update_instance(address_instance, interface)
-                    address_instance.save()
+        with transaction.atomic():
+            if 'client' in validated_data:
+                write_interfaces(instance.client, 'client', validated_data.pop('client'))
 
-        update_instance(instance, validated_data)
-        instance.save()
+            update_instance(instance, validated_data)
+            instance.save()
         return instance
 
 
@@ -204,54 +309,21 @@ class EntitySerializer(serializers.ModelSerializer):
             'last_seen',
         )
 
-    def to_representation(self, instance):
-        rep = super().to_representation(instance)
-        return rep
-
     def create(self, validated_data):
         validated_interface = object_or_empty(validated_data, 'interface')
-        instance = Entity.objects.create(**validated_data)
-
-        for interface in validated_interface:
-            validated_resource = object_or_empty(interface, 'resource')
-            created_address = instance.interface.create(**interface)
-
-            for resource in validated_resource:
-                created_address.resource.create(**resource)
+        with transaction.atomic():
+            instance = Entity.objects.create(**validated_data)
+            created = create_interfaces(validated_interface)
+            if created:
+                instance.interface.add(*created)
 
         return instance
 
     def update(self, instance, validated_data):
-        if 'interface' in validated_data:
-            validated_interface = validated_data.pop('interface')
-            if not find_id(validated_interface):
-                interfaces = instance.interface.all()
-                for interface in interfaces:
-                    interface.resource.all().delete()
-                interfaces.all().delete()
-
-                for interface in validated_interface:
-                    # extract resources from address
-                    validated_resource = interface.pop('resource')
-                    created_interface = instance.interface.create(**interface)
-
-                    for resource in validated_resource:
-                        created_interface.resource.create(**resource)
-            else:
-                for interface in validated_interface:
-                    if 'resource' in interface:
-                        validated_resources = interface.pop('resource')
-                        for resource in validated_resources:
-                            pk = resource.pop('id')
-                            resource_instance = Resource.objects.get(pk=pk)
-                            update_instance(resource_instance, resource)
-                            resource_instance.save()
-
-                    pk = interface.pop('id')
-                    address_instance = Interface.objects.get(pk=pk)
-                    update_instance(address_instance, interface)
-                    address_instance.save()
+        with transaction.atomic():
+            if 'interface' in validated_data:
+                write_interfaces(instance.interface, 'interface', validated_data.pop('interface'))
 
-        update_instance(instance, validated_data)
-        instance.save()
+            update_instance(instance, validated_data)
+            instance.save()
         return instance
@@ -1,9 +1,12 @@
 import json
+from unittest import mock
 from deepdiff import DeepDiff
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-from entity.models import Resource, Interface
+from entity.models import Resource, Interface, Entity, SSID
 
 
 # noinspection PyUnresolvedReferences
@@ -867,3 +870,174 @@ class EntityTests(TestCase):
         if not ignore_response:
             self.assertEqual(response.status_code, 204)
         return response
+
+
+# noinspection PyUnresolvedReferences
+class EntityQueryTests(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        self.client.login(username='temporary', password='temporary')
+
+    @staticmethod
+    def create_entities(count, interfaces):
+        for index in range(count):
+            entity = Entity.objects.create(name='host{index}'.format(index=index))
+            for _ in range(interfaces):
+                interface = entity.interface.create(name='eth')
+                interface.resource.create(port=80)
+                interface.resource.create(port=443)
+
+    def list_queries(self, table):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/{resource}/'.format(resource=table))
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_entity_list_queries_are_constant(self):
+        self.create_entities(count=1, interfaces=1)
+        baseline = self.list_queries('entities')
+        self.create_entities(count=5, interfaces=4)
+        self.assertEqual(self.list_queries('entities'), baseline)
+
+    def test_interface_list_queries_are_constant(self):
+        self.create_entities(count=1, interfaces=1)
+        baseline = self.list_queries('interfaces')
+        self.create_entities(count=2, interfaces=4)
+        self.assertEqual(self.list_queries('interfaces'), baseline)
+
+    def test_ssid_list_queries_are_constant(self):
+        self.create_entities(count=1, interfaces=3)
+        ssid = SSID.objects.create(name='Base Station')
+        ssid.client.set(Interface.objects.all())
+        baseline = self.list_queries('ssids')
+        SSID.objects.create(name='Guest').client.set(Interface.objects.all())
+        self.assertEqual(self.list_queries('ssids'), baseline)
+
+    def test_sparse_fields_skip_unrequested_prefetches(self):
+        self.create_entities(count=2, interfaces=2)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/entities/?fields=id,name,interface.name')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['interface'], [{'name': 'eth'}, {'name': 'eth'}])
+        queries = [query['sql'] for query in context.captured_queries]
+        self.assertFalse([sql for sql in queries if 'FROM "entity_resource"' in sql])
+        self.assertFalse([sql for sql in queries if 'FROM "entity_interface"' in sql and '"vendor"' in sql])
+
+    def test_omit_nested_relation(self):
+        self.create_entities(count=1, interfaces=2)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/entities/?omit=interface.resource,notes')
+        self.assertEqual(response.status_code, 200)
+        entity = response.json()['results'][0]
+        self.assertNotIn('notes', entity)
+        self.assertNotIn('resource', entity['interface'][0])
+        self.assertFalse([query for query in context.captured_queries if 'FROM "entity_resource"' in query['sql']])
+
+    def test_entity_cidr_filter(self):
+        entity = Entity.objects.create(name='router')
+        entity.interface.create(name='lan', ip_v4='10.20.0.1')
+        entity.interface.create(name='wan', ip_v4='10.20.0.2')
+        Entity.objects.create(name='laptop').interface.create(name='wlan', ip_v4='192.168.0.2')
+
+        response = self.client.get('/api/v1/entities/?cidr=10.20.0.0/16')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['name'] for row in response.data['results']], ['router'])
+
+    def test_entity_export_matches_list(self):
+        self.create_entities(count=3, interfaces=2)
+        listed = self.client.get('/api/v1/entities/').data['results']
+
+        response = self.client.get('/api/v1/entities/export/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        exported = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(len(DeepDiff(exported, json.loads(json.dumps(listed)))), 0)
+
+    @staticmethod
+    def nested_interfaces(count, ports=(22, 80, 443)):
+        return [{"name": "eth{index}".format(index=index), "ip_v4": "10.0.0.{index}".format(index=index + 1),
+                 "resource": [{"port": port, "type": "TCP"} for port in ports]} for index in range(count)]
+
+    def write_queries(self, method, url, body):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(url, json.dumps(body), content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(context.captured_queries)
+
+    def test_entity_replace_queries_are_constant(self):
+        entity = self.client.post('/api/v1/entities/', {"name": "host", "interface": self.nested_interfaces(1)},
+                                  content_type='application/json').data
+        url = '/api/v1/entities/{pk}/'.format(pk=entity['id'])
+        baseline = self.write_queries('put', url, {"name": "host", "interface": self.nested_interfaces(2)})
+        self.assertEqual(self.write_queries('put', url, {"name": "host", "interface": self.nested_interfaces(10)}),
+                         baseline)
+
+        entity = self.client.get(url).data
+        self.assertEqual(len(entity['interface']), 10)
+        self.assertEqual([resource['port'] for resource in entity['interface'][9]['resource']], [22, 80, 443])
+        self.assertEqual(Interface.objects.count(), 10)
+        self.assertEqual(Resource.objects.count(), 30)
+        self.assertEqual(Entity.objects.filter(interface__ip_v4_key__isnull=False).count(), 10)
+
+    def test_ssid_merge_queries_are_constant(self):
+        ssid = self.client.post('/api/v1/ssids/', {"name": "Base Station", "client": self.nested_interfaces(10)},
+                                content_type='application/json').data
+        url = '/api/v1/ssids/{pk}/'.format(pk=ssid['id'])
+
+        def merged(clients):
+            return {"client": [{"id": client['id'], "notes": "merged", "ip_v4": "10.1.0.1",
+                                "resource": [{"id": resource['id'], "notes": "merged"}
+                                             for resource in client['resource']]} for client in clients]}
+
+        baseline = self.write_queries('patch', url, merged(ssid['client'][:1]))
+        self.assertEqual(self.write_queries('patch', url, merged(ssid['client'])), baseline)
+
+        clients = self.client.get(url).data['client']
+        self.assertEqual({client['notes'] for client in clients}, {'merged'})
+        self.assertEqual({resource['notes'] for client in clients for resource in client['resource']}, {'merged'})
+        self.assertEqual(Interface.objects.filter(ip_v4_key__isnull=False).exclude(ip_v4='10.1.0.1').count(), 0)
+
+    def test_merge_rejects_foreign_ids(self):
+        first = self.client.post('/api/v1/entities/', {"name": "first", "interface": self.nested_interfaces(1)},
+                                 content_type='application/json').data
+        second = self.client.post('/api/v1/entities/', {"name": "second", "interface": self.nested_interfaces(1)},
+                                  content_type='application/json').data
+
+        response = self.client.patch('/api/v1/entities/{pk}/'.format(pk=first['id']),
+                                     {"name": "renamed", "interface": [{"id": second['interface'][0]['id'],
+                                                                        "name": "stolen"}]},
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('interface', response.data)
+        self.assertEqual(Entity.objects.get(pk=first['id']).name, 'first')
+        self.assertEqual(Interface.objects.filter(name='stolen').count(), 0)
+
+    def create_queries(self, table, body):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post('/api/v1/{resource}/'.format(resource=table), body,
+                                        content_type='application/json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return len(context.captured_queries)
+
+    def test_nested_create_queries_are_constant(self):
+        baseline = self.create_queries('ssids', {"name": "Base Station", "client": self.nested_interfaces(1)})
+        # 50 interfaces stay inside a single SQLite insert batch (999 parameters); larger lists add a batch per table
+        self.assertEqual(self.create_queries('ssids', {"name": "Guest", "client": self.nested_interfaces(50)}),
+                         baseline)
+        baseline = self.create_queries('entities', {"name": "router", "interface": self.nested_interfaces(1)})
+        self.assertEqual(self.create_queries('entities', {"name": "host", "interface": self.nested_interfaces(20)}),
+                         baseline)
+
+        ssid = self.client.get('/api/v1/ssids/{pk}/'.format(pk=SSID.objects.get(name='Guest').pk)).data
+        self.assertEqual(len(ssid['client']), 50)
+        self.assertEqual([resource['port'] for resource in ssid['client'][49]['resource']], [22, 80, 443])
+        self.assertEqual(Interface.objects.filter(ip_v4_key__isnull=True).count(), 0)
+
+    def test_nested_create_is_atomic(self):
+        with mock.patch.object(Interface.resource.through.objects, 'bulk_create', side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                self.client.post('/api/v1/entities/', {"name": "host", "interface": self.nested_interfaces(3)},
+                                 content_type='application/json')
+        self.assertFalse(Entity.objects.exists())
+        self.assertFalse(Interface.objects.exists())
+        self.assertFalse(Resource.objects.exists())
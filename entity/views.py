@@ -1,24 +1,60 @@
 from rest_framework import permissions, viewsets
+from changes.views import ChangesMixin
 from entity.filters import EntitiesFilter, InterfaceFilter
 from entity.models import Interface, Entity, Resource, SSID
-from entity.serializers import EntitySerializer, InterfaceSerializer, ResourceSerializer, SSIDSerializer
+from entity.serializers import EntitySerializer, InterfaceSerializer, ResourceSerializer, SSIDSerializer, \
+    prefetch_fields
+from entity_api.asynchronous import AsyncReadMixin
+from entity_api.cache import CacheMixin
+from entity_api.conditional import ConditionalMixin
+from entity_api.encoders import EncoderMixin
+from entity_api.export import ExportMixin
+from entity_api.sparse import SparseFieldsMixin
+
+
+class PrefetchMixin:
+    """
+    Prefetch every nested relation rendered by the view's serializer, so a page of results costs a fixed
+    number of queries regardless of how many interfaces and resources each object has.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        return queryset.prefetch_related(*prefetch_fields(self.get_serializer()))
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        self.refetch(serializer)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self.refetch(serializer)
+
+    def refetch(self, serializer):
+        # the nested rows were just written, so render the response from a freshly prefetched copy rather than
+        # letting the serializer load them one parent at a time
+        serializer.instance = self.get_queryset().get(pk=serializer.instance.pk)
 
 
 # noinspection PyUnresolvedReferences
-class SSIDViewSet(viewsets.ModelViewSet):
+class SSIDViewSet(ConditionalMixin, CacheMixin, ExportMixin, ChangesMixin, EncoderMixin, SparseFieldsMixin,
+                  PrefetchMixin, AsyncReadMixin, viewsets.ModelViewSet):
     queryset = SSID.objects.all()
     # permission_classes = [permissions.IsAuthenticated]
     serializer_class = SSIDSerializer
+    keyset_ordering = ('last_seen', 'id')
 
 
-class ResourceViewSet(viewsets.ModelViewSet):
+class ResourceViewSet(ConditionalMixin, CacheMixin, ExportMixin, EncoderMixin, SparseFieldsMixin, AsyncReadMixin,
+                      viewsets.ModelViewSet):
     queryset = Resource.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = ResourceSerializer
 
 
 # noinspection PyUnresolvedReferences
-class InterfaceViewSet(viewsets.ModelViewSet):
+class InterfaceViewSet(ConditionalMixin, CacheMixin, ExportMixin, EncoderMixin, SparseFieldsMixin, PrefetchMixin,
+                       AsyncReadMixin, viewsets.ModelViewSet):
     queryset = Interface.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = InterfaceSerializer
@@ -27,8 +63,10 @@ class InterfaceViewSet(viewsets.ModelViewSet):
 
 # noinspection PyUnresolvedReferences
 
-class EntityViewSet(viewsets.ModelViewSet):
+class EntityViewSet(ConditionalMixin, CacheMixin, ExportMixin, ChangesMixin, EncoderMixin, SparseFieldsMixin,
+                    PrefetchMixin, AsyncReadMixin, viewsets.ModelViewSet):
     queryset = Entity.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = EntitySerializer
+    keyset_ordering = ('last_seen', 'id')
     filterset_class = EntitiesFilter
@@ -0,0 +1,75 @@
+import ipaddress
+
+from django.db import models
+
+# IPv4 addresses are keyed by their IPv4-mapped IPv6 form (::ffff:a.b.c.d) so both families share one key space.
+IPV4_MAPPED = 0xffff << 32
+
+
+def address_key(address):
+    """
+    Encode an IP address as a fixed width hex string whose lexical order matches numeric order, so equality,
+    range and subnet lookups on the key column are plain indexed comparisons on every database backend.
+    """
+    if address in (None, ''):
+        return None
+    if not isinstance(address, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+        try:
+            address = ipaddress.ip_address(str(address).strip())
+        except ValueError:
+            return None
+    value = int(address) + IPV4_MAPPED if address.version == 4 else int(address)
+    return '{value:032x}'.format(value=value)
+
+
+def network_range(network):
+    """
+    Return the lowest and highest address keys of `network`, e.g. '10.20.0.0/16'.
+    """
+    if not isinstance(network, (ipaddress.IPv4Network, ipaddress.IPv6Network)):
+        network = ipaddress.ip_network(str(network).strip(), strict=False)
+    return address_key(network.network_address), address_key(network.broadcast_address)
+
+
+# the keys of every IPv4 address, ::ffff:0.0.0.0 to ::ffff:255.255.255.255
+IPV4_KEY_RANGE = network_range('0.0.0.0/0')
+
+
+def address_key_field():
+    return models.CharField(max_length=32, default=None, blank=True, null=True, editable=False)
+
+
+class AddressKeyMixin(models.Model):
+    """
+    Keeps the sortable key columns listed in `address_keys` (key field -> address field) in step with their
+    addresses on save. Bulk writes bypass save() and must call `update_address_keys()` themselves.
+    """
+    address_keys = {}
+
+    class Meta:
+        abstract = True
+
+    def update_address_keys(self):
+        for key_field, address_field in self.address_keys.items():
+            setattr(self, key_field, address_key(getattr(self, address_field)))
+        return list(self.address_keys)
+
+    def save(self, *args, **kwargs):
+        self.update_address_keys()
+        super().save(*args, **kwargs)
+
+
+def backfill_address_keys(model, address_keys, batch_size=1000):
+    """
+    Populate the key columns of existing rows; used by data migrations, where `model` is a historical model.
+    """
+    batch = []
+    for instance in model.objects.only('pk', *address_keys.values()).iterator(chunk_size=batch_size):
+        for key_field, address_field in address_keys.items():
+            setattr(instance, key_field, address_key(getattr(instance, address_field)))
+        batch.append(instance)
+        if len(batch) == batch_size:
+            model.objects.bulk_update(batch, list(address_keys))
+            batch = []
+    if batch:
+        model.objects.bulk_update(batch, list(address_keys))
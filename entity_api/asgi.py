@@ -12,5 +12,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'entity_api.settings')
+# serve list and retrieve from async views, so reads are not queued behind one another
+os.environ.setdefault('ASYNC_READS', '1')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from entity_api import events  # noqa: E402  needs the app registry populated above
+
+# the Server-Sent Events stream of writes is served here, ahead of Django, which cannot stream asynchronously
+application = events.router(django_application)
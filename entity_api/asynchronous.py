@@ -0,0 +1,44 @@
+import functools
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils.decorators import classonlymethod
+
+READ_ACTIONS = ('list', 'retrieve')
+
+
+def read(view, request, *args, **kwargs):
+    # Runs on a pool thread, which has its own database connections: they are closed (or kept, per CONN_MAX_AGE)
+    # here, since request_finished only cleans up the thread-sensitive thread.
+    close_old_connections()
+    try:
+        return view(request, *args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+class AsyncReadMixin:
+    """
+    With ASYNC_READS on (entity_api.asgi turns it on), the list and retrieve routes are async views: GET and HEAD
+    run the whole DRF read path (authentication, cache, conditional checks, query) on the thread pool, so reads are
+    served concurrently instead of queueing for the single thread Django runs sync views on under ASGI. Writes and
+    the other actions stay on that thread.
+
+    Django 4.1's async ORM (aget, aiterator) is not used: it hands every query to that same single thread, and
+    aiterator() refuses prefetch_related.
+    """
+
+    @classonlymethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if not getattr(settings, 'ASYNC_READS', False) or (actions or {}).get('get') not in READ_ACTIONS:
+            return view
+
+        @functools.wraps(view)
+        async def async_view(request, *args, **kwargs):
+            if request.method in ('GET', 'HEAD'):
+                return await sync_to_async(read, thread_sensitive=False)(view, request, *args, **kwargs)
+            return await sync_to_async(view, thread_sensitive=True)(request, *args, **kwargs)
+
+        return async_view
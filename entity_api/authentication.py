@@ -0,0 +1,106 @@
+import copy
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from rest_framework.authentication import BasicAuthentication, TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+class TTLCache:
+    """
+    A bounded, thread-safe LRU whose entries also expire `ttl` seconds after they were stored.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def discard(self, matches):
+        with self.lock:
+            for key in [key for key, (_, value) in self.entries.items() if matches(value)]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+# Verified (user, auth) pairs, per process. The TTL bounds how long a change made in another process (or straight
+# in the database) can go unnoticed; changes made through the ORM in this process revoke entries immediately.
+credentials = TTLCache(getattr(settings, 'AUTH_CACHE_SIZE', 4096), getattr(settings, 'AUTH_CACHE_TTL', 60))
+
+
+def credential_key(*parts):
+    # keyed hash, so neither passwords nor tokens are kept in memory in the clear
+    return hmac.new(settings.SECRET_KEY.encode(), '\0'.join(parts).encode(), hashlib.sha256).hexdigest()
+
+
+def cached(key, verify):
+    found = credentials.get(key)
+    if found is None:
+        found = verify()
+        credentials.set(key, found)
+    user, auth = found
+    return copy.copy(user), auth  # requests may annotate request.user, so never hand out the shared instance
+
+
+def revoke_user(sender, instance, **kwargs):
+    credentials.discard(lambda found: found[0].pk == instance.pk)
+
+
+def revoke_token(sender, instance, **kwargs):
+    credentials.discard(lambda found: found[0].pk == instance.user_id)
+
+
+post_save.connect(revoke_user, sender=settings.AUTH_USER_MODEL, dispatch_uid='auth-cache-user-save')
+post_delete.connect(revoke_user, sender=settings.AUTH_USER_MODEL, dispatch_uid='auth-cache-user-delete')
+post_save.connect(revoke_token, sender=Token, dispatch_uid='auth-cache-token-save')
+post_delete.connect(revoke_token, sender=Token, dispatch_uid='auth-cache-token-delete')
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    """
+    Basic authentication that runs the password hasher once per credential pair and TTL, rather than on every
+    request. Failed attempts are never cached, so guessing still pays the full hashing cost.
+    """
+
+    def authenticate_credentials(self, userid, password, request=None):
+        return cached(credential_key('basic', userid, password),
+                      lambda: super(CachedBasicAuthentication, self).authenticate_credentials(userid, password, request))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that remembers token → user lookups instead of joining authtoken_token and auth_user on
+    every request.
+    """
+
+    def authenticate_credentials(self, key):
+        return cached(credential_key('token', key),
+                      lambda: super(CachedTokenAuthentication, self).authenticate_credentials(key))
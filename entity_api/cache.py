@@ -0,0 +1,175 @@
+import hashlib
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.http import HttpResponse
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from changes.models import Counter
+from changes.revisions import RevisionMixin, allocate
+from entity_api.signals import bulk_saved
+
+CACHE_ALIAS = 'api'
+STATS = ('hits', 'misses')
+
+
+def api_cache():
+    return caches[CACHE_ALIAS]
+
+
+def counters(models):
+    """
+    Return the `(value, changed_at)` write counter of each model, read in one query from the per-table counter rows
+    of the changes app. They live in the database and move in the writing transaction, so every process sees a write
+    as soon as it commits. Tables without a recorded write have no row: `(0, None)`.
+    """
+    rows = Counter.objects.filter(kind__in=[model._meta.label_lower for model in models]) \
+        .values_list('kind', 'value', 'changed_at')
+    found = {kind: (value, changed_at) for kind, value, changed_at in rows}
+    return [found.get(model._meta.label_lower, (0, None)) for model in models]
+
+
+def version(counter):
+    # a counter rolled back with its transaction, or restored with the database, repeats its value but not its time
+    return '{0}@{1}'.format(*counter)
+
+
+def versions(models):
+    return [version(counter) for counter in counters(models)]
+
+
+def last_changed(found):
+    """
+    Return the time of the latest write among `counters()` results, as a POSIX timestamp. Tables with no recorded
+    write are treated as changed now.
+    """
+    changed = [changed_at for _, changed_at in found]
+    if None in changed:
+        return time.time()
+    return max(changed).timestamp()
+
+
+def invalidate(*models, using=DEFAULT_DB_ALIAS):
+    """
+    Invalidate every cached response and validator that depends on `models` by advancing their write counters, in
+    the current transaction.
+    """
+    with transaction.atomic(using, savepoint=False):
+        for model in sorted(models, key=lambda model: model._meta.label_lower):
+            allocate(model, 1, using)
+
+
+def count(stat):
+    try:
+        api_cache().incr('api:stats:' + stat)
+    except ValueError:
+        api_cache().add('api:stats:' + stat, 1, timeout=None)
+
+
+def statistics():
+    found = api_cache().get_many(['api:stats:' + stat for stat in STATS])
+    return {stat: found.get('api:stats:' + stat, 0) for stat in STATS}
+
+
+def model_saved(sender, using=DEFAULT_DB_ALIAS, origin=None, **kwargs):
+    # tracked models advance their counter as they write; a delete advances it once per table, however many rows it
+    # removes, keeping the tables counted on its `origin`
+    if issubclass(sender, RevisionMixin):
+        return
+    if origin is not None:
+        counted = origin.__dict__.setdefault('_counted', set())
+        if sender in counted:
+            return
+        counted.add(sender)
+    invalidate(sender, using=using)
+
+
+def relation_changed(sender, instance, action, model, using=DEFAULT_DB_ALIAS, **kwargs):
+    if action.startswith('post_'):
+        invalidate(type(instance), model, using=using)
+
+
+def watch(models):
+    """
+    Invalidate cached responses whenever one of `models` is written.
+    """
+    for model in models:
+        uid = 'api-cache-' + model._meta.label_lower
+        post_save.connect(model_saved, sender=model, dispatch_uid=uid)
+        post_delete.connect(model_saved, sender=model, dispatch_uid=uid)
+        bulk_saved.connect(model_saved, sender=model, dispatch_uid=uid)
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(relation_changed, sender=field.remote_field.through,
+                                dispatch_uid=uid + '-' + field.name)
+
+
+def serializer_models(serializer):
+    """
+    Return the models rendered by `serializer`, including those of nested serializers.
+    """
+    models = {serializer.Meta.model}
+    for field in serializer.fields.values():
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if isinstance(nested, serializers.ModelSerializer):
+            models |= serializer_models(nested)
+    return models
+
+
+class CacheMixin:
+    """
+    Serves list and retrieve responses from the `api` cache. Entries are keyed on the path, query string, user and
+    accepted renderer, plus the change counters of every model the serializer renders, so a write to any of those
+    models makes the affected entries unreachable.
+    """
+    cache_timeout = DEFAULT_TIMEOUT  # the `api` cache's TIMEOUT
+
+    def cache_key(self, request):
+        models = sorted(serializer_models(self.get_serializer()), key=lambda model: model._meta.label_lower)
+        parts = [
+            request.path,
+            request.META.get('QUERY_STRING', ''),
+            str(request.user.pk),
+            request.accepted_renderer.format,
+        ] + [str(version) for version in versions(models)]
+        return 'api:response:' + hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+    def cached(self, request, render, *args, **kwargs):
+        key = self.cache_key(request)
+        entry = api_cache().get(key)
+        if entry is not None:
+            count('hits')
+            content, content_type = entry
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        count('misses')
+        self.response_cache_key = key
+        return render(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached(request, super().retrieve, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, 'response_cache_key', None)
+        if key is not None and response.status_code == 200:
+            response['X-Cache'] = 'MISS'
+            response.add_post_render_callback(lambda rendered: self.store(key, rendered))
+        return response
+
+    def store(self, key, response):
+        api_cache().set(key, (response.content, response['Content-Type']), self.cache_timeout)
+
+
+class CacheStatsView(APIView):
+    def get(self, request):
+        return Response(statistics())
@@ -0,0 +1,65 @@
+import hashlib
+import math
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from entity_api.cache import counters, last_changed, serializer_models, version
+
+
+class ConditionalMixin:
+    """
+    Adds ETag and Last-Modified validators to list and retrieve, and answers If-None-Match / If-Modified-Since with
+    304 Not Modified before the queryset is evaluated or serialized.
+
+    List ETags are derived from the write counters of every model the serializer renders, read from the database so
+    that every process agrees on them. Detail ETags hash the row itself plus the counters of any nested models.
+    Last-Modified is the time of the latest write to those tables.
+    """
+
+    def validators(self, request, detail):
+        models = sorted(serializer_models(self.get_serializer()), key=lambda model: model._meta.label_lower)
+        parts = [
+            request.path,
+            request.META.get('QUERY_STRING', ''),
+            str(request.user.pk),
+            request.accepted_renderer.format,
+        ]
+
+        counted = models
+        if detail:
+            model = self.get_queryset().model
+            lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+            try:
+                row = model._default_manager.filter(**{self.lookup_field: lookup}).values_list().first()
+            except (TypeError, ValueError):
+                row = None  # the view answers the malformed lookup itself
+            counted = [related for related in models if related is not model]
+            parts.append(repr(row))
+
+        found = dict(zip(models, counters(models)))
+        parts += [version(found[related]) for related in counted]
+        etag = '"{digest}"'.format(digest=hashlib.sha1('|'.join(parts).encode()).hexdigest())
+        # HTTP dates have one second resolution, so round up rather than report a write as older than it was
+        return etag, math.ceil(last_changed(found.values()))
+
+    def conditional(self, request, render, detail, *args, **kwargs):
+        self.etag, self.last_modified = self.validators(request, detail)
+        response = get_conditional_response(request, etag=self.etag, last_modified=self.last_modified)
+        if response is not None:
+            return response
+        return render(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(request, super().list, False, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(request, super().retrieve, True, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, 'etag', None) and response.status_code in (200, 304):
+            response['ETag'] = self.etag
+            if self.last_modified is not None:
+                response['Last-Modified'] = http_date(self.last_modified)
+        return response
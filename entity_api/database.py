@@ -0,0 +1,67 @@
+# Imported by settings, so nothing here may touch Django or DRF at import time.
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+ENGINES = {
+    'sqlite': 'django.db.backends.sqlite3',
+    'postgres': 'django.db.backends.postgresql',
+    'postgresql': 'django.db.backends.postgresql',
+}
+
+TRUE = ('1', 'true', 'yes', 'on')
+
+
+def flag(environ, name, default):
+    value = environ.get(name)
+    return default if value is None else value.lower() in TRUE
+
+
+def conn_max_age(environ, default):
+    value = environ.get('DATABASE_CONN_MAX_AGE')
+    if value is None:
+        return default
+    return None if value.lower() == 'none' else int(value)  # None keeps connections open for good
+
+
+def database_config(environ, base_dir):
+    """
+    Build the `default` DATABASES entry from the environment.
+
+    Without DATABASE_URL the project runs on `db.sqlite3`, as it always has. `DATABASE_URL=postgres://user:password@
+    host:port/name?sslmode=require` switches to PostgreSQL with persistent connections (DATABASE_CONN_MAX_AGE,
+    60 seconds unless set, `none` for unlimited) that are health checked before reuse. Behind a transaction-mode
+    pooler such as PgBouncer set DATABASE_POOLER=pgbouncer: server-side cursors do not survive a transaction
+    boundary there, so they are turned off.
+
+    DATABASE_SQLITE_CONCURRENT=1 keeps SQLite but switches to the `entity_api.sqlite` backend (WAL, tuned pragmas,
+    BEGIN IMMEDIATE, persistent connections) with a busy timeout of DATABASE_SQLITE_BUSY_TIMEOUT seconds (20 unless
+    set), so single-node deployments can serve reads while several scanners write.
+    """
+    url = environ.get('DATABASE_URL')
+    if not url:
+        config = {'ENGINE': ENGINES['sqlite'], 'NAME': base_dir / 'db.sqlite3'}
+    else:
+        parts = urlsplit(url)
+        if parts.scheme not in ENGINES:
+            raise ValueError('Unsupported DATABASE_URL scheme {scheme!r}, expected one of: {schemes}.'.format(
+                scheme=parts.scheme, schemes=', '.join(ENGINES)))
+        config = {'ENGINE': ENGINES[parts.scheme], 'NAME': unquote(parts.path[1:])}
+        if parts.scheme != 'sqlite':
+            config.update({
+                'USER': unquote(parts.username or ''),
+                'PASSWORD': unquote(parts.password or ''),
+                'HOST': parts.hostname or '',
+                'PORT': str(parts.port or ''),
+                'OPTIONS': dict(parse_qsl(parts.query)),
+            })
+
+    concurrent = config['ENGINE'] == ENGINES['sqlite'] and flag(environ, 'DATABASE_SQLITE_CONCURRENT', False)
+    if concurrent:
+        config['ENGINE'] = 'entity_api.sqlite'
+        config['OPTIONS'] = {'timeout': float(environ.get('DATABASE_SQLITE_BUSY_TIMEOUT', 20))}
+
+    postgresql = config['ENGINE'] == ENGINES['postgresql']
+    config['CONN_MAX_AGE'] = conn_max_age(environ, 60 if postgresql or concurrent else 0)
+    config['CONN_HEALTH_CHECKS'] = flag(environ, 'DATABASE_CONN_HEALTH_CHECKS', postgresql)
+    if environ.get('DATABASE_POOLER', '').lower() == 'pgbouncer':
+        config['DISABLE_SERVER_SIDE_CURSORS'] = True
+    return config
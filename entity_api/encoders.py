@@ -0,0 +1,87 @@
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from entity_api.metrics import serializing
+from entity_api.sparse import SPARSE_PARAMETERS
+
+# Fields whose representation is the attribute value itself, so the encoder can skip to_representation().
+PASSTHROUGH_FIELDS = (serializers.CharField, serializers.IntegerField, serializers.ChoiceField)
+
+
+def compile_encoder(serializer):
+    """
+    Compile `serializer` into a function that renders an instance to the same dict as `serializer.data`, reading
+    attributes directly instead of going through the serializer field machinery for every row.
+
+    Nested many=True serializers are rendered from `<relation>.all()`, so callers should prefetch them. A serializer
+    that overrides to_representation() is rendered by it, since only the stock field-by-field output can be compiled.
+    """
+    if type(serializer).to_representation is not serializers.Serializer.to_representation:
+        return serializer.to_representation
+
+    plan = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.ListSerializer):
+            plan.append((name, field.source, 'many', compile_encoder(field.child)))
+        elif isinstance(field, serializers.BaseSerializer):
+            plan.append((name, field.source, 'one', compile_encoder(field)))
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            plan.append((name, field.source + '_id', 'value', None))
+        elif isinstance(field, PASSTHROUGH_FIELDS) and not isinstance(field, serializers.MultipleChoiceField):
+            plan.append((name, field.source, 'value', None))
+        else:
+            plan.append((name, field.source, 'field', field.to_representation))
+
+    def encode(instance):
+        row = {}
+        for name, source, kind, convert in plan:
+            value = getattr(instance, source)
+            if value is None:
+                row[name] = None
+            elif kind == 'value':
+                row[name] = value
+            elif kind == 'many':
+                row[name] = [convert(item) for item in value.all()]
+            else:
+                row[name] = convert(value)
+        return row
+
+    return encode
+
+
+class EncoderMixin:
+    """
+    Renders list and retrieve with `compile_encoder` instead of `serializer.data`: same JSON, a fraction of the
+    per-field work. Encoders are compiled once per serializer class and reused, unless the request trims the fields.
+    The encoding is reported as its own `serialize` entry in the request metrics.
+    """
+    encoders = {}
+
+    def get_encoder(self):
+        serializer = self.get_serializer()
+        if any(self.request.query_params.get(name) for name in SPARSE_PARAMETERS):
+            return compile_encoder(serializer)
+        key = type(serializer)
+        if key not in self.encoders:
+            self.encoders[key] = compile_encoder(serializer)
+        return self.encoders[key]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        encode = self.get_encoder()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            with serializing():
+                rows = [encode(instance) for instance in page]
+            return self.get_paginated_response(rows)
+        with serializing():
+            rows = [encode(instance) for instance in queryset]
+        return Response(rows)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        with serializing():
+            row = self.get_encoder()(instance)
+        return Response(row)
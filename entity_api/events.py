@@ -0,0 +1,236 @@
+import asyncio
+import io
+import json
+import threading
+from importlib import import_module
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.functional import SimpleLazyObject
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from entity_api.signals import bulk_saved
+
+EVENTS_PATH = '/api/events/'
+COALESCE_INTERVAL = 1.0
+KEEPALIVE_INTERVAL = 15.0
+# a subscriber this far behind is told to reload instead of being sent every row
+MAX_PENDING = 1000
+
+
+def describe(model, instance, action):
+    # built from the instance alone, so announcing a write costs no query
+    label = model._meta.label_lower
+    site = instance.pk if label == 'network.site' else getattr(instance, 'site_id_id', None)
+    return {'type': label, 'id': instance.pk, 'action': action, 'site': site}
+
+
+class Subscriber:
+    """
+    One open stream. Events are coalesced per row until the stream next flushes, so a burst of writes to the same
+    row is sent once, as its latest action (a row created and then updated is still reported as created).
+    """
+
+    def __init__(self, types=None, site=None):
+        self.types = types
+        self.site = site
+        self.pending = {}
+        self.overflow = False
+        self.ready = asyncio.Event()
+
+    def offer(self, events):
+        for event in events:
+            if self.types and event['type'] not in self.types or self.site is not None and event['site'] != self.site:
+                continue
+            key = (event['type'], event['id'])
+            previous = self.pending.get(key)
+            if previous is None or not (previous['action'] == 'created' and event['action'] == 'updated'):
+                self.pending[key] = event
+        if len(self.pending) > MAX_PENDING:
+            self.pending.clear()
+            self.overflow = True
+        if self.pending or self.overflow:
+            self.ready.set()
+
+    def drain(self):
+        self.ready.clear()
+        if self.overflow:
+            self.overflow = False
+            return 'event: reset\ndata: {}\n\n'
+        events, self.pending = list(self.pending.values()), {}
+        return 'event: changes\ndata: {data}\n\n'.format(data=json.dumps(events, separators=(',', ':')))
+
+
+def deliver(subscribers, events):
+    for subscriber in subscribers:
+        subscriber.offer(events)
+
+
+class Hub:
+    """
+    In-process fan-out: each committed write is handed once to every event loop with subscribers, which then
+    offers it to its streams. Only writes made by this process are seen.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loops = {}
+
+    def active(self):
+        return bool(self.loops)
+
+    def subscribe(self, subscriber):
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            self.loops.setdefault(loop, set()).add(subscriber)
+
+    def unsubscribe(self, subscriber):
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            self.loops[loop].discard(subscriber)
+            if not self.loops[loop]:
+                del self.loops[loop]
+
+    def publish(self, events):
+        with self.lock:
+            targets = [(loop, list(subscribers)) for loop, subscribers in self.loops.items()]
+        for loop, subscribers in targets:
+            try:
+                loop.call_soon_threadsafe(deliver, subscribers, events)
+            except RuntimeError:
+                pass  # the loop closed under its last subscribers
+
+
+hub = Hub()
+
+
+def announce(events, using):
+    if hub.active() and events:
+        # subscribers only hear about writes that were committed
+        transaction.on_commit(lambda: hub.publish(events), using=using)
+
+
+def model_saved(sender, instance, created, using, **kwargs):
+    announce([describe(sender, instance, 'created' if created else 'updated')], using)
+
+
+def models_saved(sender, instances, created, **kwargs):
+    announce([describe(sender, instance, 'created' if created else 'updated') for instance in instances], 'default')
+
+
+def model_deleted(sender, instance, using, **kwargs):
+    announce([describe(sender, instance, 'deleted')], using)
+
+
+def watch(models):
+    """
+    Announce writes to `models` on the event stream.
+    """
+    for model in models:
+        uid = 'events-' + model._meta.label_lower
+        post_save.connect(model_saved, sender=model, dispatch_uid=uid)
+        post_delete.connect(model_deleted, sender=model, dispatch_uid=uid)
+        bulk_saved.connect(models_saved, sender=model, dispatch_uid=uid)
+
+
+def authenticate(scope):
+    """
+    Return the user the request authenticates as with the API's own authentication classes (token, Basic or
+    session cookie), or None.
+    """
+    request = ASGIRequest(scope, io.BytesIO())
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore(
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME))
+    request.user = SimpleLazyObject(lambda: get_user(request))
+    try:
+        user = Request(request, authenticators=[cls() for cls in api_settings.DEFAULT_AUTHENTICATION_CLASSES]).user
+        return user if user.is_authenticated else None
+    except APIException:
+        return None
+    finally:
+        close_old_connections()  # this runs outside Django's request cycle, which would otherwise clean up
+
+
+async def respond(send, status, body):
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'application/json')]})
+    await send({'type': 'http.response.body', 'body': json.dumps(body).encode()})
+
+
+async def disconnected(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def stream(scope, receive, send):
+    """
+    Server-Sent Events stream of created, updated and deleted rows, as batches of
+    `{"type": "network.machine", "id": 7, "action": "updated", "site": 1}` sent at most every `?interval=` seconds
+    (1 unless set). `?types=network.machine,network.interface` and `?site=1` narrow it down. A `reset` event means
+    changes were dropped and the client should reload.
+    """
+    from django.apps import apps
+
+    if scope['method'] != 'GET':
+        return await respond(send, 405, {'detail': 'Method not allowed.'})
+    if await sync_to_async(authenticate)(scope) is None:
+        return await respond(send, 401, {'detail': 'Authentication credentials were not provided.'})
+
+    params = {key: values[-1] for key, values in parse_qs(scope['query_string'].decode()).items()}
+    labels = {model._meta.label_lower for model in apps.get_app_config('network').get_models()} | \
+             {model._meta.label_lower for model in apps.get_app_config('entity').get_models()}
+    types = set(filter(None, params.get('types', '').split(',')))
+    if types - labels:
+        return await respond(send, 400, {'types': ['Unknown type: {types}.'.format(
+            types=', '.join(sorted(types - labels)))]})
+    try:
+        site = int(params['site']) if 'site' in params else None
+        interval = min(max(float(params.get('interval', COALESCE_INTERVAL)), 0.1), 60.0)
+    except ValueError:
+        return await respond(send, 400, {'detail': 'site must be an integer and interval a number of seconds.'})
+
+    await send({'type': 'http.response.start', 'status': 200, 'headers': [
+        (b'content-type', b'text/event-stream'),
+        (b'cache-control', b'no-cache'),
+        (b'x-accel-buffering', b'no'),
+    ]})
+    await send({'type': 'http.response.body', 'body': b': connected\n\n', 'more_body': True})
+
+    subscriber = Subscriber(types, site)
+    hub.subscribe(subscriber)
+    gone = asyncio.ensure_future(disconnected(receive))
+    try:
+        while not gone.done():
+            ready = asyncio.ensure_future(subscriber.ready.wait())
+            await asyncio.wait({ready, gone}, timeout=KEEPALIVE_INTERVAL, return_when=asyncio.FIRST_COMPLETED)
+            ready.cancel()
+            if gone.done():
+                break
+            if not subscriber.ready.is_set():
+                await send({'type': 'http.response.body', 'body': b': keepalive\n\n', 'more_body': True})
+                continue
+            await asyncio.wait({gone}, timeout=interval)  # let the burst settle into one message
+            if not gone.done():
+                await send({'type': 'http.response.body', 'body': subscriber.drain().encode(), 'more_body': True})
+    finally:
+        hub.unsubscribe(subscriber)
+        gone.cancel()
+
+
+def router(application):
+    """
+    Serve the event stream at EVENTS_PATH in front of the Django ASGI `application`.
+    """
+    async def route(scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == EVENTS_PATH:
+            return await stream(scope, receive, send)
+        return await application(scope, receive, send)
+
+    return route
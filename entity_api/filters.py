@@ -0,0 +1,75 @@
+import ipaddress
+
+import django_filters
+from django import forms
+from django.db.models import Q
+from django_filters.constants import EMPTY_VALUES
+
+from entity_api.addresses import IPV4_KEY_RANGE, address_key, network_range
+
+
+class AddressField(forms.CharField):
+    def to_python(self, value):
+        value = super().to_python(value)
+        if value in self.empty_values:
+            return None
+        try:
+            return ipaddress.ip_address(value)
+        except ValueError:
+            raise forms.ValidationError('Enter a valid IPv4 or IPv6 address.', code='invalid')
+
+
+class NetworkField(forms.CharField):
+    def to_python(self, value):
+        value = super().to_python(value)
+        if value in self.empty_values:
+            return None
+        try:
+            return ipaddress.ip_network(value, strict=False)
+        except ValueError:
+            raise forms.ValidationError('Enter a valid IPv4 or IPv6 network, e.g. 10.20.0.0/16.', code='invalid')
+
+
+class AddressFilter(django_filters.Filter):
+    """
+    Compares an address against a key column maintained by `AddressKeyMixin`. Models that keep IPv6 addresses in a
+    separate column name it with `v6_field_name`, and IPv6 values are matched against it instead. On a column shared
+    by both families, ranges are kept to the family of the value.
+    """
+    field_class = AddressField
+
+    def __init__(self, *args, v6_field_name=None, **kwargs):
+        self.v6_field_name = v6_field_name
+        super().__init__(*args, **kwargs)
+
+    def get_field_name(self, version):
+        return self.v6_field_name if version == 6 and self.v6_field_name else self.field_name
+
+    def family(self, value):
+        # IPv4 keys sit inside ::ffff:0:0/96, so an IPv4 range stays within it and an IPv6 range skips it
+        if self.v6_field_name:
+            return Q()
+        ipv4 = Q(**{self.field_name + '__range': IPV4_KEY_RANGE})
+        return ipv4 if value.version == 4 else ~ipv4
+
+    def lookups(self, value):
+        lookup = Q(**{'{field}__{lookup}'.format(field=self.get_field_name(value.version), lookup=self.lookup_expr):
+                      address_key(value)})
+        return lookup if self.lookup_expr == 'exact' else lookup & self.family(value)
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        qs = self.get_method(qs)(self.lookups(value))
+        return qs.distinct() if self.distinct else qs
+
+
+class NetworkFilter(AddressFilter):
+    """
+    Matches every address inside a network such as `10.20.0.0/16` with one range scan over the key column.
+    """
+    field_class = NetworkField
+
+    def lookups(self, value):
+        return Q(**{'{field}__range'.format(field=self.get_field_name(value.version)): network_range(value)}) & \
+            self.family(value)
@@ -0,0 +1,24 @@
+from django.db import connections
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class HealthView(APIView):
+    """
+    Liveness probe for load balancers: 200 when every configured database answers a trivial query, 503 otherwise.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        status = {}
+        for alias in connections:
+            try:
+                with connections[alias].cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                status[alias] = 'ok'
+            except Exception:  # any driver error means the database is unusable for this process
+                status[alias] = 'unavailable'
+        healthy = all(value == 'ok' for value in status.values())
+        return Response({'databases': status}, status=200 if healthy else 503)
@@ -0,0 +1,247 @@
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import markcoroutinefunction
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+
+class Registry:
+    """
+    Per-process request metrics, keyed on (view name, method). Each worker process keeps its own registry, as
+    Prometheus expects from one scrape target per process.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests = defaultdict(int)
+            self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+            self.queries = defaultdict(lambda: Histogram(QUERY_BUCKETS))
+            self.db = defaultdict(float)
+            self.serialize = defaultdict(float)
+            self.render = defaultdict(float)
+
+    def record(self, view, method, status, timing):
+        key = (view, method)
+        with self.lock:
+            self.requests[key + (str(status),)] += 1
+            self.latency[key].observe(timing.total)
+            self.queries[key].observe(timing.queries)
+            self.db[key] += timing.db
+            self.serialize[key] += timing.serialize
+            self.render[key] += timing.render
+
+    def exposition(self):
+        """
+        Render the registry in the Prometheus text exposition format (version 0.0.4).
+        """
+        lines = []
+        with self.lock:
+            counter(lines, 'api_requests_total', 'Requests handled, by view, method and status.',
+                    self.requests, ('view', 'method', 'status'))
+            histogram(lines, 'api_request_duration_seconds', 'Time from the first middleware to the response.',
+                      self.latency)
+            histogram(lines, 'api_request_queries', 'SQL queries executed per request.', self.queries)
+            counter(lines, 'api_db_duration_seconds_total', 'Time spent executing SQL.', self.db,
+                    ('view', 'method'))
+            counter(lines, 'api_serialize_duration_seconds_total', 'Time spent encoding rows for the response.',
+                    self.serialize, ('view', 'method'))
+            counter(lines, 'api_render_duration_seconds_total', 'Time spent rendering response bodies.',
+                    self.render, ('view', 'method'))
+        return '\n'.join(lines) + '\n'
+
+
+def labels(names, values, **extra):
+    pairs = list(zip(names, values)) + list(extra.items())
+    return '{' + ','.join('{name}="{value}"'.format(
+        name=name, value=str(value).replace('\\', '\\\\').replace('"', '\\"')) for name, value in pairs) + '}'
+
+
+def counter(lines, name, description, values, names):
+    lines += ['# HELP {name} {description}'.format(name=name, description=description),
+              '# TYPE {name} counter'.format(name=name)]
+    for key, value in sorted(values.items()):
+        lines.append('{name}{labels} {value}'.format(name=name, labels=labels(names, key), value=value))
+
+
+def histogram(lines, name, description, values):
+    lines += ['# HELP {name} {description}'.format(name=name, description=description),
+              '# TYPE {name} histogram'.format(name=name)]
+    for key, observed in sorted(values.items()):
+        # Prometheus buckets are cumulative; observe() counts each value into every bucket it fits
+        for bound, count in zip(observed.buckets, observed.counts):
+            lines.append('{name}_bucket{labels} {count}'.format(
+                name=name, labels=labels(('view', 'method'), key, le=bound), count=count))
+        lines.append('{name}_bucket{labels} {count}'.format(
+            name=name, labels=labels(('view', 'method'), key, le='+Inf'), count=observed.count))
+        lines.append('{name}_sum{labels} {sum}'.format(name=name, labels=labels(('view', 'method'), key),
+                                                         sum=observed.sum))
+        lines.append('{name}_count{labels} {count}'.format(name=name, labels=labels(('view', 'method'), key),
+                                                           count=observed.count))
+
+
+registry = Registry()
+
+
+class Timing:
+    """
+    What one request cost: SQL queries and their time, row encoding, body rendering and the total, all in seconds.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.render = 0.0
+        self.total = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def server_timing(self):
+        app = max(self.total - self.db - self.serialize - self.render, 0)
+        return ', '.join([
+            'db;dur={db:.3f};desc="{queries} queries"'.format(db=self.db * 1000, queries=self.queries),
+            'serialize;dur={serialize:.3f}'.format(serialize=self.serialize * 1000),
+            'render;dur={render:.3f}'.format(render=self.render * 1000),
+            'app;dur={app:.3f}'.format(app=app * 1000),
+            'total;dur={total:.3f}'.format(total=self.total * 1000),
+        ])
+
+
+# The Timing of the request being handled. sync_to_async() copies the context into the thread it runs on, so queries
+# are counted wherever Django or the views run them: in the request thread under WSGI, on the thread-sensitive
+# thread or the read pool under ASGI.
+current = ContextVar('timing', default=None)
+
+
+def count(execute, sql, params, many, context):
+    timing = current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    return timing(execute, sql, params, many, context)
+
+
+def connected(sender, connection, **kwargs):
+    # first in the list, so execute_wrapper() blocks entered before the connection opened still pop their own
+    if count not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, count)
+
+
+def watch():
+    connection_created.connect(connected, dispatch_uid='entity_api.metrics')
+    for alias in connections:
+        if connections[alias].connection is not None:
+            connected(None, connections[alias])
+
+
+@contextmanager
+def serializing():
+    """
+    Time the block as serialization of the response, less the SQL it ran (lazy querysets, prefetches).
+    """
+    timing = current.get()
+    if timing is None:
+        yield
+        return
+    started, db = time.perf_counter(), timing.db
+    try:
+        yield
+    finally:
+        timing.serialize += time.perf_counter() - started - (timing.db - db)
+
+
+class MetricsMiddleware:
+    """
+    Records per-view query count, SQL time, render time and total latency into the process registry, and reports
+    them on every response as a `Server-Timing` header. Keep it first in MIDDLEWARE so the totals include the
+    session and authentication queries.
+
+    Streaming responses (exports) are measured up to the point the stream is handed back, not until it finishes.
+    Under ASGI the middleware stays async; queries are still counted for every view, whichever thread runs it (see
+    `current`).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.acall(request)
+        timing = request.timing = Timing()
+        token = current.set(timing)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current.reset(token)
+        return self.finish(request, response, timing, started)
+
+    async def acall(self, request):
+        timing = request.timing = Timing()
+        token = current.set(timing)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current.reset(token)
+        return self.finish(request, response, timing, started)
+
+    def finish(self, request, response, timing, started):
+        timing.total = time.perf_counter() - started
+
+        match = request.resolver_match
+        registry.record(match.view_name if match else 'unmatched', request.method, response.status_code, timing)
+        response['Server-Timing'] = timing.server_timing()
+        return response
+
+    def process_template_response(self, request, response):
+        # runs last of all template response hooks, immediately before the body is rendered
+        timing = request.timing
+        started = time.perf_counter()
+
+        def rendered(response):
+            timing.render = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+def metrics(request):
+    return HttpResponse(registry.exposition(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,158 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def positive_int(value, cutoff):
+    value = int(value)
+    if value <= 0:
+        raise ValueError
+    return min(value, cutoff)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginates on the values of an ordered unique key rather than an offset, so every page is a single indexed
+    range query and no COUNT(*) is run, however deep the page.
+
+    The ordering is taken from the view's `keyset_ordering` (ascending fields ending with a unique one), defaulting
+    to `id`. Only forward links are provided.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+    ordering = ('id',)
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = tuple(getattr(view, 'keyset_ordering', self.ordering))
+        self.fields = [queryset.model._meta.get_field(name) for name in self.ordering]
+        page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(self.after(cursor))
+
+        results = list(queryset.order_by(*self.ordering)[:page_size + 1])
+        self.has_next = len(results) > page_size
+        self.page = results[:page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            return positive_int(request.query_params[self.page_size_query_param], self.max_page_size)
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def after(self, cursor):
+        """
+        Build the row-value comparison `(a, b, c) > (x, y, z)` as `a > x OR (a = x AND b > y) OR ...`.
+        """
+        condition = Q()
+        for index, name in enumerate(self.ordering):
+            matched = {field: cursor[position] for position, field in enumerate(self.ordering[:index])}
+            condition |= Q(**matched, **{name + '__gt': cursor[index]})
+        return condition
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            if len(values) != len(self.fields):
+                raise ValueError
+            return [field.to_python(value) for field, value in zip(self.fields, values)]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance):
+        values = [field.value_to_string(instance) for field in self.fields]
+        return base64.urlsafe_b64encode(json.dumps(values).encode('ascii')).decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                },
+                'results': schema,
+            },
+        }
+
+
+class PageNumberOrKeysetPagination(PageNumberPagination):
+    """
+    Page number pagination by default; keyset pagination when the view sets `keyset_pagination = True`, or when the
+    client asks for it with `?pagination=keyset` or by following a `?cursor=` link.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    pagination_query_param = 'pagination'
+    keyset_class = KeysetPagination
+
+    def use_keyset(self, request, view):
+        if getattr(view, 'keyset_pagination', False):
+            return True
+        if self.keyset_class.cursor_query_param in request.query_params:
+            return True
+        return request.query_params.get(self.pagination_query_param) == 'keyset'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.use_keyset(request, view):
+            return super().paginate_queryset(queryset, request, view)
+
+        self.keyset = self.keyset_class()
+        self.keyset.page_size = self.page_size
+        return self.keyset.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if hasattr(self, 'keyset'):
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.pagination_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to `keyset` to paginate by cursor without counting results.',
+                'schema': {
+                    'type': 'string',
+                    'enum': ['keyset'],
+                },
+            },
+            {
+                'name': self.keyset_class.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {
+                    'type': 'string',
+                },
+            },
+        ]
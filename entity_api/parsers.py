@@ -0,0 +1,25 @@
+import codecs
+
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from entity_api.renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(parsers.JSONParser):
+    """
+    JSONParser backed by orjson when it is installed. orjson only reads UTF-8, so bodies in any other charset, or
+    a non-strict STRICT_JSON setting (NaN and Infinity), go to the stdlib parser.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,34 @@
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # the stdlib renderer takes over
+    orjson = None
+
+# Datetimes go through DRF's encoder like everything orjson does not know (Decimal, lazy strings, querysets), so the
+# output stays byte-for-byte what JSONRenderer produces.
+ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer backed by orjson when it is installed. Pretty-printed output (`indent`, the browsable API), ASCII or
+    non-compact settings and anything orjson refuses (integers over 64 bits, say) fall back to the stdlib renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or self.ensure_ascii or not self.compact or \
+                self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=JSONEncoder().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # same strict javascript subset as JSONRenderer
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -1,5 +1,8 @@
+import os
 from pathlib import Path
 
+from entity_api.database import database_config, flag
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
@@ -32,11 +35,14 @@ THIRD_PARTY = [
 LOCAL = [
     'entity.apps.EntityConfig',
     'network.apps.EntityConfig',
+    'search.apps.SearchConfig',
+    'changes.apps.ChangesConfig',
 ]
 
 INSTALLED_APPS = CORE + THIRD_PARTY + LOCAL
 
 MIDDLEWARE = [
+    'entity_api.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -66,14 +72,43 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'entity_api.wsgi.application'
 
+# Set by entity_api.asgi: list and retrieve then run as async views; see entity_api.asynchronous.
+ASYNC_READS = flag(os.environ, 'ASYNC_READS', False)
+
 
+# SQLite unless DATABASE_URL is set; see entity_api.database for the PostgreSQL options.
 DATABASES = {
+    'default': database_config(os.environ, BASE_DIR),
+}
+
+# Response cache for list/retrieve endpoints. Local memory by default; set API_CACHE_URL (redis://...) to share it
+# between processes. Entries are keyed on the database write counters (see entity_api.cache), but a local memory
+# cache is private to its process: it cannot be cleared from another worker and holds entries no other worker can
+# reuse. It therefore keeps them for a few seconds only, as a burst absorber; a shared cache keeps them for minutes.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache' if os.environ.get('API_CACHE_URL')
+        else 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': os.environ.get('API_CACHE_URL', 'entity-api'),
+        'TIMEOUT': 300 if os.environ.get('API_CACHE_URL') else 5,
+    },
 }
 
+# With a shared cache, sessions are read from it and only fall back to the database on a miss. A local memory cache
+# would keep a copy per process that a logout in another worker could not revoke, so without one they stay in the
+# database.
+if os.environ.get('API_CACHE_URL'):
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+    SESSION_CACHE_ALIAS = 'api'
+
+# Verified Basic credentials and tokens are remembered per process for AUTH_CACHE_TTL seconds; see
+# entity_api.authentication.
+AUTH_CACHE_TTL = 60
+AUTH_CACHE_SIZE = 4096
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -103,13 +138,23 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "entity_api.pagination.PageNumberOrKeysetPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
-        'rest_framework.authentication.BasicAuthentication',
+        'entity_api.authentication.CachedTokenAuthentication',
+        'entity_api.authentication.CachedBasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    # orjson when installed, the stdlib json module otherwise
+    'DEFAULT_RENDERER_CLASSES': [
+        'entity_api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'entity_api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent by bulk write paths (bulk_create/bulk_update), which bypass post_save.
+# Arguments: sender (the model), instances (the rows written), created (True for inserts, False for updates).
+bulk_saved = Signal()
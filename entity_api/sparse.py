@@ -0,0 +1,150 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import permissions, serializers
+from rest_framework.exceptions import ValidationError
+
+SPARSE_PARAMETERS = ('fields', 'omit', 'expand')
+
+
+def parse(value):
+    """
+    Parse a comma separated list of dotted field paths into a tree: `id,interface.name` becomes
+    `{'id': {}, 'interface': {'name': {}}}`. An empty subtree stands for the whole field.
+    """
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for name in filter(None, (name.strip() for name in path.split('.'))):
+            node = node.setdefault(name, {})
+    return tree
+
+
+def nested(field):
+    child = field.child if isinstance(field, serializers.ListSerializer) else field
+    return child if isinstance(child, serializers.BaseSerializer) else None
+
+
+def restrict(serializer, tree):
+    # drop every field not named in `tree`; a named nested field is kept whole unless its subtree names fields
+    for name in list(serializer.fields):
+        if name not in tree:
+            serializer.fields.pop(name)
+        elif tree[name] and nested(serializer.fields[name]) is not None:
+            restrict(nested(serializer.fields[name]), tree[name])
+
+
+def unknown(serializer, tree, prefix=''):
+    # the dotted paths in `tree` that name no field of `serializer`
+    found = []
+    for name, subtree in tree.items():
+        field = serializer.fields.get(name)
+        if field is None:
+            found.append(prefix + name)
+        elif subtree and nested(field) is None:
+            found += [prefix + name + '.' + child for child in subtree]
+        elif subtree:
+            found += unknown(nested(field), subtree, prefix + name + '.')
+    return found
+
+
+def omit(serializer, tree):
+    for name, subtree in tree.items():
+        if name not in serializer.fields:
+            continue
+        if not subtree:
+            serializer.fields.pop(name)
+        elif nested(serializer.fields[name]) is not None:
+            omit(nested(serializer.fields[name]), subtree)
+
+
+def expand(serializer, names, expansions):
+    """
+    Replace each foreign key in `names` whose model has a serializer in `expansions` by that serializer, so the
+    related row is rendered inline instead of as its primary key.
+    """
+    for name in names:
+        field = serializer.fields.get(name)
+        if isinstance(field, serializers.PrimaryKeyRelatedField) and field.queryset.model in expansions:
+            source = {} if field.source == name else {'source': field.source}
+            serializer.fields[name] = expansions[field.queryset.model](read_only=True, **source)
+
+
+def columns(serializer, prefix=''):
+    """
+    Return the model fields `serializer` reads, for `QuerySet.only()`, including those of foreign keys rendered
+    inline. Returns None when a field is not backed by a model field and every column has to be loaded.
+    """
+    opts = serializer.Meta.model._meta
+    names = [prefix + opts.pk.name]
+    for field in serializer.fields.values():
+        if field.write_only or isinstance(field, serializers.ListSerializer):
+            continue  # many=True relations are prefetched, not selected
+        try:
+            model_field = opts.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            continue
+        names.append(prefix + model_field.name)
+        if isinstance(field, serializers.BaseSerializer):
+            related = columns(field, prefix + model_field.name + '__')
+            if related is None:
+                return None
+            names += related
+    return names
+
+
+def joins(serializer):
+    # the foreign keys rendered inline, which select_related() can fetch in the same query
+    return [field.source for field in serializer.fields.values()
+            if isinstance(field, serializers.BaseSerializer) and not isinstance(field, serializers.ListSerializer)]
+
+
+class SparseFieldsMixin:
+    """
+    Honours `?fields=`, `?omit=` and `?expand=` on list, retrieve and export.
+
+    `fields` and `omit` take comma separated field names, dotted to reach into nested serializers
+    (`?fields=id,name,interface.name`). `expand` renders the listed foreign keys as nested objects, for the models in
+    `expansions`. The queryset follows the trimmed serializer: only the rendered columns are selected, expanded foreign
+    keys are joined, and nested relations that were left out are not prefetched.
+    """
+    expansions = {}
+
+    def sparse_parameters(self):
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return {}  # writes validate against the full serializer
+        return {name: request.query_params[name] for name in SPARSE_PARAMETERS if request.query_params.get(name)}
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        parameters = self.sparse_parameters()
+        if parameters:
+            self.trim(serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer,
+                      parameters)
+        return serializer
+
+    def trim(self, serializer, parameters):
+        expand(serializer, parse(parameters.get('expand', '')), self.expansions)
+        if 'fields' in parameters:
+            tree = parse(parameters['fields'])
+            if unknown(serializer, tree):
+                raise ValidationError({'fields': ['Unknown field: {names}.'.format(
+                    names=', '.join(sorted(unknown(serializer, tree))))]})
+            restrict(serializer, tree)
+        if 'omit' in parameters:
+            omit(serializer, parse(parameters['omit']))
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.sparse_parameters():
+            return queryset
+
+        serializer = self.get_serializer()
+        if joins(serializer):
+            queryset = queryset.select_related(*joins(serializer))
+        only = columns(serializer)
+        if only is not None:
+            # keyset pagination reads its ordering columns from the last row of the page
+            queryset = queryset.only(*set(only) | set(getattr(self, 'keyset_ordering', ())))
+        return queryset
@@ -3,7 +3,11 @@ from django.urls import path, include
 from rest_framework import routers
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from entity import views as entities
+from entity_api.cache import CacheStatsView
+from entity_api.health import HealthView
+from entity_api.metrics import metrics
 from network import views as networks
+from search.views import SearchView
 
 router = routers.DefaultRouter()
 router.register(r'v1/ssids', entities.SSIDViewSet)
@@ -20,9 +24,14 @@ router.register(r'v2/interfaces', networks.InterfaceView)
 router.register(r'v2/resources', networks.ResourceView)
 router.register(r'v2/bluetooths', networks.BluetoothView)
 router.register(r'v2/radios', networks.RadioView)
+router.register(r'v2/ingest', networks.IngestView, basename='ingest')
 
 urlpatterns = [
     path('api/', include(router.urls)),
+    path('api/cache/', CacheStatsView.as_view(), name='cache-stats'),
+    path('api/health/', HealthView.as_view(), name='health'),
+    path('api/search/', SearchView.as_view(), name='search'),
+    path('metrics', metrics, name='metrics'),
     path('admin/', admin.site.urls),
     path("api-auth/", include("rest_framework.urls", namespace="rest_framework")),
     # OpenAPI 3 documentation with Swagger UI
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class EntityConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'network'
+
+    def ready(self):
+        from entity_api import cache, events, metrics
+        from network import rollups
+        cache.watch(self.get_models())
+        events.watch(self.get_models())
+        metrics.watch()
+        rollups.watch()
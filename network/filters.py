@@ -0,0 +1,40 @@
+import django_filters
+
+from entity_api.filters import AddressFilter, NetworkFilter
+from network.models import Switch, WiFi, Interface
+
+
+class InterfaceFilter(django_filters.FilterSet):
+    ip = AddressFilter(field_name="ip_v4_key", v6_field_name="ip_v6_key")
+    ip_from = AddressFilter(field_name="ip_v4_key", v6_field_name="ip_v6_key", lookup_expr="gte")
+    ip_to = AddressFilter(field_name="ip_v4_key", v6_field_name="ip_v6_key", lookup_expr="lte")
+    cidr = NetworkFilter(field_name="ip_v4_key", v6_field_name="ip_v6_key")
+
+    class Meta:
+        model = Interface
+        fields = ['name', 'physical_address', 'vendor', 'status', 'site_id', 'machine_id',
+                  'ip', 'ip_from', 'ip_to', 'cidr']
+
+
+class SwitchFilter(django_filters.FilterSet):
+    ip = AddressFilter(field_name="address_key")
+    ip_from = AddressFilter(field_name="address_key", lookup_expr="gte")
+    ip_to = AddressFilter(field_name="address_key", lookup_expr="lte")
+    cidr = NetworkFilter(field_name="address_key")
+
+    class Meta:
+        model = Switch
+        fields = ['name', 'physical_address', 'vendor', 'status', 'site_id', 'network_id',
+                  'ip', 'ip_from', 'ip_to', 'cidr']
+
+
+class WiFiFilter(django_filters.FilterSet):
+    ip = AddressFilter(field_name="address_key")
+    ip_from = AddressFilter(field_name="address_key", lookup_expr="gte")
+    ip_to = AddressFilter(field_name="address_key", lookup_expr="lte")
+    cidr = NetworkFilter(field_name="address_key")
+
+    class Meta:
+        model = WiFi
+        fields = ['name', 'type', 'SSID', 'BSSID', 'vendor', 'status', 'site_id', 'network_id',
+                  'ip', 'ip_from', 'ip_to', 'cidr']
@@ -0,0 +1,127 @@
+from functools import lru_cache
+
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from entity_api.addresses import AddressKeyMixin
+from entity_api.signals import bulk_saved
+from .serializers import SiteSerializer, NetworkSerializer, SwitchSerializer, WiFiSerializer, MachineSerializer, \
+    InterfaceSerializer, ResourceSerializer, BluetoothSerializer, RadioSerializer
+
+# Tables accepted by the ingest endpoint, in dependency order, so a row may reference any row of an earlier
+# table in the same batch by supplying its id.
+INGEST_TABLES = (
+    ('sites', SiteSerializer),
+    ('networks', NetworkSerializer),
+    ('switches', SwitchSerializer),
+    ('wifis', WiFiSerializer),
+    ('machines', MachineSerializer),
+    ('interfaces', InterfaceSerializer),
+    ('resources', ResourceSerializer),
+    ('bluetooths', BluetoothSerializer),
+    ('radios', RadioSerializer),
+)
+
+
+def related_fields(serializer_class):
+    """
+    Map each primary key related field of `serializer_class` to the model it references.
+    """
+    return {name: field.queryset.model for name, field in serializer_class().fields.items()
+            if isinstance(field, serializers.PrimaryKeyRelatedField)}
+
+
+@lru_cache(maxsize=None)
+def bulk_serializer(serializer_class):
+    """
+    Derive a serializer from `serializer_class` whose foreign keys are plain integers, so validating many rows
+    does not look up every referenced object one at a time. References are resolved by `resolve_related`.
+    """
+    fields = serializer_class().fields
+    attrs = {name: serializers.IntegerField(required=fields[name].required, allow_null=fields[name].allow_null)
+             for name in related_fields(serializer_class)}
+    return type('Bulk' + serializer_class.__name__, (serializer_class,), attrs)
+
+
+def resolve_related(serializer_class, validated, errors, known=None):
+    """
+    Check the foreign keys of every validated row with one IN query per referenced model, recording rows that
+    reference missing objects in `errors`. Ids in `known` (model -> ids) are treated as existing.
+    """
+    known = known or {}
+    message = serializers.PrimaryKeyRelatedField.default_error_messages['does_not_exist']
+    for name, model in related_fields(serializer_class).items():
+        wanted = {row[name] for row in validated if row.get(name) is not None} - known.get(model, set())
+        if not wanted:
+            continue
+        missing = wanted - set(model.objects.filter(pk__in=wanted).values_list('pk', flat=True))
+        for index, row in enumerate(validated):
+            if row.get(name) in missing:
+                errors[index].setdefault(name, []).append(message.format(pk_value=row[name]))
+
+
+def validate_rows(serializer_class, rows, known=None):
+    """
+    Validate `rows` against `serializer_class` in bulk, returning the validated data and per-row errors.
+    """
+    serializer = bulk_serializer(serializer_class)(data=rows, many=True)
+    if not serializer.is_valid():
+        return [], serializer.errors
+
+    validated = serializer.validated_data
+    errors = [{} for _ in validated]
+    resolve_related(serializer_class, validated, errors, known)
+    return validated, errors
+
+
+def build_instance(model, validated_data):
+    """
+    Build an unsaved `model` instance from validated data, assigning foreign keys by id. Derived columns that
+    save() would maintain are filled in as well, since bulk writes bypass it.
+    """
+    instance = model(**{model._meta.get_field(key).attname: value for key, value in validated_data.items()})
+    if isinstance(instance, AddressKeyMixin):
+        instance.update_address_keys()
+    return instance
+
+
+def ingest(data):
+    """
+    Validate and create a batch of mixed network objects, keyed by table name, inside one transaction.
+
+    Every table is validated before anything is written; rows are then written with one bulk_create per table.
+    Returns the number of rows and the ids created per table.
+    """
+    if not isinstance(data, dict):
+        raise serializers.ValidationError({'non_field_errors': ['Expected an object keyed by table name.']})
+
+    tables = dict(INGEST_TABLES)
+    unknown = [name for name in data if name not in tables]
+    if unknown:
+        raise serializers.ValidationError({name: ['Unknown table.'] for name in unknown})
+
+    batch, failures, known = [], {}, {}
+    for name, serializer_class in INGEST_TABLES:
+        if name not in data:
+            continue
+        model = serializer_class.Meta.model
+        validated, errors = validate_rows(serializer_class, data[name], known)
+        if any(errors):
+            failures[name] = errors
+        known.setdefault(model, set()).update(row['id'] for row in validated if row.get('id') is not None)
+        batch.append((name, model, validated))
+
+    if failures:
+        raise serializers.ValidationError(failures)
+
+    created = {}
+    try:
+        with transaction.atomic():
+            for name, model, validated in batch:
+                instances = model.objects.bulk_create([build_instance(model, row) for row in validated])
+                bulk_saved.send(sender=model, instances=instances, created=True)
+                created[name] = {'count': len(instances), 'ids': [instance.pk for instance in instances]}
+    except IntegrityError as error:
+        raise serializers.ValidationError({'non_field_errors': [str(error)]})
+
+    return created
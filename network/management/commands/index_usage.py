@@ -0,0 +1,100 @@
+import re
+
+import django_filters
+from django.apps import apps
+from django.core.exceptions import FieldError
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from entity.filters import EntitiesFilter, InterfaceFilter
+from entity_api.filters import AddressFilter, NetworkFilter
+from network import filters
+
+FILTERSETS = (EntitiesFilter, InterfaceFilter, filters.InterfaceFilter, filters.SwitchFilter, filters.WiFiFilter)
+
+SAMPLE_VALUES = {
+    NetworkFilter: '10.0.0.0/8',
+    AddressFilter: '10.0.0.1',
+    django_filters.NumberFilter: '1',
+    django_filters.BooleanFilter: 'true',
+}
+
+
+def sample_value(flt):
+    """
+    Pick a value `flt` will accept, so the filter can be planned without real data.
+    """
+    choices = flt.extra.get('choices')
+    if choices:
+        return choices[0][0]
+    for filter_class, value in SAMPLE_VALUES.items():
+        if isinstance(flt, filter_class):
+            return value
+    if isinstance(flt, django_filters.ModelChoiceFilter):
+        return flt.queryset.values_list('pk', flat=True).first()
+    return '10.0.0.1' if 'ip_' in flt.field_name else 'sample'
+
+
+def is_index_backed(plan):
+    """
+    Return True only when every table is reached by seeking an index: SQLite `SEARCH`, PostgreSQL index scans
+    with an `Index Cond`. A full scan of a table or of an index (SQLite `SCAN ... USING INDEX`) is not.
+    """
+    for line in plan.splitlines():
+        if 'Seq Scan' in line or 'SCAN ' in line:
+            return False
+    if re.search(r'Index (Only )?Scan', plan) and 'Index Cond' not in plan:
+        return False
+    return True
+
+
+class Command(BaseCommand):
+    help = 'Report whether the API filters are index backed and, on PostgreSQL, how often each index is used. ' \
+           'Plans depend on table statistics, so run this against a database with representative data.'
+
+    def handle(self, *args, **options):
+        self.report_filters()
+        if connection.vendor == 'postgresql':
+            self.report_statistics()
+
+    def report_filters(self):
+        for filterset_class in FILTERSETS:
+            model = filterset_class._meta.model
+            self.stdout.write(self.style.MIGRATE_HEADING('{name} ({table})'.format(
+                name=filterset_class.__name__, table=model._meta.db_table)))
+
+            for name, flt in filterset_class.base_filters.items():
+                value = sample_value(flt)
+                filterset = filterset_class(data={name: value}, queryset=model.objects.all())
+                if value is None or not filterset.is_valid():
+                    self.stdout.write('  {name:<20} skipped, no valid sample value'.format(name=name))
+                    continue
+                try:
+                    plan = filterset.qs.explain()
+                except FieldError as error:
+                    self.stdout.write(self.style.ERROR('  {name:<20} error: {error}'.format(name=name, error=error)))
+                    continue
+
+                if is_index_backed(plan):
+                    self.stdout.write(self.style.SUCCESS('  {name:<20} index'.format(name=name)))
+                else:
+                    self.stdout.write(self.style.WARNING('  {name:<20} scan'.format(name=name)))
+                for line in plan.splitlines():
+                    self.stdout.write('      ' + line)
+
+    def report_statistics(self):
+        tables = [model._meta.db_table for app in ('entity', 'network')
+                  for model in apps.get_app_config(app).get_models()]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT relname, indexrelname, idx_scan, pg_size_pretty(pg_relation_size(indexrelid)) '
+                'FROM pg_stat_user_indexes WHERE relname = ANY(%s) ORDER BY relname, idx_scan DESC',
+                [tables],
+            )
+            rows = cursor.fetchall()
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Index usage'))
+        for table, index, scans, size in rows:
+            line = '  {table:<32} {index:<40} {scans:>10} scans {size:>10}'.format(
+                table=table, index=index, scans=scans, size=size)
+            self.stdout.write(self.style.WARNING(line) if not scans else line)
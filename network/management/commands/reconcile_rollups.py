@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from network.rollups import reconcile
+
+
+class Command(BaseCommand):
+    help = 'Recount the per-site rollups and correct any that drifted, e.g. after QuerySet.update() or raw SQL.'
+
+    def handle(self, *args, **options):
+        self.stdout.write('{count} rollups corrected'.format(count=reconcile()))
@@ -0,0 +1,187 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:03
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Interface',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, default=None, max_length=253, null=True)),
+                ('type', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('ip_v4', models.GenericIPAddressField(blank=True, default=None, null=True)),
+                ('ip_v6', models.GenericIPAddressField(blank=True, default=None, null=True)),
+                ('status', models.CharField(choices=[('UP', 'Up'), ('DOWN', 'Down')], default='DOWN', max_length=4)),
+                ('hardware', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('physical_address', models.CharField(blank=True, default=None, max_length=17, null=True, validators=[django.core.validators.RegexValidator(code='invalid_mac_address', message='MAC Address must be valid', regex='^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$')])),
+                ('vendor', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('notes', models.TextField(blank=True, default=None, null=True)),
+                ('first_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='first_seen')),
+                ('last_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='last_seen')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Machine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, default=None, max_length=253, null=True)),
+                ('type', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('os', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('hardware', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('status', models.CharField(choices=[('UP', 'Up'), ('DOWN', 'Down')], default='DOWN', max_length=4)),
+                ('notes', models.TextField(blank=True, default=None, null=True)),
+                ('detected_by', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('first_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='first_seen')),
+                ('last_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='last_seen')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Network',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, default=None, max_length=253, null=True)),
+                ('type', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('os', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('hardware', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('status', models.CharField(choices=[('UP', 'Up'), ('DOWN', 'Down')], default='DOWN', max_length=4)),
+                ('notes', models.TextField(blank=True, default=None, null=True)),
+                ('detected_by', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('first_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='first_seen')),
+                ('last_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='last_seen')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Site',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, default=None, max_length=253, null=True)),
+                ('type', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('notes', models.TextField(blank=True, default=None, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WiFi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, default=None, max_length=253, null=True)),
+                ('type', models.CharField(choices=[('DEVICE', 'Device'), ('WIFI_BRIDGED', 'Wi-Fi Bridged'), ('WIFI_AP', 'Wi-Fi AP'), ('WIFI_AD_HOC', 'Wi-Fi AD Hoc')], default='DEVICE', max_length=20)),
+                ('address', models.GenericIPAddressField(blank=True, default=None, null=True)),
+                ('mask', models.GenericIPAddressField(blank=True, default=None, null=True)),
+                ('gateway', models.GenericIPAddressField(blank=True, default=None, null=True)),
+                ('status', models.CharField(choices=[('UP', 'Up'), ('DOWN', 'Down')], default='DOWN', max_length=4)),
+                ('channels', models.CharField(max_length=100, validators=[django.core.validators.int_list_validator])),
+                ('frequency', models.IntegerField(default=None, null=True, validators=[django.core.validators.MaxValueValidator(65535), django.core.validators.MinValueValidator(1)])),
+                ('crypto', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('SSID', models.CharField(blank=True, default=None, max_length=17, null=True, validators=[django.core.validators.RegexValidator(code='invalid_mac_address', message='SSID Address must be valid', regex='^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$')])),
+                ('BSSID', models.CharField(blank=True, default=None, max_length=17, null=True, validators=[django.core.validators.RegexValidator(code='invalid_mac_address', message='BSSID Address must be valid', regex='^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$')])),
+                ('vendor', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('notes', models.TextField(blank=True, default=None, null=True)),
+                ('detected_by', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('first_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='first_seen')),
+                ('last_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='last_seen')),
+                ('network_id', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='network.network')),
+                ('site_id', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='network.site')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Switch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, default=None, max_length=253, null=True)),
+                ('address', models.GenericIPAddressField(blank=True, default=None, null=True)),
+                ('mask', models.GenericIPAddressField(blank=True, default=None, null=True)),
+                ('gateway', models.GenericIPAddressField(blank=True, default=None, null=True)),
+                ('physical_address', models.CharField(blank=True, default=None, max_length=17, null=True, validators=[django.core.validators.RegexValidator(code='invalid_mac_address', message='MAC Address must be valid', regex='^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$')])),
+                ('vendor', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('type', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('os', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('hardware', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('status', models.CharField(choices=[('UP', 'Up'), ('DOWN', 'Down')], default='DOWN', max_length=4)),
+                ('notes', models.TextField(blank=True, default=None, null=True)),
+                ('detected_by', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('first_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='first_seen')),
+                ('last_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='last_seen')),
+                ('network_id', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='network.network')),
+                ('site_id', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='network.site')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Resource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, default=None, max_length=253, null=True)),
+                ('protocol', models.CharField(choices=[('TCP', 'TCP'), ('UDP', 'UDP')], default='TCP', max_length=4)),
+                ('port', models.IntegerField(validators=[django.core.validators.MaxValueValidator(65535), django.core.validators.MinValueValidator(1)])),
+                ('notes', models.CharField(blank=True, default=None, max_length=255, null=True)),
+                ('first_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='first_seen')),
+                ('last_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='last_seen')),
+                ('interface_id', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='network.interface')),
+                ('site_id', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='network.site')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Radio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, default=None, max_length=253, null=True)),
+                ('type', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('hardware', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('status', models.CharField(choices=[('UP', 'Up'), ('DOWN', 'Down')], default='DOWN', max_length=4)),
+                ('physical_address', models.CharField(blank=True, default=None, max_length=17, null=True, validators=[django.core.validators.RegexValidator(code='invalid_mac_address', message='MAC Address must be valid', regex='^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$')])),
+                ('vendor', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('notes', models.TextField(blank=True, default=None, null=True)),
+                ('first_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='first_seen')),
+                ('last_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='last_seen')),
+                ('machine_id', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='network.machine')),
+                ('site_id', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='network.site')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='network',
+            name='site_id',
+            field=models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='network.site'),
+        ),
+        migrations.AddField(
+            model_name='machine',
+            name='site_id',
+            field=models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='network.site'),
+        ),
+        migrations.AddField(
+            model_name='interface',
+            name='machine_id',
+            field=models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='network.machine'),
+        ),
+        migrations.AddField(
+            model_name='interface',
+            name='site_id',
+            field=models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='network.site'),
+        ),
+        migrations.CreateModel(
+            name='Bluetooth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, default=None, max_length=253, null=True)),
+                ('type', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('hardware', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('status', models.CharField(choices=[('UP', 'Up'), ('DOWN', 'Down')], default='DOWN', max_length=4)),
+                ('physical_address', models.CharField(blank=True, default=None, max_length=17, null=True, validators=[django.core.validators.RegexValidator(code='invalid_mac_address', message='MAC Address must be valid', regex='^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$')])),
+                ('vendor', models.CharField(blank=True, default=None, max_length=40, null=True)),
+                ('notes', models.TextField(blank=True, default=None, null=True)),
+                ('first_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='first_seen')),
+                ('last_seen', models.DateTimeField(blank=True, default=django.utils.timezone.now, verbose_name='last_seen')),
+                ('machine_id', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='network.machine')),
+                ('site_id', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='network.site')),
+            ],
+        ),
+    ]
@@ -0,0 +1,129 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bluetooth',
+            index=models.Index(condition=models.Q(('physical_address__isnull', False)), fields=['physical_address'], name='bluetooth_mac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bluetooth',
+            index=models.Index(fields=['site_id', 'last_seen'], name='bluetooth_site_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bluetooth',
+            index=models.Index(fields=['machine_id', 'last_seen'], name='bluetooth_machine_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bluetooth',
+            index=models.Index(fields=['last_seen', 'id'], name='bluetooth_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interface',
+            index=models.Index(condition=models.Q(('physical_address__isnull', False)), fields=['physical_address'], name='interface_mac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interface',
+            index=models.Index(fields=['site_id', 'last_seen'], name='interface_site_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interface',
+            index=models.Index(fields=['machine_id', 'last_seen'], name='interface_machine_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interface',
+            index=models.Index(fields=['last_seen', 'id'], name='interface_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='machine',
+            index=models.Index(fields=['status'], name='machine_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='machine',
+            index=models.Index(fields=['site_id', 'last_seen'], name='machine_site_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='machine',
+            index=models.Index(fields=['last_seen', 'id'], name='machine_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='network',
+            index=models.Index(fields=['site_id', 'last_seen'], name='network_site_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='network',
+            index=models.Index(fields=['last_seen', 'id'], name='network_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='radio',
+            index=models.Index(condition=models.Q(('physical_address__isnull', False)), fields=['physical_address'], name='radio_mac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='radio',
+            index=models.Index(fields=['site_id', 'last_seen'], name='radio_site_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='radio',
+            index=models.Index(fields=['machine_id', 'last_seen'], name='radio_machine_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='radio',
+            index=models.Index(fields=['last_seen', 'id'], name='radio_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resource',
+            index=models.Index(fields=['protocol', 'port'], name='resource_protocol_port_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resource',
+            index=models.Index(fields=['interface_id', 'protocol', 'port'], name='resource_interface_port_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resource',
+            index=models.Index(fields=['site_id', 'last_seen'], name='resource_site_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resource',
+            index=models.Index(fields=['last_seen', 'id'], name='resource_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='switch',
+            index=models.Index(condition=models.Q(('physical_address__isnull', False)), fields=['physical_address'], name='switch_mac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='switch',
+            index=models.Index(fields=['site_id', 'last_seen'], name='switch_site_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='switch',
+            index=models.Index(fields=['network_id', 'last_seen'], name='switch_network_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='switch',
+            index=models.Index(fields=['last_seen', 'id'], name='switch_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wifi',
+            index=models.Index(condition=models.Q(('BSSID__isnull', False)), fields=['BSSID'], name='wifi_bssid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wifi',
+            index=models.Index(fields=['site_id', 'last_seen'], name='wifi_site_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wifi',
+            index=models.Index(fields=['network_id', 'last_seen'], name='wifi_network_seen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wifi',
+            index=models.Index(fields=['last_seen', 'id'], name='wifi_seen_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:11
+
+from django.db import migrations, models
+
+from entity_api.addresses import backfill_address_keys
+
+
+def backfill(apps, schema_editor):
+    backfill_address_keys(apps.get_model('network', 'Interface'), {'ip_v4_key': 'ip_v4', 'ip_v6_key': 'ip_v6'})
+    backfill_address_keys(apps.get_model('network', 'Switch'), {'address_key': 'address'})
+    backfill_address_keys(apps.get_model('network', 'WiFi'), {'address_key': 'address'})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network', '0002_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interface',
+            name='ip_v4_key',
+            field=models.CharField(blank=True, default=None, editable=False, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='interface',
+            name='ip_v6_key',
+            field=models.CharField(blank=True, default=None, editable=False, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='switch',
+            name='address_key',
+            field=models.CharField(blank=True, default=None, editable=False, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='wifi',
+            name='address_key',
+            field=models.CharField(blank=True, default=None, editable=False, max_length=32, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='interface',
+            index=models.Index(condition=models.Q(('ip_v4_key__isnull', False)), fields=['ip_v4_key'], name='interface_ip_v4_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interface',
+            index=models.Index(condition=models.Q(('ip_v6_key__isnull', False)), fields=['ip_v6_key'], name='interface_ip_v6_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='switch',
+            index=models.Index(condition=models.Q(('address_key__isnull', False)), fields=['address_key'], name='switch_address_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wifi',
+            index=models.Index(condition=models.Q(('address_key__isnull', False)), fields=['address_key'], name='wifi_address_key_idx'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.1.13 on 2026-10-18 15:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# A frozen copy of network.rollups.ROLLUPS as it stood when the rollups were added: model name: (summary key, the
+# column splitting its count, if any).
+ROLLUPS = {
+    'Machine': ('machines', 'status'),
+    'Interface': ('interfaces', None),
+    'Resource': ('resources', 'protocol'),
+    'WiFi': ('wifi', 'type'),
+    'Bluetooth': ('bluetooth', None),
+    'Radio': ('radios', None),
+}
+
+
+def backfill(apps, schema_editor):
+    # one grouped count per table into the empty rollup table
+    using = schema_editor.connection.alias
+    rollup = apps.get_model('network', 'Rollup')
+    rows = []
+    for name, (key, split) in ROLLUPS.items():
+        columns = ('site_id', split) if split else ('site_id',)
+        groups = apps.get_model('network', name).objects.using(using).filter(site_id__isnull=False) \
+            .values(*columns).annotate(rows=models.Count('id')).order_by()
+        for group in groups:
+            value = group.get(split)
+            metric = key if value is None else '{key}.{value}'.format(key=key, value=value)
+            rows.append(rollup(site_id_id=group['site_id'], metric=metric, count=group['rows']))
+    rollup.objects.using(using).bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network', '0004_revisions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Rollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=40)),
+                ('count', models.BigIntegerField(default=0)),
+                ('site_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='network.site')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='rollup',
+            constraint=models.UniqueConstraint(fields=('site_id', 'metric'), name='rollup_site_metric_uniq'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
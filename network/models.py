@@ -3,6 +3,10 @@ from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from changes.revisions import RevisionMixin
+from entity_api.addresses import AddressKeyMixin, address_key_field
+from network.rollups import RollupMixin
+
 
 class Status(models.TextChoices):
     UP = 'UP', _('Up')
@@ -21,13 +25,13 @@ class Protocol(models.TextChoices):
     UDP = 'UDP', _('UDP')
 
 
-class Site(models.Model):
+class Site(RevisionMixin, models.Model):
     name = models.CharField(max_length=253, default=None, blank=True, null=True)
     type = models.CharField(max_length=40, default=None, blank=True, null=True)
     notes = models.TextField(default=None, blank=True, null=True)
 
 
-class Network(models.Model):
+class Network(RevisionMixin, models.Model):
     name = models.CharField(max_length=253, default=None, blank=True, null=True)
     type = models.CharField(max_length=40, default=None, blank=True, null=True)
     os = models.CharField(max_length=40, default=None, blank=True, null=True)
@@ -39,11 +43,17 @@ class Network(models.Model):
     last_seen = models.DateTimeField(default=timezone.now, blank=True, verbose_name='last_seen')
     site_id = models.ForeignKey(Site, on_delete=models.CASCADE, related_name='+', default=None, blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['site_id', 'last_seen'], name='network_site_seen_idx'),
+            models.Index(fields=['last_seen', 'id'], name='network_seen_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
 
-class Switch(models.Model):
+class Switch(RevisionMixin, AddressKeyMixin, models.Model):
     name = models.CharField(max_length=253, default=None, blank=True, null=True)
     address = models.GenericIPAddressField(default=None, blank=True, null=True)
     mask = models.GenericIPAddressField(default=None, blank=True, null=True)
@@ -66,12 +76,26 @@ class Switch(models.Model):
                                 default=None, blank=True, null=True)
     network_id = models.ForeignKey(Network, on_delete=models.CASCADE, related_name='+',
                                    default=None, blank=True, null=True)
+    address_key = address_key_field()
+
+    address_keys = {'address_key': 'address'}
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['physical_address'], name='switch_mac_idx',
+                         condition=models.Q(physical_address__isnull=False)),
+            models.Index(fields=['address_key'], name='switch_address_key_idx',
+                         condition=models.Q(address_key__isnull=False)),
+            models.Index(fields=['site_id', 'last_seen'], name='switch_site_seen_idx'),
+            models.Index(fields=['network_id', 'last_seen'], name='switch_network_seen_idx'),
+            models.Index(fields=['last_seen', 'id'], name='switch_seen_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
-class WiFi(models.Model):
+class WiFi(RollupMixin, RevisionMixin, AddressKeyMixin, models.Model):
     name = models.CharField(max_length=253, default=None, blank=True, null=True)
     type = models.CharField(max_length=20, choices=SSIDType.choices, default=SSIDType.WIFI_DEVICE)
     address = models.GenericIPAddressField(default=None, blank=True, null=True)
@@ -104,12 +128,26 @@ class WiFi(models.Model):
                                 default=None, blank=True, null=True)
     network_id = models.ForeignKey(Network, on_delete=models.CASCADE, related_name='+',
                                    default=None, blank=True, null=True)
+    address_key = address_key_field()
+
+    address_keys = {'address_key': 'address'}
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['BSSID'], name='wifi_bssid_idx',
+                         condition=models.Q(BSSID__isnull=False)),
+            models.Index(fields=['address_key'], name='wifi_address_key_idx',
+                         condition=models.Q(address_key__isnull=False)),
+            models.Index(fields=['site_id', 'last_seen'], name='wifi_site_seen_idx'),
+            models.Index(fields=['network_id', 'last_seen'], name='wifi_network_seen_idx'),
+            models.Index(fields=['last_seen', 'id'], name='wifi_seen_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
-class Machine(models.Model):
+class Machine(RollupMixin, RevisionMixin, models.Model):
     name = models.CharField(max_length=253, default=None, blank=True, null=True)
     type = models.CharField(max_length=40, default=None, blank=True, null=True)
     os = models.CharField(max_length=40, default=None, blank=True, null=True)
@@ -122,11 +160,18 @@ class Machine(models.Model):
     site_id = models.ForeignKey(Site, on_delete=models.CASCADE, related_name='+',
                                 default=None, blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status'], name='machine_status_idx'),
+            models.Index(fields=['site_id', 'last_seen'], name='machine_site_seen_idx'),
+            models.Index(fields=['last_seen', 'id'], name='machine_seen_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
 
-class Interface(models.Model):
+class Interface(RollupMixin, RevisionMixin, AddressKeyMixin, models.Model):
     name = models.CharField(max_length=253, default=None, blank=True, null=True)
     type = models.CharField(max_length=40, default=None, blank=True, null=True)
     ip_v4 = models.GenericIPAddressField(default=None, blank=True, null=True)
@@ -146,12 +191,29 @@ class Interface(models.Model):
                                 default=None, blank=True, null=True)
     machine_id = models.ForeignKey(Machine, on_delete=models.CASCADE, related_name='+',
                                    default=None, blank=True, null=True)
+    ip_v4_key = address_key_field()
+    ip_v6_key = address_key_field()
+
+    address_keys = {'ip_v4_key': 'ip_v4', 'ip_v6_key': 'ip_v6'}
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['physical_address'], name='interface_mac_idx',
+                         condition=models.Q(physical_address__isnull=False)),
+            models.Index(fields=['ip_v4_key'], name='interface_ip_v4_key_idx',
+                         condition=models.Q(ip_v4_key__isnull=False)),
+            models.Index(fields=['ip_v6_key'], name='interface_ip_v6_key_idx',
+                         condition=models.Q(ip_v6_key__isnull=False)),
+            models.Index(fields=['site_id', 'last_seen'], name='interface_site_seen_idx'),
+            models.Index(fields=['machine_id', 'last_seen'], name='interface_machine_seen_idx'),
+            models.Index(fields=['last_seen', 'id'], name='interface_seen_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
-class Resource(models.Model):
+class Resource(RollupMixin, RevisionMixin, models.Model):
     name = models.CharField(max_length=253, default=None, blank=True, null=True)
     protocol = models.CharField(max_length=4, choices=Protocol.choices, default=Protocol.TCP)
     port = models.IntegerField(validators=[
@@ -166,11 +228,19 @@ class Resource(models.Model):
     interface_id = models.ForeignKey(Interface, on_delete=models.CASCADE, related_name='+',
                                      default=None, blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['protocol', 'port'], name='resource_protocol_port_idx'),
+            models.Index(fields=['interface_id', 'protocol', 'port'], name='resource_interface_port_idx'),
+            models.Index(fields=['site_id', 'last_seen'], name='resource_site_seen_idx'),
+            models.Index(fields=['last_seen', 'id'], name='resource_seen_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
 
-class Bluetooth(models.Model):
+class Bluetooth(RollupMixin, RevisionMixin, models.Model):
     name = models.CharField(max_length=253, default=None, blank=True, null=True)
     type = models.CharField(max_length=40, default=None, blank=True, null=True)
     hardware = models.CharField(max_length=40, default=None, blank=True, null=True)
@@ -189,11 +259,20 @@ class Bluetooth(models.Model):
     machine_id = models.ForeignKey(Machine, on_delete=models.CASCADE, related_name='+',
                                    default=None, blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['physical_address'], name='bluetooth_mac_idx',
+                         condition=models.Q(physical_address__isnull=False)),
+            models.Index(fields=['site_id', 'last_seen'], name='bluetooth_site_seen_idx'),
+            models.Index(fields=['machine_id', 'last_seen'], name='bluetooth_machine_seen_idx'),
+            models.Index(fields=['last_seen', 'id'], name='bluetooth_seen_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
 
-class Radio(models.Model):
+class Radio(RollupMixin, RevisionMixin, models.Model):
     name = models.CharField(max_length=253, default=None, blank=True, null=True)
     type = models.CharField(max_length=40, default=None, blank=True, null=True)
     hardware = models.CharField(max_length=40, default=None, blank=True, null=True)
@@ -211,3 +290,27 @@ class Radio(models.Model):
                                 default=None, blank=True, null=True)
     machine_id = models.ForeignKey(Machine, on_delete=models.CASCADE, related_name='+',
                                    default=None, blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['physical_address'], name='radio_mac_idx',
+                         condition=models.Q(physical_address__isnull=False)),
+            models.Index(fields=['site_id', 'last_seen'], name='radio_site_seen_idx'),
+            models.Index(fields=['machine_id', 'last_seen'], name='radio_machine_seen_idx'),
+            models.Index(fields=['last_seen', 'id'], name='radio_seen_idx'),
+        ]
+
+
+class Rollup(models.Model):
+    """
+    How many rows of a kind a site holds, such as `machines.UP` or `interfaces`, kept up to date as rows are written
+    (see network.rollups).
+    """
+    site_id = models.ForeignKey(Site, on_delete=models.CASCADE, related_name='+')
+    metric = models.CharField(max_length=40)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['site_id', 'metric'], name='rollup_site_metric_uniq'),
+        ]
@@ -0,0 +1,177 @@
+from collections import Counter
+from functools import partial
+
+from django.apps import apps
+from django.db import connections, models, transaction
+from django.db.models import Count, QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from rest_framework.generics import get_object_or_404
+
+from entity_api.signals import bulk_saved
+
+# model name: (summary key, the column splitting its count, if any)
+ROLLUPS = {
+    'Machine': ('machines', 'status'),
+    'Interface': ('interfaces', None),
+    'Resource': ('resources', 'protocol'),
+    'WiFi': ('wifi', 'type'),
+    'Bluetooth': ('bluetooth', None),
+    'Radio': ('radios', None),
+}
+
+UPSERT = (
+    'INSERT INTO {table} ({site}, metric, count) VALUES (%s, %s, %s) '
+    'ON CONFLICT ({site}, metric) DO UPDATE SET count = {table}.count + excluded.count'
+)
+
+
+def metric(key, value=None):
+    return key if value is None else '{key}.{value}'.format(key=key, value=value)
+
+
+def counted_fields(model_name):
+    split = ROLLUPS[model_name][1]
+    return ('site_id', split) if split else ('site_id',)
+
+
+class RollupMixin(models.Model):
+    """
+    Rows counted in the per-site rollups. The site and split column a row was loaded with are remembered in
+    `rollup_loaded`, so saving it can move it from one count to another without reading it back first.
+    """
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        columns = [cls._meta.get_field(name).attname for name in counted_fields(cls.__name__)]
+        if all(column in field_names for column in columns):  # not when deferred by only()
+            instance.rollup_loaded = tuple(getattr(instance, column) for column in columns)
+        return instance
+
+
+def counted(instance):
+    return tuple(getattr(instance, instance._meta.get_field(name).attname)
+                 for name in counted_fields(type(instance).__name__))
+
+
+def moves(model, instances, created):
+    """
+    Return the change each count goes through now that `instances` were written, keyed on (site, metric).
+    """
+    key = ROLLUPS[model.__name__][0]
+    deltas = Counter()
+    for instance in instances:
+        new = counted(instance)
+        if not created and not hasattr(instance, 'rollup_loaded'):
+            pass  # updated without knowing what it was counted as; left to reconcile_rollups
+        elif created or instance.rollup_loaded != new:
+            if not created and instance.rollup_loaded is not None:
+                deltas[instance.rollup_loaded[0], metric(key, *instance.rollup_loaded[1:])] -= 1
+            deltas[new[0], metric(key, *new[1:])] += 1
+        instance.rollup_loaded = new
+    return deltas
+
+
+def apply(deltas, using):
+    rows = [(site, name, count) for (site, name), count in deltas.items() if site is not None and count]
+    if rows:
+        rollup = apps.get_model('network', 'Rollup')
+        sql = UPSERT.format(table=rollup._meta.db_table, site=rollup._meta.get_field('site_id').column)
+        with connections[using].cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+
+def model_saving(sender, instance, using, **kwargs):
+    # a row saved without having been loaded is read back once, to know which count it leaves
+    if instance.pk is not None and not hasattr(instance, 'rollup_loaded'):
+        instance.rollup_loaded = sender._base_manager.using(using).filter(pk=instance.pk) \
+            .values_list(*counted_fields(sender.__name__)).first()
+
+
+def model_saved(sender, instance, created, using, update_fields=None, **kwargs):
+    if update_fields is None or set(update_fields) & set(counted_fields(sender.__name__)):
+        apply(moves(sender, [instance], created), using)
+
+
+def models_saved(sender, instances, created, **kwargs):
+    apply(moves(sender, instances, created), 'default')
+
+
+def model_deleted(sender, instance, using, origin=None, **kwargs):
+    site = apps.get_model('network', 'Site')
+    loaded = getattr(instance, 'rollup_loaded', None) or counted(instance)
+    if isinstance(origin, QuerySet) and origin.model is site or isinstance(origin, site) and origin.pk == loaded[0]:
+        return  # the site's rollups are deleted with it
+    key = loaded[0], metric(ROLLUPS[sender.__name__][0], *loaded[1:])
+    if origin is None:
+        apply({key: -1}, using)
+        return
+    # a delete sends this for every row it removes: its deltas are gathered on its `origin` and applied in one
+    # statement once it commits
+    deltas = origin.__dict__.setdefault('_rollup_deltas', Counter())
+    if not deltas:
+        transaction.on_commit(partial(apply, deltas, using), using)
+    deltas[key] -= 1
+
+
+def watch():
+    """
+    Keep the rollups in step with every save, delete and bulk write of the counted models. `QuerySet.update()` and
+    raw SQL bypass them; reconcile_rollups puts the counts right again.
+    """
+    for name in ROLLUPS:
+        model = apps.get_model('network', name)
+        uid = 'rollups-' + model._meta.label_lower
+        pre_save.connect(model_saving, sender=model, dispatch_uid=uid)
+        post_save.connect(model_saved, sender=model, dispatch_uid=uid)
+        post_delete.connect(model_deleted, sender=model, dispatch_uid=uid)
+        bulk_saved.connect(models_saved, sender=model, dispatch_uid=uid)
+
+
+def reconcile(get_model=apps.get_model, using='default'):
+    """
+    Recount every rollup with one grouped query per table and correct the rows that drifted. Returns how many were
+    corrected.
+    """
+    rollup = get_model('network', 'Rollup')
+    with transaction.atomic(using=using):
+        stored = {(row.site_id_id, row.metric): row for row in rollup.objects.using(using).select_for_update()}
+        actual = Counter()
+        for name, (key, split) in ROLLUPS.items():
+            model = get_model('network', name)
+            groups = model.objects.using(using).filter(site_id__isnull=False) \
+                .values(*counted_fields(name)).annotate(rows=Count('id')).order_by()
+            for group in groups:
+                actual[group['site_id'], metric(key, group.get(split))] += group['rows']
+
+        changed, created = [], []
+        for site, name in stored.keys() | actual.keys():
+            row, count = stored.get((site, name)), actual[site, name]
+            if row is None:
+                created.append(rollup(site_id_id=site, metric=name, count=count))
+            elif row.count != count:
+                row.count = count
+                changed.append(row)
+        rollup.objects.using(using).bulk_create(created)
+        rollup.objects.using(using).bulk_update(changed, ['count'])
+        rollup.objects.using(using).filter(count=0).delete()
+    return len(created) + len(changed)
+
+
+def summary(pk):
+    """
+    Return the counts of site `pk` from its rollup rows: two small queries, whatever the size of the site.
+    """
+    site = get_object_or_404(apps.get_model('network', 'Site').objects.values('id'), pk=pk)
+    counts = dict(apps.get_model('network', 'Rollup').objects.filter(site_id=pk).values_list('metric', 'count'))
+    result = {'id': site['id']}
+    for name, (key, split) in ROLLUPS.items():
+        if split is None:
+            result[key] = counts.get(key, 0)
+        else:
+            choices = apps.get_model('network', name)._meta.get_field(split).choices
+            result[key] = {value: counts.get(metric(key, value), 0) for value, _ in choices}
+    return result
@@ -32,10 +32,6 @@ class SiteSerializer(serializers.ModelSerializer):
             'notes',
         )
 
-    def to_representation(self, instance):
-        rep = super().to_representation(instance)
-        return rep
-
     def create(self, validated_data):
         instance = Site.objects.create(**validated_data)
         return instance
@@ -66,10 +62,6 @@ class NetworkSerializer(serializers.ModelSerializer):
             'site_id',
         )
 
-    def to_representation(self, instance):
-        rep = super().to_representation(instance)
-        return rep
-
     def create(self, validated_data):
         instance = Network.objects.create(**validated_data)
         return instance
@@ -107,10 +99,6 @@ class SwitchSerializer(serializers.ModelSerializer):
             'network_id',
         )
 
-    def to_representation(self, instance):
-        rep = super().to_representation(instance)
-        return rep
-
     def create(self, validated_data):
         instance = Switch.objects.create(**validated_data)
         return instance
@@ -150,10 +138,6 @@ class WiFiSerializer(serializers.ModelSerializer):
             'network_id',
         )
 
-    def to_representation(self, instance):
-        rep = super().to_representation(instance)
-        return rep
-
     def create(self, validated_data):
         instance = WiFi.objects.create(**validated_data)
         return instance
@@ -184,10 +168,6 @@ class MachineSerializer(serializers.ModelSerializer):
             'site_id',
         )
 
-    def to_representation(self, instance):
-        rep = super().to_representation(instance)
-        return rep
-
     def create(self, validated_data):
         instance = Machine.objects.create(**validated_data)
         return instance
@@ -220,10 +200,6 @@ class InterfaceSerializer(serializers.ModelSerializer):
             'machine_id',
         )
 
-    def to_representation(self, instance):
-        rep = super().to_representation(instance)
-        return rep
-
     def create(self, validated_data):
         instance = Interface.objects.create(**validated_data)
         return instance
@@ -253,10 +229,6 @@ class ResourceSerializer(serializers.ModelSerializer):
             'interface_id',
         )
 
-    def to_representation(self, instance):
-        rep = super().to_representation(instance)
-        return rep
-
     def create(self, validated_data):
         instance = Resource.objects.create(**validated_data)
         return instance
@@ -287,10 +259,6 @@ class BluetoothSerializer(serializers.ModelSerializer):
             'machine_id',
         )
 
-    def to_representation(self, instance):
-        rep = super().to_representation(instance)
-        return rep
-
     def create(self, validated_data):
         instance = Bluetooth.objects.create(**validated_data)
         return instance
@@ -321,10 +289,6 @@ class RadioSerializer(serializers.ModelSerializer):
             'machine_id',
         )
 
-    def to_representation(self, instance):
-        rep = super().to_representation(instance)
-        return rep
-
     def create(self, validated_data):
         instance = Radio.objects.create(**validated_data)
         return instance
@@ -333,3 +297,12 @@ class RadioSerializer(serializers.ModelSerializer):
         update_instance(instance, validated_data)
         instance.save()
         return instance
+
+
+# Serializers that render a foreign key inline with ?expand=, by related model
+EXPANSIONS = {
+    Site: SiteSerializer,
+    Network: NetworkSerializer,
+    Machine: MachineSerializer,
+    Interface: InterfaceSerializer,
+}
@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from entity_api.addresses import address_key, network_range
+from network.models import Interface, Switch
+
+BASE_URL = '/api/v2/'
+
+
+class AddressTests(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        self.client.login(username='temporary', password='temporary')
+        for address in ('10.20.0.1', '10.20.255.254', '10.21.0.1', '192.168.0.1', '9.255.255.255'):
+            Interface.objects.create(name=address, ip_v4=address)
+        Interface.objects.create(name='fe80::1', ip_v6='fe80::1')
+        Interface.objects.create(name='2001:db8::1', ip_v6='2001:db8::1')
+
+    def names(self, table, query, status_code=200):
+        response = self.client.get('{base}{resource}/?{query}&page_size=100'.format(
+            base=BASE_URL, resource=table, query=query))
+        self.assertEqual(response.status_code, status_code)
+        return sorted(row['name'] for row in response.data['results']) if status_code == 200 else response.data
+
+    def test_address_key_order(self):
+        self.assertLess(address_key('9.255.255.255'), address_key('10.0.0.0'))
+        self.assertLess(address_key('10.0.0.0'), address_key('10.0.0.10'))
+        self.assertEqual(network_range('10.0.0.0/30'), (address_key('10.0.0.0'), address_key('10.0.0.3')))
+        self.assertIsNone(address_key(None))
+
+    def test_cidr(self):
+        self.assertEqual(self.names('interfaces', 'cidr=10.20.0.0/16'), ['10.20.0.1', '10.20.255.254'])
+        self.assertEqual(self.names('interfaces', 'cidr=10.0.0.0/8'), ['10.20.0.1', '10.20.255.254', '10.21.0.1'])
+        self.assertEqual(self.names('interfaces', 'cidr=fe80::/10'), ['fe80::1'])
+
+    def test_range(self):
+        self.assertEqual(self.names('interfaces', 'ip_from=10.20.0.2&ip_to=10.21.0.1'), ['10.20.255.254', '10.21.0.1'])
+        self.assertEqual(self.names('interfaces', 'ip_from=2001:db8::'), ['2001:db8::1', 'fe80::1'])
+
+    def test_exact(self):
+        self.assertEqual(self.names('interfaces', 'ip=192.168.0.1'), ['192.168.0.1'])
+
+    def test_invalid(self):
+        self.assertIn('cidr', self.names('interfaces', 'cidr=10.0.0.0/33', status_code=400))
+        self.assertIn('ip', self.names('interfaces', 'ip=localhost', status_code=400))
+
+    def test_range_keeps_to_family(self):
+        # switches keep both families in one key column
+        Switch.objects.create(name='v4', address='10.0.0.1')
+        Switch.objects.create(name='v6', address='2001:db8::1')
+        self.assertEqual(self.names('switches', 'ip_from=10.0.0.0'), ['v4'])
+        self.assertEqual(self.names('switches', 'ip_to=255.255.255.255'), ['v4'])
+        self.assertEqual(self.names('switches', 'ip_from=::'), ['v6'])
+        self.assertEqual(self.names('switches', 'ip_to=ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff'), ['v6'])
+        self.assertEqual(self.names('switches', 'cidr=::/0'), ['v6'])
+        self.assertEqual(self.names('switches', 'cidr=0.0.0.0/0'), ['v4'])
+
+    def test_key_follows_updates(self):
+        switch = Switch.objects.create(name='core', address='10.20.0.1')
+        self.assertEqual(self.names('switches', 'cidr=10.20.0.0/24'), ['core'])
+        switch.address = '172.16.0.1'
+        switch.save()
+        self.assertEqual(self.names('switches', 'cidr=10.20.0.0/24'), [])
+        self.assertEqual(self.names('switches', 'cidr=172.16.0.0/12'), ['core'])
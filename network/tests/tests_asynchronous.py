@@ -0,0 +1,91 @@
+import asyncio
+import threading
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from rest_framework import permissions, viewsets
+from rest_framework.response import Response
+
+from entity_api.asynchronous import AsyncReadMixin
+from entity_api.cache import api_cache
+from entity_api.metrics import MetricsMiddleware
+from network.models import Site, Machine
+from network.views import MachineView
+
+
+class Probe(AsyncReadMixin, viewsets.ViewSet):
+    permission_classes = [permissions.AllowAny]
+    barrier = None
+
+    def list(self, request):
+        # both requests must be inside the view at once to get past the barrier
+        self.barrier.wait(timeout=5)
+        return Response({'thread': threading.get_ident()})
+
+    def create(self, request):
+        return Response({'thread': threading.get_ident()})
+
+
+@override_settings(ASYNC_READS=True)
+class AsyncReadTests(SimpleTestCase):
+    factory = AsyncRequestFactory()
+
+    def test_reads_run_concurrently(self):
+        Probe.barrier = threading.Barrier(2)
+        view = Probe.as_view({'get': 'list'})
+        self.assertTrue(asyncio.iscoroutinefunction(view))
+
+        async def both():
+            return await asyncio.gather(view(self.factory.get('/probe/')), view(self.factory.get('/probe/')))
+
+        first, second = async_to_sync(both)()
+        self.assertNotEqual(first.data['thread'], second.data['thread'])
+
+    def test_writes_and_other_routes(self):
+        view = Probe.as_view({'get': 'list', 'post': 'create'})
+        self.assertEqual(async_to_sync(view)(self.factory.post('/probe/')).status_code, 200)
+        self.assertFalse(asyncio.iscoroutinefunction(Probe.as_view({'get': 'export'})))
+
+    @override_settings(ASYNC_READS=False)
+    def test_disabled(self):
+        self.assertFalse(asyncio.iscoroutinefunction(Probe.as_view({'get': 'list'})))
+
+    def test_async_metrics_middleware(self):
+        async def view(request):
+            return HttpResponse('ok')
+
+        middleware = MetricsMiddleware(view)
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        response = async_to_sync(middleware)(self.factory.get('/probe/'))
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+
+@override_settings(ASYNC_READS=True)
+class AsyncViewTests(TransactionTestCase):
+    def test_list_and_retrieve(self):
+        api_cache().clear()
+        user = get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        machine = Machine.objects.create(name='Laptop', site_id=Site.objects.create(name='Home'))
+        factory = AsyncRequestFactory()
+
+        request = factory.get('/api/v2/machines/')
+        request.user = user
+        response = async_to_sync(MachineView.as_view({'get': 'list'}))(request)
+        self.assertEqual([row['name'] for row in response.data['results']], ['Laptop'])
+
+        request = factory.get('/api/v2/machines/{pk}/'.format(pk=machine.pk))
+        request.user = user
+        response = async_to_sync(MachineView.as_view({'get': 'retrieve'}))(request, pk=machine.pk)
+        self.assertEqual(response.data['id'], machine.pk)
+
+    def test_metrics_count_every_view(self):
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        site = Site.objects.create(name='Home')
+        self.async_client.login(username='temporary', password='temporary')
+
+        for path in ('/api/v2/sites/{pk}/summary/', '/api/v2/sites/changes/', '/api/v2/machines/'):
+            response = async_to_sync(self.async_client.get)(path.format(pk=site.pk))
+            self.assertEqual(response.status_code, 200, path)
+            self.assertNotIn('desc="0 queries"', response['Server-Timing'], path)
@@ -0,0 +1,87 @@
+import base64
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+from entity_api.authentication import TTLCache, credentials
+from entity_api.cache import api_cache
+
+URL = '/api/v2/sites/'
+
+
+def basic(username, password):
+    return 'Basic ' + base64.b64encode('{username}:{password}'.format(
+        username=username, password=password).encode()).decode()
+
+
+class AuthenticationCacheTests(TestCase):
+    def setUp(self):
+        api_cache().clear()
+        credentials.clear()
+        self.user = get_user_model().objects.create_user('scanner', 'scanner@example.com', 'secret')
+
+    def get(self, authorization):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(URL, HTTP_AUTHORIZATION=authorization)
+        return response, [query['sql'] for query in context.captured_queries if 'auth' in query['sql']]
+
+    def test_basic_credentials_are_verified_once(self):
+        with mock.patch('django.contrib.auth.base_user.check_password', return_value=True) as check_password:
+            response, queries = self.get(basic('scanner', 'secret'))
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(queries)
+
+            response, queries = self.get(basic('scanner', 'secret'))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(queries, [])
+        self.assertEqual(check_password.call_count, 1)
+
+    def test_wrong_password_is_not_cached(self):
+        self.assertEqual(self.get(basic('scanner', 'secret'))[0].status_code, 200)
+        self.assertEqual(self.get(basic('scanner', 'wrong'))[0].status_code, 401)
+        self.assertEqual(self.get(basic('scanner', 'wrong'))[0].status_code, 401)
+
+    def test_password_change_revokes(self):
+        self.assertEqual(self.get(basic('scanner', 'secret'))[0].status_code, 200)
+        self.user.set_password('rotated')
+        self.user.save()
+        self.assertEqual(self.get(basic('scanner', 'secret'))[0].status_code, 401)
+        self.assertEqual(self.get(basic('scanner', 'rotated'))[0].status_code, 200)
+
+    def test_deactivation_revokes(self):
+        self.assertEqual(self.get(basic('scanner', 'secret'))[0].status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get(basic('scanner', 'secret'))[0].status_code, 401)
+
+    def test_token_lookup_is_cached_and_revoked(self):
+        token = Token.objects.create(user=self.user)
+        authorization = 'Token ' + token.key
+        response, queries = self.get(authorization)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(queries)
+
+        response, queries = self.get(authorization)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+
+        token.delete()
+        self.assertEqual(self.get(authorization)[0].status_code, 401)
+
+
+class TTLCacheTests(TestCase):
+    def test_expiry_and_bound(self):
+        cache = TTLCache(max_size=2, ttl=10)
+        with mock.patch('entity_api.authentication.time.monotonic', return_value=100):
+            cache.set('a', 1)
+            cache.set('b', 2)
+            self.assertEqual(cache.get('a'), 1)
+            cache.set('c', 3)  # evicts b, the least recently used
+            self.assertIsNone(cache.get('b'))
+            self.assertEqual(cache.get('c'), 3)
+        with mock.patch('entity_api.authentication.time.monotonic', return_value=111):
+            self.assertIsNone(cache.get('a'))
@@ -0,0 +1,43 @@
+from django.test import TestCase
+
+from benchmarks import topology
+from benchmarks.runner import Runner, compare, percentile
+from network.models import Interface, Resource
+
+SCALE = {'sites': 1, 'networks': 1, 'switches': 2, 'wifis': 1, 'machines': 3, 'interfaces': 2, 'resources': 2,
+         'entities': 3, 'ssids': 2}
+
+
+class BenchmarkTests(TestCase):
+    def test_topology_is_reproducible(self):
+        rows = topology.build(SCALE, seed=1)
+        self.assertEqual(rows['network.interface'], 6)
+        self.assertEqual(rows['network.resource'], 12)
+        self.assertEqual(rows['entity.interface'], 10)
+        self.assertFalse(Interface.objects.filter(ip_v4_key__isnull=True).exists())
+
+        addresses = list(Interface.objects.order_by('pk').values_list('ip_v4', 'physical_address'))
+        ports = list(Resource.objects.order_by('pk').values_list('port', flat=True))
+        Interface.objects.all().delete()
+        topology.build(SCALE, seed=1)
+        self.assertEqual(list(Interface.objects.order_by('pk').values_list('ip_v4', 'physical_address')),
+                         addresses)
+        self.assertEqual(list(Resource.objects.order_by('pk').values_list('port', flat=True))[-len(ports):], ports)
+
+    def test_runner_reports_every_scenario(self):
+        topology.build(SCALE)
+        results = Runner(repeat=2, page_size=5).run()
+        self.assertEqual(set(results), set(Runner.scenarios))
+        for result in results.values():
+            self.assertEqual(result['runs'], 2)
+            self.assertGreater(result['queries']['min'], 0)
+            self.assertLessEqual(result['latency_ms']['p50'], result['latency_ms']['max'])
+
+        report = {'results': results}
+        self.assertFalse([line for line in compare(report, report) if line.startswith('!')])
+
+    def test_percentile(self):
+        samples = [5, 1, 4, 2, 3]
+        self.assertEqual(percentile(samples, 50), 3)
+        self.assertEqual(percentile(samples, 99), 5)
+        self.assertEqual(percentile([7], 90), 7)
@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from entity.models import Entity, Resource as EntityResource
+from entity_api.cache import api_cache
+from network.models import Site, Machine
+
+BASE_URL = '/api/v2/'
+
+
+class CacheTests(TestCase):
+    def setUp(self):
+        api_cache().clear()
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        self.client.login(username='temporary', password='temporary')
+        self.site = Site.objects.create(name='Home')
+        self.machine = Machine.objects.create(name='Laptop', site_id=self.site)
+
+    def get(self, url, cache):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], cache)
+        return response.json()
+
+    def test_hit_after_miss(self):
+        url = '{base}machines/'.format(base=BASE_URL)
+        self.assertEqual(self.get(url, 'MISS'), self.get(url, 'HIT'))
+        self.get(url + '?page_size=5', 'MISS')
+        self.get('{base}machines/{pk}/'.format(base=BASE_URL, pk=self.machine.id), 'MISS')
+
+    def test_save_and_delete_invalidate(self):
+        url = '{base}machines/'.format(base=BASE_URL)
+        self.get(url, 'MISS')
+        self.machine.name = 'Desktop'
+        self.machine.save()
+        self.assertEqual(self.get(url, 'MISS')['results'][0]['name'], 'Desktop')
+        self.machine.delete()
+        self.assertEqual(self.get(url, 'MISS')['count'], 0)
+
+    def test_unrelated_write_keeps_entry(self):
+        url = '{base}machines/'.format(base=BASE_URL)
+        self.get(url, 'MISS')
+        Site.objects.create(name='Office')
+        self.get(url, 'HIT')
+
+    def test_bulk_write_invalidates(self):
+        url = '{base}machines/'.format(base=BASE_URL)
+        self.get(url, 'MISS')
+        response = self.client.post('{base}ingest/'.format(base=BASE_URL),
+                                    {"machines": [{"name": "Desktop", "site_id": self.site.id}]},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.get(url, 'MISS')['count'], 2)
+
+    def test_nested_relation_invalidates(self):
+        entity = Entity.objects.create(name='router')
+        interface = entity.interface.create(name='eth0')
+        url = '/api/v1/entities/{pk}/'.format(pk=entity.id)
+        self.get(url, 'MISS')
+        self.get(url, 'HIT')
+        interface.resource.add(EntityResource.objects.create(port=22))
+        self.assertEqual(len(self.get(url, 'MISS')['interface'][0]['resource']), 1)
+
+    def test_users_do_not_share_entries(self):
+        url = '{base}machines/'.format(base=BASE_URL)
+        self.get(url, 'MISS')
+        get_user_model().objects.create_user('other', 'other@gmail.com', 'other')
+        self.client.login(username='other', password='other')
+        self.get(url, 'MISS')
+
+    def test_statistics(self):
+        url = '{base}machines/'.format(base=BASE_URL)
+        self.get(url, 'MISS')
+        self.get(url, 'HIT')
+        self.get(url, 'HIT')
+        self.assertEqual(self.client.get('/api/cache/').json(), {'hits': 2, 'misses': 1})
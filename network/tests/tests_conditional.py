@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from entity.models import Entity
+from entity_api.cache import api_cache
+from network.models import Site, Machine
+
+BASE_URL = '/api/v2/'
+
+
+class ConditionalTests(TestCase):
+    def setUp(self):
+        api_cache().clear()
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        self.client.login(username='temporary', password='temporary')
+        self.site = Site.objects.create(name='Home')
+        self.machine = Machine.objects.create(name='Laptop', site_id=self.site)
+
+    def test_list_not_modified(self):
+        url = '{base}machines/'.format(base=BASE_URL)
+        response = self.client.get(url)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse([query for query in context.captured_queries if 'network_machine' in query['sql']])
+
+    def test_list_modified_after_write(self):
+        url = '{base}machines/'.format(base=BASE_URL)
+        etag = self.client.get(url)['ETag']
+        Machine.objects.create(name='Desktop', site_id=self.site)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_if_modified_since(self):
+        url = '{base}machines/'.format(base=BASE_URL)
+        last_modified = self.client.get(url)['Last-Modified']
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+    def test_detail_tracks_row(self):
+        url = '{base}machines/{pk}/'.format(base=BASE_URL, pk=self.machine.id)
+        etag = self.client.get(url)['ETag']
+        Machine.objects.create(name='Desktop', site_id=self.site)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.machine.name = 'Workstation'
+        self.machine.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_detail_tracks_nested_rows(self):
+        entity = Entity.objects.create(name='router')
+        interface = entity.interface.create(name='eth0')
+        url = '/api/v1/entities/{pk}/'.format(pk=entity.id)
+        etag = self.client.get(url)['ETag']
+        interface.name = 'eth1'
+        interface.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_validators_outlive_the_local_cache(self):
+        # another worker has its own cache but reads the same counters
+        url = '{base}machines/'.format(base=BASE_URL)
+        response = self.client.get(url)
+        api_cache().clear()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
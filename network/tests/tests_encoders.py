@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import serializers
+
+from entity.models import Entity, SSID
+from entity.serializers import EntitySerializer, SSIDSerializer
+from entity_api.cache import api_cache
+from entity_api.encoders import compile_encoder
+from network.models import Site, Machine, Interface, Resource, WiFi
+from network.serializers import MachineSerializer, InterfaceSerializer, ResourceSerializer, WiFiSerializer
+
+
+class EncoderTests(TestCase):
+    def setUp(self):
+        site = Site.objects.create(name='Home')
+        machine = Machine.objects.create(name='Laptop', os='Linux', site_id=site, last_seen=timezone.now())
+        interface = Interface.objects.create(name='eth0', ip_v4='192.168.1.20', site_id=site, machine_id=machine)
+        Resource.objects.create(port=22, site_id=site, interface_id=interface)
+        WiFi.objects.create(name='Guest', BSSID='00:11:22:33:44:55', site_id=site)
+
+        entity = Entity.objects.create(name='host', first_seen=timezone.now())
+        entity.interface.create(name='eth0', ip_v4='10.0.0.1').resource.create(port=443)
+        SSID.objects.create(name='Base Station').client.set(entity.interface.all())
+
+    def test_same_output_as_serializer(self):
+        for serializer_class in (MachineSerializer, InterfaceSerializer, ResourceSerializer, WiFiSerializer,
+                                 EntitySerializer, SSIDSerializer):
+            encode = compile_encoder(serializer_class())
+            for instance in serializer_class.Meta.model.objects.all():
+                self.assertEqual(encode(instance), serializer_class(instance).data, serializer_class.__name__)
+
+    def test_custom_representation_is_kept(self):
+        class UpperSerializer(serializers.ModelSerializer):
+            class Meta:
+                model = Site
+                fields = ('id', 'name')
+
+            def to_representation(self, instance):
+                return {'name': instance.name.upper()}
+
+        self.assertEqual(compile_encoder(UpperSerializer())(Site.objects.get()), {'name': 'HOME'})
+
+    def test_list_renders_through_encoder(self):
+        api_cache().clear()
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        self.client.login(username='temporary', password='temporary')
+        machine = Machine.objects.get()
+        response = self.client.get('/api/v2/machines/')
+        self.assertEqual(response.json()['results'], [MachineSerializer(machine).data])
+        response = self.client.get('/api/v1/entities/{pk}/'.format(pk=Entity.objects.get().pk))
+        self.assertEqual(response.json(), EntitySerializer(Entity.objects.get()).data)
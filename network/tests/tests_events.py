@@ -0,0 +1,126 @@
+import asyncio
+import json
+from base64 import b64encode
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from entity_api import events
+from entity_api.asgi import application
+from entity_api.events import Subscriber, hub
+from network.models import Site, Machine
+
+
+def event(kind, pk, action, site=1):
+    return {'type': kind, 'id': pk, 'action': action, 'site': site}
+
+
+class SubscriberTests(SimpleTestCase):
+    def test_coalesces_per_row(self):
+        subscriber = Subscriber()
+        subscriber.offer([event('network.machine', 1, 'created'), event('network.machine', 1, 'updated'),
+                          event('network.machine', 2, 'updated'), event('network.machine', 2, 'deleted')])
+        self.assertTrue(subscriber.ready.is_set())
+        name, data = subscriber.drain().splitlines()[:2]
+        self.assertEqual(name, 'event: changes')
+        self.assertEqual([(row['id'], row['action']) for row in json.loads(data[len('data: '):])],
+                         [(1, 'created'), (2, 'deleted')])
+        self.assertFalse(subscriber.ready.is_set())
+
+    def test_filters(self):
+        subscriber = Subscriber(types={'network.machine'}, site=1)
+        subscriber.offer([event('network.interface', 1, 'created'), event('network.machine', 2, 'created', site=2),
+                          event('entity.entity', 3, 'created', site=None), event('network.machine', 4, 'updated')])
+        self.assertEqual(list(subscriber.pending), [('network.machine', 4)])
+
+    def test_overflow_resets(self):
+        subscriber = Subscriber()
+        subscriber.offer([event('network.machine', pk, 'updated') for pk in range(events.MAX_PENDING + 1)])
+        self.assertEqual(subscriber.drain(), 'event: reset\ndata: {}\n\n')
+        self.assertEqual(subscriber.pending, {})
+
+
+class HubTests(TestCase):
+    def test_committed_writes_reach_subscribers(self):
+        site = Site.objects.create(name='Home')
+
+        def write():
+            with self.captureOnCommitCallbacks(execute=True):
+                machine = Machine.objects.create(name='Laptop', site_id=site)
+                machine.save()
+            with self.captureOnCommitCallbacks(execute=True):
+                Site.objects.create(name='Office')
+            return machine.pk
+
+        async def listen():
+            subscriber = Subscriber(site=site.pk)
+            hub.subscribe(subscriber)
+            try:
+                pk = await sync_to_async(write)()
+                await asyncio.wait_for(subscriber.ready.wait(), 5)
+                return pk, list(subscriber.pending.values())
+            finally:
+                hub.unsubscribe(subscriber)
+
+        pk, pending = async_to_sync(listen)()
+        self.assertEqual(pending, [event('network.machine', pk, 'created', site=site.pk)])
+        self.assertFalse(hub.active())
+
+
+class StreamTests(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        self.authorization = b'Basic ' + b64encode(b'temporary:temporary')
+
+    def scope(self, query=b'', authorization=None):
+        headers = [(b'authorization', authorization)] if authorization else []
+        return {'type': 'http', 'method': 'GET', 'path': events.EVENTS_PATH, 'query_string': query,
+                'headers': headers, 'scheme': 'http', 'server': ('testserver', 80), 'root_path': ''}
+
+    async def connect(self, scope, until=1):
+        """
+        Drive the stream until `until` messages have been sent after the response start, then disconnect.
+        """
+        sent, disconnect = [], asyncio.Event()
+
+        async def receive():
+            await disconnect.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+            if len([message for message in sent if message['type'] == 'http.response.body']) > until:
+                disconnect.set()
+
+        await asyncio.wait_for(application(self.scope(**scope), receive, send), 5)
+        return sent
+
+    def test_rejects_anonymous_and_bad_filters(self):
+        sent = async_to_sync(self.connect)({})
+        self.assertEqual(sent[0]['status'], 401)
+        sent = async_to_sync(self.connect)({'query': b'types=network.nothing', 'authorization': self.authorization})
+        self.assertEqual(sent[0]['status'], 400)
+
+    def test_streams_changes(self):
+        site = Site.objects.create(name='Home')
+
+        def write():
+            with self.captureOnCommitCallbacks(execute=True):
+                Machine.objects.create(name='Laptop', site_id=site)
+
+        async def stream():
+            task = asyncio.ensure_future(self.connect({'query': b'types=network.machine&interval=0.1',
+                                                    'authorization': self.authorization}))
+            while not hub.active():
+                await asyncio.sleep(0.01)
+            await sync_to_async(write)()
+            return await task
+
+        sent = async_to_sync(stream)()
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream'), sent[0]['headers'])
+        body = sent[2]['body'].decode()
+        self.assertTrue(body.startswith('event: changes\n'), body)
+        self.assertEqual(json.loads(body.splitlines()[1][len('data: '):])[0]['action'], 'created')
+        self.assertFalse(hub.active())
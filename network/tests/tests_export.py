@@ -0,0 +1,47 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from network.models import Site, Machine, Interface
+
+BASE_URL = '/api/v2/'
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        self.client.login(username='temporary', password='temporary')
+        self.site = Site.objects.create(name='Home')
+        self.machine = Machine.objects.create(name='Laptop', site_id=self.site)
+        for index in range(12):
+            Interface.objects.create(name='eth{index}'.format(index=index), ip_v4='10.0.0.{index}'.format(index=index),
+                                     site_id=self.site, machine_id=self.machine)
+
+    def export(self, table, query=''):
+        response = self.client.get('{base}{resource}/export/?{query}'.format(base=BASE_URL, resource=table,
+                                                                             query=query))
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_matches_retrieve(self):
+        rows = [json.loads(line) for line in self.export('interfaces').splitlines()]
+        self.assertEqual(len(rows), 12)
+        retrieved = self.client.get('{base}interfaces/{pk}/'.format(base=BASE_URL, pk=rows[0]['id'])).data
+        self.assertEqual(rows[0], json.loads(json.dumps(retrieved)))
+
+    def test_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.export('machines', 'output=csv'))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['name'], 'Laptop')
+        self.assertEqual(rows[0]['site_id'], str(self.site.id))
+
+    def test_filters_apply(self):
+        rows = self.export('interfaces', 'cidr=10.0.0.0/29').splitlines()
+        self.assertEqual(len(rows), 8)
+
+    def test_unknown_output(self):
+        response = self.client.get('{base}machines/export/?output=xml'.format(base=BASE_URL))
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,27 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from network.management.commands.index_usage import is_index_backed
+
+
+class IndexUsageTests(TestCase):
+    def test_index_usage_report(self):
+        output = StringIO()
+        call_command('index_usage', stdout=output, no_color=True)
+        report = output.getvalue()
+
+        self.assertIn('EntitiesFilter (entity_entity)', report)
+        self.assertIn('InterfaceFilter (entity_interface)', report)
+        self.assertRegex(report, r'status\s+index')
+        self.assertRegex(report, r'physical_address\s+index')
+        self.assertRegex(report, r'ip_from\s+index')
+        self.assertRegex(report, r'ipv4\s+scan')  # icontains cannot seek a B-tree
+
+    def test_full_index_scan_is_not_index_backed(self):
+        self.assertTrue(is_index_backed('3 0 0 SEARCH network_switch USING INDEX switch_mac_idx (physical_address=?)'))
+        self.assertFalse(is_index_backed('2 0 0 SCAN network_interface USING INDEX interface_mac_idx'))
+        self.assertFalse(is_index_backed('2 0 0 SCAN network_interface USING COVERING INDEX interface_seen_idx'))
+        self.assertFalse(is_index_backed('Index Only Scan using interface_seen_idx on network_interface\n'
+                                         '  Filter: (upper((ip_v4)::text) ~~ \'%10.0%\'::text)'))
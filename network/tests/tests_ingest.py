@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from network.models import Site, Machine, Interface, Resource
+
+INGEST_URL = '/api/v2/ingest/'
+
+
+class IngestTests(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        self.client.login(username='temporary', password='temporary')
+
+    @staticmethod
+    def sweep(machines):
+        return {
+            "sites": [{"id": 1, "name": "Home"}],
+            "machines": [{"id": index, "name": "host{index}".format(index=index), "site_id": 1}
+                         for index in range(1, machines + 1)],
+            "interfaces": [{"id": index, "name": "eth0", "ip_v4": "10.0.0.{index}".format(index=index),
+                            "site_id": 1, "machine_id": index}
+                           for index in range(1, machines + 1)],
+            "resources": [{"name": "ssh", "port": 22, "site_id": 1, "interface_id": index}
+                          for index in range(1, machines + 1)],
+        }
+
+    def ingest(self, body, status_code=201):
+        response = self.client.post(INGEST_URL, body, content_type='application/json')
+        self.assertEqual(response.status_code, status_code)
+        return response
+
+    def test_ingest_batch(self):
+        response = self.ingest(self.sweep(machines=3))
+
+        self.assertEqual(response.data['machines']['count'], 3)
+        self.assertEqual(response.data['resources']['count'], 3)
+        self.assertEqual(Site.objects.count(), 1)
+        self.assertEqual(Machine.objects.filter(site_id=1).count(), 3)
+        self.assertEqual(Interface.objects.get(machine_id=2).ip_v4, '10.0.0.2')
+        self.assertEqual(Resource.objects.filter(interface_id=3, port=22).count(), 1)
+
+    def test_ingest_queries_are_constant(self):
+        with CaptureQueriesContext(connection) as small:
+            self.ingest(self.sweep(machines=2))
+        Site.objects.all().delete()
+        with CaptureQueriesContext(connection) as large:
+            self.ingest(self.sweep(machines=50))
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+    def test_ingest_existing_references(self):
+        site = Site.objects.create(name='Home')
+        self.ingest({"machines": [{"name": "Laptop", "site_id": site.id}]})
+        self.assertEqual(Machine.objects.get(name='Laptop').site_id, site)
+
+    def test_ingest_missing_reference(self):
+        site = Site.objects.create(name='Home')
+        response = self.ingest({"machines": [{"name": "Laptop", "site_id": site.id},
+                                             {"name": "Desktop", "site_id": 99}]}, status_code=400)
+
+        self.assertEqual(response.data['machines'][0], {})
+        self.assertIn('site_id', response.data['machines'][1])
+        self.assertEqual(Machine.objects.count(), 0)
+
+    def test_ingest_invalid_row(self):
+        sweep = self.sweep(machines=2)
+        sweep['interfaces'][1]['physical_address'] = '1234'
+        response = self.ingest(sweep, status_code=400)
+
+        self.assertIn('physical_address', response.data['interfaces'][1])
+        self.assertEqual(Site.objects.count(), 0)
+        self.assertEqual(Machine.objects.count(), 0)
+
+    def test_ingest_unknown_table(self):
+        response = self.ingest({"printers": []}, status_code=400)
+        self.assertIn('printers', response.data)
@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from entity.models import Entity
+from entity_api.cache import api_cache
+from entity_api.metrics import registry
+from network.models import Site
+
+
+def server_timing(response):
+    return dict(entry.split(';', 1) for entry in response['Server-Timing'].split(', '))
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        api_cache().clear()
+        registry.reset()
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        self.client.login(username='temporary', password='temporary')
+
+    def test_server_timing_header(self):
+        response = self.client.get('/api/v1/entities/')
+        self.assertEqual(response.status_code, 200)
+        timing = server_timing(response)
+        self.assertEqual(set(timing), {'db', 'serialize', 'render', 'app', 'total'})
+        self.assertRegex(timing['db'], r'^dur=[0-9.]+;desc="\d+ queries"$')
+        self.assertRegex(timing['serialize'], r'^dur=[0-9.]+$')
+
+    def test_other_views_count_queries(self):
+        site = Site.objects.create(name='Home')
+        for path in ('/api/v2/sites/{pk}/summary/', '/api/v2/sites/{pk}/topology/', '/api/v2/sites/changes/'):
+            response = self.client.get(path.format(pk=site.pk))
+            self.assertEqual(response.status_code, 200, path)
+            self.assertNotIn('desc="0 queries"', response['Server-Timing'], path)
+
+    def test_metrics_exposition(self):
+        for index in range(3):
+            Entity.objects.create(name='host{index}'.format(index=index)).interface.create(name='eth0')
+        self.client.get('/api/v1/entities/')
+        self.client.get('/api/v1/entities/')
+        self.client.get('/api/v1/entities/0/')
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE api_request_duration_seconds histogram', body)
+        self.assertIn('api_requests_total{view="entity-list",method="GET",status="200"} 2', body)
+        self.assertIn('api_requests_total{view="entity-detail",method="GET",status="404"} 1', body)
+        self.assertIn('api_request_duration_seconds_count{view="entity-list",method="GET"} 2', body)
+        self.assertIn('api_request_duration_seconds_bucket{view="entity-list",method="GET",le="+Inf"} 2', body)
+        self.assertIn('api_serialize_duration_seconds_total{view="entity-list",method="GET"}', body)
+
+        queries = [line for line in body.splitlines()
+                   if line.startswith('api_request_queries_sum{view="entity-list"')]
+        self.assertEqual(len(queries), 1)
+        self.assertGreater(float(queries[0].split()[-1]), 0)
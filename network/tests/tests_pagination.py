@@ -0,0 +1,63 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from entity_api.pagination import KeysetPagination
+from network.models import Site, Machine
+
+BASE_URL = '/api/v2/'
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        self.client.login(username='temporary', password='temporary')
+        site = Site.objects.create(name='Home')
+        seen = timezone.now()
+        # pairs of machines share last_seen so pages have to break ties on id
+        Machine.objects.bulk_create([
+            Machine(name='host{index}'.format(index=index), site_id=site,
+                    last_seen=seen + datetime.timedelta(seconds=index // 2))
+            for index in range(25)
+        ])
+
+    def get(self, url, status_code=200):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status_code)
+        return response
+
+    def test_keyset_crawl(self):
+        names, pages = [], 0
+        url = '{base}machines/?pagination=keyset&page_size=10'.format(base=BASE_URL)
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                page = self.get(url).data
+            self.assertFalse([query for query in context.captured_queries if 'COUNT' in query['sql']])
+            names.extend(machine['name'] for machine in page['results'])
+            url, pages = page['next'], pages + 1
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(names, ['host{index}'.format(index=index) for index in range(25)])
+
+    def test_keyset_page_size_cap(self):
+        with mock.patch.object(KeysetPagination, 'max_page_size', 10):
+            page = self.get('{base}machines/?pagination=keyset&page_size=5000'.format(base=BASE_URL)).data
+        self.assertEqual(len(page['results']), 10)
+        self.assertIsNotNone(page['next'])
+        for page_size in ('0', '-5', 'many'):
+            page = self.get('{base}machines/?pagination=keyset&page_size={page_size}'.format(
+                base=BASE_URL, page_size=page_size)).data
+            self.assertEqual(len(page['results']), KeysetPagination.page_size)
+
+    def test_invalid_cursor(self):
+        self.get('{base}machines/?cursor=bogus'.format(base=BASE_URL), status_code=404)
+
+    def test_page_number_default(self):
+        page = self.get('{base}machines/?page_size=20'.format(base=BASE_URL)).data
+        self.assertEqual(page['count'], 25)
+        self.assertEqual(len(page['results']), 20)
@@ -0,0 +1,59 @@
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from entity_api import parsers, renderers
+from entity_api.parsers import FastJSONParser
+from entity_api.renderers import FastJSONRenderer
+
+DATA = {
+    'name': 'eth0',
+    'first_seen': datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+    'speed': Decimal('2.50'),
+    'label': gettext_lazy('Interface'),
+    'notes': 'line\u2028separator é',
+    'ports': [22, 443],
+    1: None,
+}
+
+
+class RendererTests(SimpleTestCase):
+    def test_matches_stdlib_renderer(self):
+        self.assertIsNotNone(renderers.orjson)
+        self.assertEqual(FastJSONRenderer().render(DATA), JSONRenderer().render(DATA))
+
+    def test_indent_uses_stdlib_renderer(self):
+        rendered = FastJSONRenderer().render(DATA, 'application/json; indent=2')
+        self.assertEqual(rendered, JSONRenderer().render(DATA, 'application/json; indent=2'))
+
+    def test_out_of_range_integer_falls_back(self):
+        self.assertEqual(FastJSONRenderer().render({'id': 2 ** 70}), b'{"id":1180591620717411303424}')
+
+    def test_without_orjson(self):
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(DATA), JSONRenderer().render(DATA))
+
+
+class ParserTests(SimpleTestCase):
+    def parse(self, body, encoding='utf-8'):
+        return FastJSONParser().parse(io.BytesIO(body), 'application/json', {'encoding': encoding})
+
+    def test_parse(self):
+        self.assertEqual(self.parse('{"name": "café", "ports": [22]}'.encode()), {'name': 'café', 'ports': [22]})
+
+    def test_parse_error(self):
+        with self.assertRaises(ParseError):
+            self.parse(b'{"name": ')
+        with self.assertRaises(ParseError):
+            self.parse(b'{"value": NaN}')
+
+    def test_other_charset_and_missing_orjson(self):
+        self.assertEqual(self.parse('{"name": "café"}'.encode('latin-1'), 'latin-1'), {'name': 'café'})
+        with mock.patch.object(parsers, 'orjson', None):
+            self.assertEqual(self.parse(b'{"name": "eth0"}'), {'name': 'eth0'})
@@ -0,0 +1,112 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from network.models import Site, Network, WiFi, Machine, Interface, Resource, Bluetooth, Radio, Rollup
+from network.rollups import reconcile, summary
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        self.client.login(username='temporary', password='temporary')
+        self.site = Site.objects.create(name='Home')
+        self.machine = Machine.objects.create(name='Laptop', status='UP', site_id=self.site)
+        self.interface = Interface.objects.create(name='eth0', site_id=self.site, machine_id=self.machine)
+        Resource.objects.create(port=22, site_id=self.site, interface_id=self.interface)
+        Resource.objects.create(port=53, protocol='UDP', site_id=self.site, interface_id=self.interface)
+        WiFi.objects.create(name='Home', type='WIFI_AP', site_id=self.site)
+        Bluetooth.objects.create(name='Mouse', site_id=self.site, machine_id=self.machine)
+        Radio.objects.create(name='Zigbee', site_id=self.site, machine_id=self.machine)
+
+    def assertMatchesRecount(self):
+        expected = summary(self.site.pk)
+        self.assertEqual(reconcile(), 0)
+        self.assertEqual(summary(self.site.pk), expected)
+
+    def test_saves(self):
+        counts = summary(self.site.pk)
+        self.assertEqual(counts['machines'], {'UP': 1, 'DOWN': 0})
+        self.assertEqual(counts['resources'], {'TCP': 1, 'UDP': 1})
+        self.assertEqual(counts['wifi']['WIFI_AP'], 1)
+        self.assertEqual((counts['interfaces'], counts['bluetooth'], counts['radios']), (1, 1, 1))
+
+        machine = Machine.objects.get()
+        machine.status = 'DOWN'
+        machine.save()
+        Machine(pk=machine.pk, name='Laptop', status='UP', site_id=self.site).save()  # never loaded
+        other = Site.objects.create(name='Office')
+        with self.captureOnCommitCallbacks(execute=True):
+            Resource.objects.filter(protocol='UDP').get().delete()
+        interface = Interface.objects.get()
+        interface.site_id = other
+        interface.save()
+
+        self.assertEqual(summary(self.site.pk)['machines'], {'UP': 1, 'DOWN': 0})
+        self.assertEqual(summary(self.site.pk)['resources'], {'TCP': 1, 'UDP': 0})
+        self.assertEqual((summary(self.site.pk)['interfaces'], summary(other.pk)['interfaces']), (0, 1))
+        self.assertMatchesRecount()
+
+    def test_bulk_writes(self):
+        network = Network.objects.create(name='LAN', site_id=self.site)
+        rows = [{'name': 'Guest', 'BSSID': '00:11:22:33:44:55', 'type': 'WIFI_AP', 'site_id': self.site.pk,
+                 'network_id': network.pk, 'channels': '1'}]
+        for wifi_type in ('WIFI_AP', 'WIFI_AD_HOC'):
+            rows[0]['type'] = wifi_type
+            response = self.client.post('/api/v2/wifis/upsert/', rows, content_type='application/json')
+            self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(summary(self.site.pk)['wifi'],
+                         {'DEVICE': 0, 'WIFI_BRIDGED': 0, 'WIFI_AP': 1, 'WIFI_AD_HOC': 1})
+        self.assertMatchesRecount()
+
+    def test_cascades(self):
+        other = Site.objects.create(name='Office')
+        Machine.objects.create(name='Desktop', site_id=other)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.machine.delete()  # takes its interface, resources, bluetooth and radio devices along
+        counts = summary(self.site.pk)
+        self.assertEqual((counts['machines']['UP'], counts['interfaces'], counts['resources']['TCP']), (0, 0, 0))
+        self.assertMatchesRecount()
+
+        self.site.delete()
+        self.assertFalse(Rollup.objects.filter(site_id=self.site.pk).exists())
+        self.assertEqual(summary(other.pk)['machines']['DOWN'], 1)
+
+    def rollup_queries(self, interfaces, resources):
+        machine = Machine.objects.create(name='Desktop', status='UP', site_id=self.site)
+        for index in range(interfaces):
+            interface = Interface.objects.create(name='eth{index}'.format(index=index), site_id=self.site,
+                                                 machine_id=machine)
+            for port in range(resources):
+                Resource.objects.create(port=port, site_id=self.site, interface_id=interface)
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete('/api/v2/machines/{pk}/'.format(pk=machine.pk))
+        self.assertEqual(response.status_code, 204)
+        self.assertMatchesRecount()
+        return len([query for query in queries if 'network_rollup' in query['sql']])
+
+    def test_cascade_deltas_in_one_statement(self):
+        self.assertEqual(self.rollup_queries(10, 5), 1)
+        self.assertEqual(self.rollup_queries(2, 2), 1)
+
+    def test_reconcile_command(self):
+        Machine.objects.update(status='DOWN')  # bypasses the signals
+        Rollup.objects.filter(metric='radios').delete()
+        out = io.StringIO()
+        call_command('reconcile_rollups', stdout=out)
+        self.assertEqual(out.getvalue().strip(), '3 rollups corrected')
+        self.assertEqual(summary(self.site.pk)['machines'], {'UP': 0, 'DOWN': 1})
+        self.assertEqual(summary(self.site.pk)['radios'], 1)
+
+    def test_summary_endpoint(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/v2/sites/{pk}/summary/'.format(pk=self.site.pk))
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json(), summary(self.site.pk))
+        self.assertEqual(len([query for query in queries if 'network_' in query['sql']]), 2)
+        self.assertEqual(self.client.get('/api/v2/sites/{pk}/summary/'.format(pk=10 ** 6)).status_code, 404)
@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from entity_api.cache import api_cache
+from network.models import Site, Machine, Interface
+
+BASE_URL = '/api/v2/'
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        api_cache().clear()
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        self.client.login(username='temporary', password='temporary')
+        self.site = Site.objects.create(name='Home')
+        self.machine = Machine.objects.create(name='Laptop', os='Linux', site_id=self.site)
+        self.interface = Interface.objects.create(name='eth0', physical_address='aa:bb:cc:dd:ee:ff',
+                                                  site_id=self.site, machine_id=self.machine)
+
+    def get(self, path):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(BASE_URL + path)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), [query['sql'] for query in context.captured_queries]
+
+    def test_fields_trim_output_and_columns(self):
+        data, queries = self.get('machines/?fields=id,name')
+        self.assertEqual(data['results'], [{'id': self.machine.id, 'name': 'Laptop'}])
+        select = [sql for sql in queries if sql.startswith('SELECT') and 'FROM "network_machine"' in sql][-1]
+        self.assertNotIn('"os"', select)
+
+    def test_unknown_fields_rejected(self):
+        response = self.client.get(BASE_URL + 'machines/?fields=bogus,name,name.first')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'fields': ['Unknown field: bogus, name.first.']})
+        response = self.client.get(BASE_URL + 'interfaces/?expand=machine_id&fields=machine_id.bogus')
+        self.assertEqual(response.json(), {'fields': ['Unknown field: machine_id.bogus.']})
+
+    def test_omit(self):
+        data, _ = self.get('machines/{pk}/?omit=notes,os,site_id'.format(pk=self.machine.id))
+        self.assertNotIn('os', data)
+        self.assertNotIn('site_id', data)
+        self.assertEqual(data['name'], 'Laptop')
+
+    def test_expand_joins_related_row(self):
+        for index in range(3):
+            Interface.objects.create(name='eth{index}'.format(index=index + 1), site_id=self.site,
+                                     machine_id=self.machine)
+        data, queries = self.get('interfaces/?expand=machine_id,site_id&fields=id,machine_id.name,site_id')
+        self.assertEqual(data['results'][0]['machine_id'], {'name': 'Laptop'})
+        self.assertEqual(data['results'][0]['site_id']['name'], 'Home')
+        self.assertFalse([sql for sql in queries if sql.startswith('SELECT') and 'FROM "network_site"' in sql])
+
+    def test_export_honours_fields(self):
+        response = self.client.get(BASE_URL + 'interfaces/export/?fields=name,physical_address')
+        rows = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(rows, ['{"name":"eth0","physical_address":"aa:bb:cc:dd:ee:ff"}'])
+
+    def test_writes_ignore_fields(self):
+        response = self.client.post(BASE_URL + 'machines/?fields=id', {'name': 'Desktop', 'site_id': self.site.id})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['name'], 'Desktop')
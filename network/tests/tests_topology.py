@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from network.models import Site, Network, Switch, WiFi, Machine, Interface, Resource, Bluetooth, Radio
+
+
+class TopologyTests(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        self.client.login(username='temporary', password='temporary')
+        self.site = Site.objects.create(name='Home')
+        other = Site.objects.create(name='Office')
+        network = Network.objects.create(name='LAN', site_id=self.site)
+        Switch.objects.create(name='core', site_id=self.site, network_id=network)
+        Switch.objects.create(name='spare', site_id=self.site)
+        WiFi.objects.create(name='Guest', site_id=self.site, network_id=network)
+        for name in ('Laptop', 'Desktop'):
+            machine = Machine.objects.create(name=name, site_id=self.site)
+            interface = Interface.objects.create(name='eth0', site_id=self.site, machine_id=machine)
+            Resource.objects.create(port=22, site_id=self.site, interface_id=interface)
+        Bluetooth.objects.create(name='Mouse', site_id=self.site, machine_id=machine)
+        Radio.objects.create(name='Zigbee', site_id=self.site, machine_id=machine)
+        Machine.objects.create(name='Elsewhere', site_id=other)
+
+    def topology(self, status_code=200, pk=None, **params):
+        response = self.client.get('/api/v2/sites/{pk}/topology/'.format(pk=pk or self.site.pk), params)
+        self.assertEqual(response.status_code, status_code, response.content)
+        return response.json()
+
+    def test_whole_site(self):
+        with CaptureQueriesContext(connection) as queries:
+            site = self.topology()
+        self.assertEqual(len([query for query in queries if 'network_' in query['sql']]), 9)  # one per table
+
+        self.assertEqual(site['name'], 'Home')
+        network, = site['networks']
+        self.assertEqual([switch['name'] for switch in network['switches']], ['core'])
+        self.assertEqual([wifi['name'] for wifi in network['wifi']], ['Guest'])
+        self.assertEqual([switch['name'] for switch in site['switches']], ['spare'])
+        self.assertEqual([machine['name'] for machine in site['machines']], ['Laptop', 'Desktop'])
+        laptop, desktop = site['machines']
+        self.assertEqual(laptop['interfaces'][0]['resources'][0]['port'], 22)
+        self.assertEqual((laptop['bluetooth'], laptop['radios']), ([], []))
+        self.assertEqual([device['name'] for device in desktop['bluetooth'] + desktop['radios']], ['Mouse', 'Zigbee'])
+        self.assertEqual(laptop['interfaces'][0]['machine_id'], laptop['id'])
+
+    def test_depth(self):
+        self.assertEqual(set(self.topology(depth=0)), {'id', 'name', 'type', 'notes'})
+        site = self.topology(depth=1)
+        self.assertEqual(site['machines'][0]['name'], 'Laptop')
+        self.assertNotIn('interfaces', site['machines'][0])
+        self.topology(status_code=400, depth=-1)
+
+    def test_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            site = self.topology(fields='name,machines.name,machines.interfaces.resources.port')
+        # the site, machines, interfaces and resources only
+        self.assertEqual(len([query for query in queries if 'network_' in query['sql']]), 4)
+        self.assertEqual(site, {'name': 'Home', 'machines': [
+            {'name': 'Laptop', 'interfaces': [{'resources': [{'port': 22}]}]},
+            {'name': 'Desktop', 'interfaces': [{'resources': [{'port': 22}]}]},
+        ]})
+
+    def test_nested_fields_only(self):
+        self.assertEqual(self.topology(fields='machines.name'), {'machines': [
+            {'name': 'Laptop'}, {'name': 'Desktop'},
+        ]})
+
+    def test_unknown_fields(self):
+        response = self.client.get('/api/v2/sites/{pk}/topology/'.format(pk=self.site.pk),
+                                   {'fields': 'bogus,machines.interfaces.nothing,name.first,machines.name'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'fields': [
+            'Unknown field: bogus, machines.interfaces.nothing, name.first.']})
+
+    def test_missing_site(self):
+        self.topology(status_code=404, pk=10 ** 6)
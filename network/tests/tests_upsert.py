@@ -0,0 +1,88 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from network.models import Site, Network, Machine, Interface, Resource, WiFi
+
+BASE_URL = '/api/v2/'
+
+
+class UpsertTests(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        self.client.login(username='temporary', password='temporary')
+        self.site = Site.objects.create(name='Home')
+        self.machine = Machine.objects.create(name='Laptop', site_id=self.site)
+
+    def upsert(self, table, body, status_code=200):
+        response = self.client.post('{base}{resource}/upsert/'.format(base=BASE_URL, resource=table),
+                                    body,
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, status_code)
+        return response
+
+    def interface(self, physical_address, **fields):
+        return dict({"physical_address": physical_address, "site_id": self.site.id,
+                     "machine_id": self.machine.id}, **fields)
+
+    def test_upsert_creates_and_refreshes(self):
+        first_seen = timezone.now() - datetime.timedelta(days=1)
+        existing = Interface.objects.create(physical_address='f0:0d:ca:fe:be:ef', name='eth0',
+                                            first_seen=first_seen, last_seen=first_seen)
+
+        response = self.upsert('interfaces', [self.interface('f0:0d:ca:fe:be:ef', name='wlan0'),
+                                              self.interface('f0:0d:ca:fe:be:00')])
+
+        self.assertEqual(response.data['updated'], [existing.id])
+        self.assertEqual(len(response.data['created']), 1)
+        existing.refresh_from_db()
+        self.assertEqual(existing.name, 'wlan0')
+        self.assertEqual(existing.first_seen, first_seen)
+        self.assertGreater(existing.last_seen, first_seen)
+        self.assertEqual(Interface.objects.count(), 2)
+
+    def test_upsert_single_object(self):
+        network = Network.objects.create(name='PrivateNet', site_id=self.site)
+        wifi = {"BSSID": "33:39:34:32:3a:32", "channels": "11", "site_id": self.site.id, "network_id": network.id}
+        self.upsert('wifis', wifi)
+        self.upsert('wifis', dict(wifi, name='Wireless'))
+
+        self.assertEqual(WiFi.objects.count(), 1)
+        self.assertEqual(WiFi.objects.get().name, 'Wireless')
+
+    def test_upsert_composite_key(self):
+        interface = Interface.objects.create(physical_address='f0:0d:ca:fe:be:ef')
+        resource = {"port": 22, "protocol": "TCP", "site_id": self.site.id, "interface_id": interface.id}
+        self.upsert('resources', [resource])
+        self.upsert('resources', [dict(resource, name='ssh'), dict(resource, protocol='UDP')])
+
+        self.assertEqual(Resource.objects.count(), 2)
+        self.assertEqual(Resource.objects.get(protocol='TCP').name, 'ssh')
+
+    def test_upsert_normalizes_mac_keys(self):
+        legacy = Interface.objects.create(physical_address='F0-0D-CA-FE-BE-EF', name='eth0')
+        response = self.upsert('interfaces', [self.interface('f0:0d:ca:fe:be:ef', name='wlan0'),
+                                              self.interface('AA-BB-CC-DD-EE-01')])
+        self.assertEqual(response.data['updated'], [legacy.id])
+        self.upsert('interfaces', [self.interface('aa:bb:cc:dd:ee:01')])
+
+        self.assertEqual(Interface.objects.count(), 2)
+        self.assertEqual(sorted(Interface.objects.values_list('physical_address', flat=True)),
+                         ['aa:bb:cc:dd:ee:01', 'f0:0d:ca:fe:be:ef'])
+
+    def test_upsert_requires_key(self):
+        response = self.upsert('interfaces', [self.interface(None)], status_code=400)
+        self.assertIn('physical_address', response.data[0])
+
+    def test_upsert_queries_are_constant(self):
+        with CaptureQueriesContext(connection) as small:
+            self.upsert('interfaces', [self.interface('f0:0d:ca:fe:aa:0{index}'.format(index=index))
+                                       for index in range(2)])
+        with CaptureQueriesContext(connection) as large:
+            self.upsert('interfaces', [self.interface('f0:0d:ca:fe:be:{index:02d}'.format(index=index))
+                                       for index in range(40)])
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
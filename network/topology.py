@@ -0,0 +1,87 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+
+from network.models import Site
+from network.serializers import SiteSerializer, NetworkSerializer, SwitchSerializer, WiFiSerializer, \
+    MachineSerializer, InterfaceSerializer, ResourceSerializer, BluetoothSerializer, RadioSerializer
+
+# (key, serializer, parent key, foreign key to the parent), parents first. Tables under the site itself have no parent.
+TOPOLOGY = (
+    ('networks', NetworkSerializer, None, None),
+    ('machines', MachineSerializer, None, None),
+    ('switches', SwitchSerializer, 'networks', 'network_id'),
+    ('wifi', WiFiSerializer, 'networks', 'network_id'),
+    ('interfaces', InterfaceSerializer, 'machines', 'machine_id'),
+    ('bluetooth', BluetoothSerializer, 'machines', 'machine_id'),
+    ('radios', RadioSerializer, 'machines', 'machine_id'),
+    ('resources', ResourceSerializer, 'interfaces', 'interface_id'),
+)
+
+
+def selected(tree, key):
+    # the `?fields=` subtree of `key`: everything ({}) when nothing was named, None when `key` was left out
+    if not tree:
+        return {}
+    return tree.get(key)
+
+
+def columns(serializer_class, tree):
+    return [name for name in serializer_class.Meta.fields if not tree or name in tree]
+
+
+def unknown(tree, key=None, serializer_class=SiteSerializer, prefix=''):
+    # the dotted paths in `tree` that name neither a field of `key`'s rows nor a table below it
+    tables = {child: serializer for child, serializer, parent, _ in TOPOLOGY if parent == key}
+    found = []
+    for name, subtree in tree.items():
+        if name in tables:
+            found += unknown(subtree, name, tables[name], prefix + name + '.')
+        elif name not in serializer_class.Meta.fields:
+            found.append(prefix + name)
+        else:
+            found += [prefix + name + '.' + child for child in subtree]
+    return found
+
+
+def topology(pk, depth=None, tree=None):
+    """
+    Return site `pk` with its networks (holding their switches and Wi-Fi) and machines (holding their interfaces,
+    with their resources, Bluetooth and radio devices). Rows whose parent is missing or belongs to another site hang
+    off the site itself. `depth` limits how many levels below the site are loaded and `tree`, parsed from
+    `?fields=`, which fields and tables; names matching neither are rejected.
+
+    Every table is read once with `values()`, filtered on the site, and the tree is assembled from id maps, so the
+    whole site costs at most one query per table however many rows it holds.
+    """
+    tree = tree or {}
+    if unknown(tree):
+        raise ValidationError({'fields': ['Unknown field: {names}.'.format(names=', '.join(sorted(unknown(tree))))]})
+    subtrees, levels, plan = {None: tree}, {None: 0}, []
+    for key, serializer_class, parent, foreign_key in TOPOLOGY:
+        subtree = selected(subtrees[parent], key) if parent in subtrees else None
+        if subtree is None or depth is not None and levels[parent] + 1 > depth:
+            continue
+        subtrees[key], levels[key] = subtree, levels[parent] + 1
+        plan.append((key, serializer_class, parent, foreign_key))
+    children = {parent: [key for key, _, owner, _ in plan if owner == parent] for parent in subtrees}
+
+    names = columns(SiteSerializer, tree)
+    # values() without names reads every column: read the id alone and strip it, as for the other tables
+    site = get_object_or_404(Site.objects.values(*names or ['id']), pk=pk)
+    if not names:
+        del site['id']
+    site.update((key, []) for key in children[None])
+    nodes = {None: {}}
+    for key, serializer_class, parent, foreign_key in plan:
+        names = columns(serializer_class, subtrees[key])
+        extra = [name for name in ('id', foreign_key) if name and name not in names]
+        rows = serializer_class.Meta.model.objects.filter(site_id=pk).order_by('id').values(*names, *extra)
+        nodes[key] = {}
+        for row in rows.iterator():
+            owner = nodes[parent].get(row[foreign_key]) if foreign_key else None
+            (site if owner is None else owner).setdefault(key, []).append(row)
+            nodes[key][row['id']] = row
+            for name in extra:
+                del row[name]
+            row.update((child, []) for child in children[key])
+    return site
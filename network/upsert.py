@@ -0,0 +1,101 @@
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from changes.revisions import lock
+from entity_api.addresses import AddressKeyMixin
+from entity_api.signals import bulk_saved
+from .ingest import validate_rows, build_instance
+
+
+def natural_key(instance, keys):
+    return tuple(getattr(instance, instance._meta.get_field(key).attname) for key in keys)
+
+
+def is_mac(field):
+    return any(getattr(validator, 'code', None) == 'invalid_mac_address' for validator in field.validators)
+
+
+def normalize_mac(value):
+    return value.lower().replace('-', ':')
+
+
+def spellings(value):
+    # the forms the MAC validators accept for a lower-case colon address, short of mixed case
+    return {value, value.upper(), value.replace(':', '-'), value.upper().replace(':', '-')}
+
+
+def upsert(serializer_class, data, keys):
+    """
+    Create or refresh a batch of rows identified by the natural key `keys`.
+
+    Rows whose key already exists are updated in place: their fields are overwritten, `last_seen` is bumped and
+    `first_seen` is kept. Remaining rows are created. Matching rows are loaded with one query and written with one
+    bulk_update and one bulk_create inside a single transaction.
+
+    MAC addresses in the key are stored in lower-case colon form and match rows stored upper case or with dashes.
+    Upserts to one table are serialised on its revision counter (see changes.revisions.lock), so two scanners
+    reporting the same new key concurrently create it once.
+    """
+    rows = data if isinstance(data, list) else [data]
+    validated, errors = validate_rows(serializer_class, rows)
+    if any(errors):
+        raise serializers.ValidationError(errors)
+
+    model = serializer_class.Meta.model
+    macs = [key for key in keys if is_mac(model._meta.get_field(key))]
+    now = timezone.now()
+    observed = {}
+    for index, row in enumerate(validated):
+        row.pop('id', None)
+        for key in macs:
+            if row.get(key):
+                row[key] = normalize_mac(row[key])
+        row.setdefault('last_seen', now)
+        instance = build_instance(model, row)
+        key = natural_key(instance, keys)
+        if None in key:
+            errors[index].update({name: ['This field is required to upsert.'] for name in keys})
+        observed[key] = row  # the last observation of a key in the batch wins
+    if any(errors):
+        raise serializers.ValidationError(errors)
+
+    with transaction.atomic():
+        lock(model)
+        lookup = {key + '__in': {row_key[index] for row_key in observed} for index, key in enumerate(keys)}
+        for key in macs:
+            lookup[key + '__in'] = set().union(*map(spellings, lookup[key + '__in']))
+        existing = {}
+        for instance in model.objects.filter(**lookup):
+            for key in macs:
+                setattr(instance, key, normalize_mac(getattr(instance, key)))
+            existing.setdefault(natural_key(instance, keys), []).append(instance)
+
+        updated, created, fields = [], [], {'last_seen'}
+        for key, row in observed.items():
+            if key not in existing:
+                row.setdefault('first_seen', row['last_seen'])
+                created.append(build_instance(model, row))
+                continue
+
+            row.pop('first_seen', None)
+            for instance in existing[key]:
+                for name, value in row.items():
+                    field = model._meta.get_field(name)
+                    setattr(instance, field.attname, value)
+                    fields.add(field.name)
+                if isinstance(instance, AddressKeyMixin):
+                    fields.update(instance.update_address_keys())
+                updated.append(instance)
+
+        if updated:
+            model.objects.bulk_update(updated, sorted(fields))
+            bulk_saved.send(sender=model, instances=updated, created=False)
+        if created:
+            created = model.objects.bulk_create(created)
+            bulk_saved.send(sender=model, instances=created, created=True)
+
+    return {
+        'created': [instance.pk for instance in created],
+        'updated': [instance.pk for instance in updated],
+    }
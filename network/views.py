@@ -1,60 +1,145 @@
-from rest_framework import permissions, viewsets
-
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from changes.views import ChangesMixin, non_negative
+from entity_api.asynchronous import AsyncReadMixin
+from entity_api.cache import CacheMixin
+from entity_api.conditional import ConditionalMixin
+from entity_api.encoders import EncoderMixin
+from entity_api.export import ExportMixin
+from entity_api.sparse import SparseFieldsMixin, parse
+from network.filters import InterfaceFilter, SwitchFilter, WiFiFilter
+from network.ingest import ingest
 from network.models import Site, Network, Switch, WiFi, Machine, Interface, Resource, Bluetooth, Radio
 from network.serializers import SiteSerializer, NetworkSerializer, SwitchSerializer, WiFiSerializer, MachineSerializer, \
-    InterfaceSerializer, ResourceSerializer, BluetoothSerializer, RadioSerializer
+    InterfaceSerializer, ResourceSerializer, BluetoothSerializer, RadioSerializer, EXPANSIONS
+from network.rollups import summary
+from network.topology import topology
+from network.upsert import upsert
+
+
+class UpsertMixin:
+    """
+    Adds an `upsert/` action that creates or refreshes a batch of rows matched on the view's `upsert_keys`.
+    """
+    upsert_keys = ()
 
+    @action(detail=False, methods=['post'])
+    def upsert(self, request):
+        result = upsert(self.get_serializer_class(), request.data, self.upsert_keys)
+        return Response(result, status=status.HTTP_200_OK)
 
-class SiteView(viewsets.ModelViewSet):
+
+class SiteView(ConditionalMixin, CacheMixin, ExportMixin, ChangesMixin, EncoderMixin, SparseFieldsMixin, AsyncReadMixin,
+               viewsets.ModelViewSet):
     queryset = Site.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = SiteSerializer
-
-
-class NetworkView(viewsets.ModelViewSet):
+    expansions = EXPANSIONS
+
+    @action(detail=True, methods=['get'])
+    def topology(self, request, pk=None):
+        """
+        The whole site as one tree, limited to `?depth=` levels below the site and to the `?fields=` paths, such as
+        `name,machines.name,machines.interfaces.ip_v4`.
+        """
+        depth = non_negative(request, 'depth', 0) if 'depth' in request.query_params else None
+        return Response(topology(pk, depth, parse(request.query_params.get('fields', ''))))
+
+    @action(detail=True, methods=['get'])
+    def summary(self, request, pk=None):
+        """
+        How many machines (up and down), interfaces, resources (by protocol), Wi-Fi networks (by type), Bluetooth and
+        radio devices the site holds, read from its rollups rather than counted.
+        """
+        return Response(summary(pk))
+
+
+class NetworkView(ConditionalMixin, CacheMixin, ExportMixin, ChangesMixin, EncoderMixin, SparseFieldsMixin,
+                  AsyncReadMixin, viewsets.ModelViewSet):
     queryset = Network.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = NetworkSerializer
+    expansions = EXPANSIONS
+    keyset_ordering = ('last_seen', 'id')
 
 
-class SwitchView(viewsets.ModelViewSet):
+class SwitchView(ConditionalMixin, CacheMixin, ExportMixin, ChangesMixin, EncoderMixin, SparseFieldsMixin, UpsertMixin,
+                 AsyncReadMixin, viewsets.ModelViewSet):
     queryset = Switch.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = SwitchSerializer
+    expansions = EXPANSIONS
+    filterset_class = SwitchFilter
+    keyset_ordering = ('last_seen', 'id')
+    upsert_keys = ('physical_address',)
 
 
-class WiFiView(viewsets.ModelViewSet):
+class WiFiView(ConditionalMixin, CacheMixin, ExportMixin, ChangesMixin, EncoderMixin, SparseFieldsMixin, UpsertMixin,
+               AsyncReadMixin, viewsets.ModelViewSet):
     queryset = WiFi.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = WiFiSerializer
+    expansions = EXPANSIONS
+    filterset_class = WiFiFilter
+    keyset_ordering = ('last_seen', 'id')
+    upsert_keys = ('BSSID',)
 
 
-class MachineView(viewsets.ModelViewSet):
+class MachineView(ConditionalMixin, CacheMixin, ExportMixin, ChangesMixin, EncoderMixin, SparseFieldsMixin,
+                  AsyncReadMixin, viewsets.ModelViewSet):
     queryset = Machine.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = MachineSerializer
+    expansions = EXPANSIONS
+    keyset_ordering = ('last_seen', 'id')
 
 
-class InterfaceView(viewsets.ModelViewSet):
+class InterfaceView(ConditionalMixin, CacheMixin, ExportMixin, ChangesMixin, EncoderMixin, SparseFieldsMixin,
+                    UpsertMixin, AsyncReadMixin, viewsets.ModelViewSet):
     queryset = Interface.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = InterfaceSerializer
+    expansions = EXPANSIONS
+    filterset_class = InterfaceFilter
+    keyset_ordering = ('last_seen', 'id')
+    upsert_keys = ('physical_address',)
 
 
-class ResourceView(viewsets.ModelViewSet):
+class ResourceView(ConditionalMixin, CacheMixin, ExportMixin, ChangesMixin, EncoderMixin, SparseFieldsMixin,
+                   UpsertMixin, AsyncReadMixin, viewsets.ModelViewSet):
     queryset = Resource.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = ResourceSerializer
+    expansions = EXPANSIONS
+    keyset_ordering = ('last_seen', 'id')
+    upsert_keys = ('interface_id', 'protocol', 'port')
 
 
-class BluetoothView(viewsets.ModelViewSet):
+class BluetoothView(ConditionalMixin, CacheMixin, ExportMixin, ChangesMixin, EncoderMixin, SparseFieldsMixin,
+                    UpsertMixin, AsyncReadMixin, viewsets.ModelViewSet):
     queryset = Bluetooth.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = BluetoothSerializer
+    expansions = EXPANSIONS
+    keyset_ordering = ('last_seen', 'id')
+    upsert_keys = ('physical_address',)
 
 
-class RadioView(viewsets.ModelViewSet):
+class RadioView(ConditionalMixin, CacheMixin, ExportMixin, ChangesMixin, EncoderMixin, SparseFieldsMixin, UpsertMixin,
+                AsyncReadMixin, viewsets.ModelViewSet):
     queryset = Radio.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = RadioSerializer
+    expansions = EXPANSIONS
+    keyset_ordering = ('last_seen', 'id')
+    upsert_keys = ('physical_address',)
+
+
+class IngestView(viewsets.ViewSet):
+    permission_classes = [permissions.IsAuthenticated]
 
+    def create(self, request):
+        created = ingest(request.data)
+        return Response(created, status=status.HTTP_201_CREATED)
@@ -0,0 +1,264 @@
+from functools import partial
+
+from django.apps import apps
+from django.db import connection, connections, models, transaction
+from django.db.models.signals import post_delete, post_save
+
+from entity_api.signals import bulk_saved
+
+TABLE = 'search_document'
+
+# Document ids are `kind << KIND_SHIFT | pk`, so each model keeps its position here for good: append new kinds,
+# never reorder or remove them.
+KINDS = (
+    'entity.entity',
+    'entity.interface',
+    'entity.ssid',
+    'network.site',
+    'network.network',
+    'network.switch',
+    'network.wifi',
+    'network.machine',
+    'network.interface',
+    'network.resource',
+    'network.bluetooth',
+    'network.radio',
+)
+KIND_SHIFT = 40
+
+TEXT_FIELDS = (models.CharField, models.TextField, models.GenericIPAddressField)
+
+
+def searchable_fields(model):
+    # editable=False leaves out the derived address keys
+    return [field.attname for field in model._meta.concrete_fields
+            if isinstance(field, TEXT_FIELDS) and field.editable]
+
+
+def document_id(label, pk):
+    return KINDS.index(label) << KIND_SHIFT | pk
+
+
+def documents(model, instances):
+    """
+    Return the `(id, kind, object_id, title, body)` rows indexing `instances`. The body is every text field of
+    the row, so a search matches names, vendors, notes, OS, hardware, MAC and IP addresses alike.
+    """
+    label = model._meta.label_lower
+    fields = searchable_fields(model)
+    rows = []
+    for instance in instances:
+        values = (getattr(instance, field) for field in fields)
+        body = ' '.join(str(value) for value in values if value not in (None, ''))
+        rows.append((document_id(label, instance.pk), label, instance.pk, getattr(instance, 'name', None), body))
+    return rows
+
+
+class SQLiteIndex:
+    """
+    FTS5 table ranked with bm25. Query terms are quoted so MAC and IP addresses are matched as token sequences,
+    and the last term matches as a prefix.
+    """
+
+    def create(self, cursor):
+        cursor.execute("CREATE VIRTUAL TABLE {table} USING fts5(kind UNINDEXED, object_id UNINDEXED, "
+                       "title UNINDEXED, body, tokenize = 'unicode61')".format(table=TABLE))
+
+    def drop(self, cursor):
+        cursor.execute('DROP TABLE IF EXISTS {table}'.format(table=TABLE))
+
+    def delete(self, cursor, ids):
+        cursor.execute('DELETE FROM {table} WHERE rowid IN ({placeholders})'.format(
+            table=TABLE, placeholders=', '.join(['%s'] * len(ids))), ids)
+
+    def write(self, cursor, rows):
+        self.delete(cursor, [row[0] for row in rows])
+        cursor.executemany('INSERT INTO {table} (rowid, kind, object_id, title, body) '
+                           'VALUES (%s, %s, %s, %s, %s)'.format(table=TABLE), rows)
+
+    @staticmethod
+    def expression(query):
+        terms = ['"{term}"'.format(term=term.replace('"', '""')) for term in query.split()]
+        return ' '.join(terms) + '*'
+
+    def search(self, cursor, query, kinds, limit, offset=0):
+        sql = 'SELECT rowid, kind, object_id, title, -bm25({table}) FROM {table} WHERE {table} MATCH %s'.format(
+            table=TABLE)
+        params = [self.expression(query)]
+        if kinds:
+            sql += ' AND kind IN ({placeholders})'.format(placeholders=', '.join(['%s'] * len(kinds)))
+            params += kinds
+        cursor.execute(sql + ' ORDER BY rank LIMIT %s OFFSET %s', params + [limit, offset])
+        return cursor.fetchall()
+
+
+class PostgreSQLIndex:
+    """
+    Plain table with a generated tsvector column behind a GIN index, ranked with ts_rank.
+    """
+
+    def create(self, cursor):
+        cursor.execute("CREATE TABLE {table} (id bigint PRIMARY KEY, kind varchar(64) NOT NULL, "
+                       "object_id bigint NOT NULL, title text, body text NOT NULL, "
+                       "document tsvector GENERATED ALWAYS AS (to_tsvector('simple', body)) STORED)".format(
+                           table=TABLE))
+        cursor.execute('CREATE INDEX {table}_document ON {table} USING GIN (document)'.format(table=TABLE))
+
+    def drop(self, cursor):
+        cursor.execute('DROP TABLE IF EXISTS {table}'.format(table=TABLE))
+
+    def delete(self, cursor, ids):
+        cursor.execute('DELETE FROM {table} WHERE id = ANY(%s)'.format(table=TABLE), [list(ids)])
+
+    def write(self, cursor, rows):
+        cursor.executemany('INSERT INTO {table} (id, kind, object_id, title, body) VALUES (%s, %s, %s, %s, %s) '
+                           'ON CONFLICT (id) DO UPDATE SET title = EXCLUDED.title, body = EXCLUDED.body'.format(
+                               table=TABLE), rows)
+
+    def search(self, cursor, query, kinds, limit, offset=0):
+        sql = ("SELECT id, kind, object_id, title, ts_rank(document, query) AS score "
+               "FROM {table}, websearch_to_tsquery('simple', %s) query WHERE document @@ query").format(table=TABLE)
+        params = [query]
+        if kinds:
+            sql += ' AND kind = ANY(%s)'
+            params.append(list(kinds))
+        cursor.execute(sql + ' ORDER BY score DESC LIMIT %s OFFSET %s', params + [limit, offset])
+        return cursor.fetchall()
+
+
+BACKENDS = {
+    'sqlite': SQLiteIndex,
+    'postgresql': PostgreSQLIndex,
+}
+
+
+def backend(using=connection):
+    index = BACKENDS.get(using.vendor)
+    return index() if index else None
+
+
+def update(model, instances, using=connection):
+    """
+    Write the documents of `instances` in two statements, whatever their number.
+    """
+    index = backend(using)
+    rows = documents(model, instances)
+    if index is None or not rows:
+        return
+    with using.cursor() as cursor:
+        index.write(cursor, rows)
+
+
+def remove(model, pks, batch_size=500, using=connection):
+    """
+    Drop the documents of the rows of `model` with primary keys `pks`.
+    """
+    index = backend(using)
+    if index is None:
+        return
+    with using.cursor() as cursor:
+        for start in range(0, len(pks), batch_size):
+            index.delete(cursor, [document_id(model._meta.label_lower, pk) for pk in pks[start:start + batch_size]])
+
+
+def search(query, kinds=(), limit=20, using=connection):
+    """
+    Return up to `limit` hits for `query` as dicts of type, id, title and score, best first.
+
+    Deletes leave the index as they commit, but rows removed without signals (raw SQL) leave their documents
+    behind until `purge()`. Hits are therefore checked against the live tables, one query per type, and the index
+    is read again past the ones whose row is gone until `limit` live hits are found or it runs out.
+    """
+    index = backend(using)
+    if index is None:
+        raise NotImplementedError('Search is not supported on {vendor}.'.format(vendor=using.vendor))
+
+    hits, offset = [], 0
+    while len(hits) < limit:
+        with using.cursor() as cursor:
+            rows = index.search(cursor, query, list(kinds), limit, offset)
+        live = {}
+        for kind in {row[1] for row in rows}:
+            model = apps.get_model(kind)
+            live[kind] = set(model._default_manager.filter(pk__in=[row[2] for row in rows if row[1] == kind])
+                             .values_list('pk', flat=True))
+        hits += [{'type': kind, 'id': object_id, 'title': title, 'score': score}
+                 for _, kind, object_id, title, score in rows if object_id in live[kind]]
+        if len(rows) < limit:
+            break
+        offset += limit
+    return hits[:limit]
+
+
+def rebuild(model, batch_size=500, using=connection):
+    """
+    Re-index every row of `model` in batches and return the number of rows. Works with historical models, so
+    migrations can call it.
+    """
+    if backend(using) is None:
+        return 0
+    count, batch = 0, []
+    queryset = model._default_manager.only(*searchable_fields(model)).order_by('pk')
+    for instance in queryset.iterator(chunk_size=batch_size):
+        batch.append(instance)
+        if len(batch) == batch_size:
+            update(model, batch, using)
+            count, batch = count + len(batch), []
+    update(model, batch, using)
+    return count + len(batch)
+
+
+def purge(batch_size=500, using=connection):
+    """
+    Drop the documents whose row no longer exists and return how many there were.
+    """
+    index = backend(using)
+    if index is None:
+        return 0
+    count = 0
+    with using.cursor() as cursor:
+        for label in KINDS:
+            model = apps.get_model(label)
+            cursor.execute('SELECT object_id FROM {table} WHERE kind = %s'.format(table=TABLE), [label])
+            indexed = sorted(row[0] for row in cursor.fetchall())
+            for start in range(0, len(indexed), batch_size):
+                chunk = indexed[start:start + batch_size]
+                gone = set(chunk) - set(model._default_manager.filter(pk__in=chunk).values_list('pk', flat=True))
+                if gone:
+                    index.delete(cursor, [document_id(label, pk) for pk in gone])
+                    count += len(gone)
+    return count
+
+
+def model_saved(sender, instance, **kwargs):
+    update(sender, [instance])
+
+
+def models_saved(sender, instances, **kwargs):
+    update(sender, instances)
+
+
+def model_deleted(sender, instance, using, origin=None, **kwargs):
+    # sent for every row a delete removes, queryset deletes and cascades included: the rows are gathered on the
+    # delete's `origin` and their documents dropped in one statement per table once it commits
+    if origin is None:
+        remove(sender, [instance.pk], using=connections[using])
+        return
+    deleted = origin.__dict__.setdefault('_unindexed', {})
+    if not deleted:
+        transaction.on_commit(partial(unindex, deleted, using), using)
+    deleted.setdefault(sender, []).append(instance.pk)
+
+
+def unindex(deleted, using):
+    for model, pks in deleted.items():
+        remove(model, pks, using=connections[using])
+
+
+def watch():
+    for label in KINDS:
+        model = apps.get_model(label)
+        uid = 'search-index-' + label
+        post_save.connect(model_saved, sender=model, dispatch_uid=uid)
+        bulk_saved.connect(models_saved, sender=model, dispatch_uid=uid)
+        post_delete.connect(model_deleted, sender=model, dispatch_uid=uid)
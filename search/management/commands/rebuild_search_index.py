@@ -0,0 +1,15 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from search import index
+
+
+class Command(BaseCommand):
+    help = 'Re-index every searchable row and drop documents whose row no longer exists.'
+
+    def handle(self, *args, **options):
+        for label in index.KINDS:
+            count = index.rebuild(apps.get_model(label))
+            self.stdout.write('{label:<20} {count:>10} rows'.format(label=label, count=count))
+        self.stdout.write('{label:<20} {count:>10} stale documents removed'.format(
+            label='purged', count=index.purge()))
@@ -0,0 +1,85 @@
+from django.db import migrations, models
+
+# Frozen copies of search.index as it stood when the index was created; later changes to that module must not
+# change what this migration does.
+TABLE = 'search_document'
+KINDS = (
+    'entity.entity',
+    'entity.interface',
+    'entity.ssid',
+    'network.site',
+    'network.network',
+    'network.switch',
+    'network.wifi',
+    'network.machine',
+    'network.interface',
+    'network.resource',
+    'network.bluetooth',
+    'network.radio',
+)
+KIND_SHIFT = 40
+TEXT_FIELDS = (models.CharField, models.TextField, models.GenericIPAddressField)
+
+CREATE = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE search_document USING fts5(kind UNINDEXED, object_id UNINDEXED, title UNINDEXED, "
+        "body, tokenize = 'unicode61')",
+    ],
+    'postgresql': [
+        "CREATE TABLE search_document (id bigint PRIMARY KEY, kind varchar(64) NOT NULL, object_id bigint NOT NULL, "
+        "title text, body text NOT NULL, "
+        "document tsvector GENERATED ALWAYS AS (to_tsvector('simple', body)) STORED)",
+        'CREATE INDEX search_document_document ON search_document USING GIN (document)',
+    ],
+}
+INSERT = {
+    'sqlite': 'INSERT INTO search_document (rowid, kind, object_id, title, body) VALUES (%s, %s, %s, %s, %s)',
+    'postgresql': 'INSERT INTO search_document (id, kind, object_id, title, body) VALUES (%s, %s, %s, %s, %s)',
+}
+BATCH_SIZE = 500
+
+
+def documents(kind, model, instances):
+    # editable=False leaves out the derived address keys
+    fields = [field.attname for field in model._meta.concrete_fields
+              if isinstance(field, TEXT_FIELDS) and field.editable]
+    for instance in instances:
+        values = (getattr(instance, field) for field in fields)
+        body = ' '.join(str(value) for value in values if value not in (None, ''))
+        yield (kind << KIND_SHIFT | instance.pk, KINDS[kind], instance.pk, getattr(instance, 'name', None), body)
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor not in CREATE:
+        return
+    with connection.cursor() as cursor:
+        for statement in CREATE[connection.vendor]:
+            cursor.execute(statement)
+        for kind, label in enumerate(KINDS):
+            model = apps.get_model(label)
+            queryset, batch = model._default_manager.using(connection.alias).order_by('pk'), []
+            for instance in queryset.iterator(chunk_size=BATCH_SIZE):
+                batch.append(instance)
+                if len(batch) == BATCH_SIZE:
+                    cursor.executemany(INSERT[connection.vendor], list(documents(kind, model, batch)))
+                    batch = []
+            cursor.executemany(INSERT[connection.vendor], list(documents(kind, model, batch)))
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor in CREATE:
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute('DROP TABLE IF EXISTS {table}'.format(table=TABLE))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entity', '0003_address_keys'),
+        ('network', '0003_address_keys'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
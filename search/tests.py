@@ -0,0 +1,108 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from entity.models import Entity
+from network.models import Interface, Machine, Site, Switch
+from search import index
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_user('temporary', 'temporary@gmail.com', 'temporary')
+        self.client.login(username='temporary', password='temporary')
+
+    def search(self, status_code=200, **params):
+        response = self.client.get('/api/search/', params)
+        self.assertEqual(response.status_code, status_code, response.content)
+        return response.data.get('results')
+
+    def hits(self, **params):
+        return [(hit['type'], hit['id']) for hit in self.search(**params)]
+
+    def test_matches_any_text_field(self):
+        machine = Machine.objects.create(name='build-server', os='Debian', notes='rack 4')
+        switch = Switch.objects.create(name='core', vendor='Cisco', physical_address='f0:0d:ca:fe:be:ef',
+                                       address='10.1.2.3')
+        entity = Entity.objects.create(name='router', hardware='Mikrotik')
+
+        self.assertEqual(self.hits(q='debian'), [('network.machine', machine.pk)])
+        self.assertEqual(self.hits(q='cisco'), [('network.switch', switch.pk)])
+        self.assertEqual(self.hits(q='f0:0d:ca:fe:be:ef'), [('network.switch', switch.pk)])
+        self.assertEqual(self.hits(q='10.1.2.3'), [('network.switch', switch.pk)])
+        self.assertEqual(self.hits(q='mikro'), [('entity.entity', entity.pk)])
+        self.assertEqual(self.search(q='build')[0]['title'], 'build-server')
+
+    def test_updates_and_bulk_writes_are_indexed(self):
+        machine = Machine.objects.create(name='laptop')
+        machine.os = 'Windows'
+        machine.save()
+        self.assertEqual(self.hits(q='windows'), [('network.machine', machine.pk)])
+
+        owner = {"site_id": Site.objects.create(name='Home').pk, "machine_id": machine.pk}
+        response = self.client.post('/api/v2/interfaces/upsert/', [
+            dict(owner, physical_address="02:00:00:00:00:01", vendor="Realtek"),
+            dict(owner, physical_address="02:00:00:00:00:02", vendor="Realtek"),
+        ], content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(sorted(self.hits(q='realtek')),
+                         [('network.interface', pk) for pk in sorted(response.data['created'])])
+
+    def test_ranked_and_typed(self):
+        Machine.objects.create(name='nas', notes='storage')
+        best = Machine.objects.create(name='storage', notes='storage storage')
+        Interface.objects.create(name='storage')
+
+        results = self.search(q='storage', type='network.machine')
+        self.assertEqual([hit['type'] for hit in results], ['network.machine', 'network.machine'])
+        self.assertEqual(results[0]['id'], best.pk)
+        self.assertGreaterEqual(results[0]['score'], results[1]['score'])
+        self.assertEqual(len(self.search(q='storage', limit=1)), 1)
+
+    def documents(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM search_document')
+            return cursor.fetchone()[0]
+
+    def test_deleted_rows_are_dropped(self):
+        site = Site.objects.create(name='Office')
+        Machine.objects.create(name='recycled')
+        Machine.objects.create(name='moved', site_id=site)
+        retired = Machine.objects.create(name='retired')
+        with self.captureOnCommitCallbacks(execute=True):
+            retired.delete()
+            Machine.objects.filter(name='recycled').delete()
+            site.delete()  # cascades to the machine
+        self.assertEqual(self.hits(q='retired'), [])
+        self.assertEqual(self.documents(), 0)
+
+    def test_fills_limit_past_stale_documents(self):
+        stale = [Machine.objects.create(name='spare', notes='spare spare').pk for _ in range(2)]
+        live = Machine.objects.create(name='spare')
+        with connection.cursor() as cursor:  # bypasses the signals, leaving the documents behind
+            cursor.execute('DELETE FROM network_machine WHERE id IN (%s, %s)', stale)
+
+        self.assertEqual(self.hits(q='spare', limit=1), [('network.machine', live.pk)])
+        self.assertEqual(self.documents(), 3)  # searching never writes
+
+    def test_unsupported_database(self):
+        with mock.patch('search.index.backend', return_value=None):
+            self.search(q='x', status_code=501)
+
+    def test_rebuild(self):
+        Machine.objects.bulk_create([Machine(name='imported-{index}'.format(index=index)) for index in range(3)])
+        self.assertEqual(self.hits(q='imported'), [])
+        call_command('rebuild_search_index', stdout=open('/dev/null', 'w'))
+        self.assertEqual(len(self.hits(q='imported')), 3)
+
+    def test_bad_parameters(self):
+        self.search(q='', status_code=400)
+        self.search(q='x', type='auth.user', status_code=400)
+        self.search(q='x', limit='many', status_code=400)
+
+    def test_document_ids_are_stable(self):
+        self.assertEqual(index.document_id('entity.entity', 7), 7)
+        self.assertEqual(index.document_id('network.machine', 7), 7 << index.KIND_SHIFT | 7)
@@ -0,0 +1,36 @@
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from search import index
+
+MAX_LIMIT = 100
+
+
+class SearchView(APIView):
+    """
+    Full-text search over every inventory type: `?q=` (required), `?type=` (repeatable, e.g. `network.interface`)
+    and `?limit=` (default 20, at most 100). Hits are ranked best first.
+    """
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': ['This parameter is required.']})
+
+        kinds = request.query_params.getlist('type')
+        unknown = [kind for kind in kinds if kind not in index.KINDS]
+        if unknown:
+            raise ValidationError({'type': ['Expected one of: {kinds}.'.format(kinds=', '.join(index.KINDS))]})
+
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), MAX_LIMIT)
+        except ValueError:
+            raise ValidationError({'limit': ['A valid integer is required.']})
+
+        try:
+            results = index.search(query, kinds, max(limit, 1))
+        except NotImplementedError as error:
+            return Response({'detail': str(error)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        return Response({'results': results})